@@ -4,12 +4,13 @@ Cerebras LLM integration for query rewriting and answering.
 import logging
 import math
 import re
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Tuple
 import openai
 from openai import OpenAI, AsyncOpenAI
 import asyncio
 import json
 from config import settings
+from constants import RERANK_BATCH_SIZE, RERANK_CONCURRENCY
 from query_analysis import analyze_query
 
 logger = logging.getLogger(__name__)
@@ -1020,9 +1021,6 @@ Respond in JSON format:
             
             logger.info(f"AI Reranking {len(results)} results for query: '{query}'")
             
-            # Prepare results for LLM
-            results_text = self._format_results_for_reranking(results)
-            
             # Build system prompt with custom instructions
             system_prompt = """You are an expert search relevance analyzer for SCS Engineers, a professional environmental consulting firm.
 
@@ -1072,12 +1070,12 @@ CRITICAL: Queries can match multiple post types. For example:
             if entity_context_lines:
                 entity_context_block = "\n".join(["", "CONTEXT HINTS:"] + [f"- {line}" for line in entity_context_lines])
 
-            # Build user prompt
-            user_prompt = f"""
-Analyze these search results for the query: "{query}"
+            # Build user prompt: query and scoring criteria form a prefix shared by every
+            # sub-batch (cacheable by the serving engine); only the result list varies.
+            user_prompt_prefix = f"""
+Analyze the search results below for the query: "{query}"
 
 {entity_context_block}
-{results_text}
 
 📊 SCORING CRITERIA (Rate each result 0-100):
 
@@ -1127,7 +1125,7 @@ Analyze these search results for the query: "{query}"
 {f"5. **Custom Criteria** (HIGHEST PRIORITY):{chr(10)}{custom_instructions}" if custom_instructions else ""}
 
 🎯 RETURN FORMAT:
-Return a JSON array with scores for EACH result (include all {len(results)} results):
+Return a JSON array with scores for EACH result (include every result listed):
 [
   {{"id": "1", "ai_score": 95, "reason": "Direct answer to query with actionable steps"}},
   {{"id": "2", "ai_score": 88, "reason": "Comprehensive guide covering all aspects"}},
@@ -1136,43 +1134,19 @@ Return a JSON array with scores for EACH result (include all {len(results)} resu
 ]
 
 ⚠️ IMPORTANT:
-- Include ALL {len(results)} results in the SAME ORDER
+- Include ALL results in the SAME ORDER
 - Be strict but fair in scoring
 - Higher score = more relevant to the query
 - Consider the custom criteria if provided
 - Scores should range from 0-100
 """
 
-            # Call LLM asynchronously
-            logger.info("Calling Cerebras LLM for reranking (async)...")
-            response = await self.async_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.1,  # Low temperature for consistent scoring
-                max_tokens=2000
-            )
-            
-            # Parse response
-            response_text = response.choices[0].message.content.strip()
-            logger.info(f"LLM response received ({len(response_text)} chars)")
-            logger.debug(f"Response preview: {response_text[:500]}")
-            
-            # Extract JSON array from response (handle markdown code blocks and extra text)
-            try:
-                ai_scores = extract_json_array_from_text(response_text)
-                logger.info(f"Successfully extracted JSON array with {len(ai_scores)} items")
-            except (ValueError, json.JSONDecodeError) as e:
-                logger.error(f"Failed to extract JSON array: {e}")
-                logger.error(f"Response text that failed to parse: {response_text[:500]}")
-                raise ValueError(f"Could not parse JSON from LLM response: {e}")
-            
-            # Validate that ai_scores is a list
-            if not isinstance(ai_scores, list):
-                logger.error(f"AI scores is not a list: {type(ai_scores)}, value: {ai_scores}")
-                raise ValueError(f"Expected list of scores, got {type(ai_scores)}")
+            def build_user_prompt(batch: List[Dict[str, Any]]) -> str:
+                results_text = self._format_results_for_reranking(batch)
+                return f"{user_prompt_prefix}\nSEARCH RESULTS ({len(batch)}):\n{results_text}\n"
+
+            # Score candidate sub-batches concurrently
+            ai_scores, tokens_used = await self._rerank_pool(system_prompt, build_user_prompt, results)
             
             logger.info(f"Parsed {len(ai_scores)} AI scores")
             
@@ -1397,7 +1371,6 @@ Return a JSON array with scores for EACH result (include all {len(results)} resu
             
             # Calculate stats
             response_time = time.time() - start_time
-            tokens_used = response.usage.total_tokens if hasattr(response, 'usage') else 0
             cost = (tokens_used / 1_000_000) * 0.10  # Cerebras pricing (~$0.10 per 1M tokens)
             
             metadata = {
@@ -1918,6 +1891,86 @@ Return a JSON array with scores for EACH result (include all {len(results)} resu
                 }
             }
     
+    async def _rerank_pool(
+        self,
+        system_prompt: str,
+        build_user_prompt: Callable[[List[Dict[str, Any]]], str],
+        results: List[Dict[str, Any]],
+        k: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Score rerank candidates in sub-batches of RERANK_BATCH_SIZE, with at most k requests in flight.
+        
+        A failed sub-batch gives its documents a neutral score (50) instead of failing
+        the whole rerank; an error is raised only when every sub-batch fails.
+        
+        Returns:
+            ({'id', 'ai_score', 'reason'} entries covering all results, total tokens used)
+        """
+        if k is None:
+            k = getattr(settings, 'rerank_concurrency', RERANK_CONCURRENCY)
+        semaphore = asyncio.Semaphore(max(1, k))
+        batches = [
+            results[i:i + RERANK_BATCH_SIZE]
+            for i in range(0, len(results), RERANK_BATCH_SIZE)
+        ]
+        
+        tokens_used = 0
+        # Ask prefix-caching servers (vLLM/SGLang style) to reuse the shared prompt prefix
+        extra_body = {"cache_prompt": True} if getattr(settings, 'llm_cache_prompt', False) else None
+        
+        async def score_batch(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            nonlocal tokens_used
+            async with semaphore:
+                response = await self.async_client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": build_user_prompt(batch)}
+                    ],
+                    temperature=0.1,  # Low temperature for consistent scoring
+                    max_tokens=2000,
+                    extra_body=extra_body
+                )
+            
+            usage = getattr(response, 'usage', None)
+            tokens_used += usage.total_tokens if usage else 0
+            
+            response_text = response.choices[0].message.content.strip()
+            logger.debug(f"Rerank batch response preview: {response_text[:500]}")
+            
+            # Extract JSON array from response (handle markdown code blocks and extra text)
+            try:
+                batch_scores = extract_json_array_from_text(response_text)
+            except (ValueError, json.JSONDecodeError) as e:
+                logger.error(f"Response text that failed to parse: {response_text[:500]}")
+                raise ValueError(f"Could not parse JSON from LLM response: {e}")
+            
+            if not isinstance(batch_scores, list):
+                raise ValueError(f"Expected list of scores, got {type(batch_scores)}")
+            return batch_scores
+        
+        logger.info(f"Calling Cerebras LLM for reranking (async, {len(batches)} batches, concurrency={k})...")
+        outcomes = await asyncio.gather(*(score_batch(batch) for batch in batches), return_exceptions=True)
+        
+        ai_scores: List[Dict[str, Any]] = []
+        failed_batches = 0
+        for batch, outcome in zip(batches, outcomes):
+            if isinstance(outcome, Exception):
+                failed_batches += 1
+                logger.warning(f"Rerank batch of {len(batch)} results failed, using neutral scores: {outcome}")
+                ai_scores.extend(
+                    {'id': str(result.get('id')), 'ai_score': 50, 'reason': 'AI scoring unavailable (neutral score)'}
+                    for result in batch
+                )
+            else:
+                ai_scores.extend(outcome)
+        
+        if failed_batches == len(batches):
+            raise ValueError(f"All {failed_batches} rerank batches failed")
+        
+        return ai_scores, tokens_used
+    
     def _format_results_for_reranking(self, results: List[Dict[str, Any]]) -> str:
         """Format results as text for LLM (optimized - shorter format)."""
         formatted = []
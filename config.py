@@ -5,6 +5,7 @@ This module defines all application settings loaded from environment variables.
 Settings are validated using Pydantic for type safety.
 """
 import os
+import re
 from typing import Optional, Literal, List
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
@@ -30,6 +31,9 @@ class Settings(BaseSettings):
     
     qdrant_collection_name: str = "wordpress_content"
     """Name of the Qdrant collection for storing vectors"""
+
+    qdrant_prefer_grpc: bool = False
+    """Talk to Qdrant over gRPC instead of HTTP"""
     
     # ========================================================================
     # CEREBRAS LLM CONFIGURATION
@@ -76,6 +80,15 @@ class Settings(BaseSettings):
     
     wordpress_api_url: str = ""
     """WordPress REST API endpoint URL"""
+
+    wordpress_table_prefix: str = "wp_"
+    """WordPress database table prefix ($wpdb->prefix) of the plugin's analytics table"""
+
+    wordpress_cache_path: Optional[str] = None
+    """File recording the previous crawl (ETags, cleaned items) so re-indexing skips unchanged content (unset = always refetch)"""
+
+    wordpress_clean_processes: Optional[int] = None
+    """Worker processes that clean fetched post HTML in parallel (unset = one per CPU on multi-core hosts, 0 = clean in the event loop)"""
     
     # ========================================================================
     # API CONFIGURATION
@@ -105,6 +118,9 @@ class Settings(BaseSettings):
     
     embedding_dimension: int = 384
     """Dimension of embedding vectors"""
+
+    embedding_cache_path: Optional[str] = None
+    """File for persisting query embeddings across restarts (shared by workers, one file per embedding model; unset = in-memory only)"""
     
     chunk_size: int = 512
     """Size of content chunks for indexing"""
@@ -121,6 +137,18 @@ class Settings(BaseSettings):
     enable_ai_rerank: bool = True
     """Globally enable/disable AI reranking support."""
 
+    rerank_concurrency: int = 8
+    """Maximum number of AI rerank batch requests in flight at once."""
+
+    rerank_timeout_sec: float = 5.0
+    """Seconds to wait for AI reranking before returning TF-IDF results instead."""
+
+    llm_cache_prompt: bool = False
+    """Send cache_prompt=true with rerank requests (for prefix-caching OpenAI-compatible servers)."""
+
+    expose_boost_debug: bool = False
+    """Attach per-result boost multipliers (meta.boost_debug) to search results (for ranking debugging; off on the hot path)."""
+
     # ========================================================================
     # INTENT KEYWORD CUSTOMIZATION
     # ========================================================================
@@ -177,6 +205,17 @@ class Settings(BaseSettings):
         # Default to tfidf if unrecognized
         return "tfidf"
     
+    @field_validator('wordpress_table_prefix')
+    @classmethod
+    def validate_table_prefix(cls, v: str) -> str:
+        """
+        The prefix is interpolated into SQL, so only allow what WordPress does
+        (letters, digits and underscores).
+        """
+        if not re.fullmatch(r'[A-Za-z0-9_]*', v):
+            raise ValueError(f"Invalid WordPress table prefix: {v!r}")
+        return v
+    
     @field_validator(
         'intent_service_keywords',
         'intent_sector_keywords',
@@ -33,6 +33,18 @@ OPENAI_EMBEDDING_DIMENSION = 1536  # OpenAI text-embedding-ada-002
 DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
 OPENAI_EMBEDDING_MODEL = "text-embedding-3-small"
 
+# Hash-based fallback embedding memoization
+HASH_EMBEDDING_CACHE_SIZE = 4096
+HASH_EMBEDDING_CACHE_MAX_TEXT = 4096  # Longer texts are hashed without caching
+QUERY_CACHE_KEY_MAX_RAW = 64  # Query embedding cache: longer queries are keyed by digest
+QUERY_EMBEDDING_ALIAS_CACHE_SIZE = 512  # Near-duplicate (canonical form) query embedding tier
+PERSISTED_EMBEDDING_CACHE_MAX_ENTRIES = 100000  # Cap on query embeddings kept in the on-disk store
+EMBED_COALESCE_WINDOW_SEC = 0.005  # Wait this long for concurrent texts to share one local encode call
+EMBED_COALESCE_MAX_BATCH = 32  # Max texts per coalesced local encode call
+
+# Behavioral (CTR) boost
+URL_NORMALIZE_CACHE_SIZE = 8192  # Memoized normalized URLs
+
 # ============================================================================
 # TF-IDF CONSTANTS
 # ============================================================================
@@ -58,6 +70,9 @@ RERANK_BUFFER_SIZE = 10  # Extra results to fetch for reranking
 MAX_RERANK_CANDIDATES = 50  # Maximum results to send to LLM (optimization - was 200)
 RERANK_CACHE_TTL = 3600  # Cache reranking results for 1 hour
 TFIDF_HIGH_CONFIDENCE_THRESHOLD = 0.85  # Skip reranking if top TF-IDF score is very high
+SCORE_GAP_MARGIN = 0.15  # Skip reranking if top score leads rank MIN_RERANK_CANDIDATES by this much
+RERANK_BATCH_SIZE = 10  # Candidates scored per LLM rerank request
+RERANK_CONCURRENCY = 8  # Default max rerank requests in flight (settings.rerank_concurrency)
 
 # AI scoring
 AI_SCORE_MIN = 0
@@ -112,11 +127,14 @@ WP_MAX_TOTAL_ITEMS = 5000  # Per post type
 
 # Timeouts
 WP_REQUEST_TIMEOUT = 30.0  # Seconds
+WP_CONNECT_TIMEOUT = 5.0  # Seconds - an unreachable host fails fast instead of after WP_REQUEST_TIMEOUT
 WP_KEEPALIVE_EXPIRY = 30.0  # Seconds
+WP_TYPES_CACHE_TTL = 3600  # Seconds to reuse the /types listing across crawls
 
 # Connection limits
 WP_MAX_KEEPALIVE_CONNECTIONS = 20
 WP_MAX_CONNECTIONS = 100
+WP_FETCH_CONCURRENCY = 8  # Concurrent REST requests while fetching post types
 
 # ============================================================================
 # INDEXING CONSTANTS
@@ -125,6 +143,8 @@ WP_MAX_CONNECTIONS = 100
 # Batch sizes
 INDEX_BATCH_SIZE = 100  # Documents to index at once
 VECTOR_UPSERT_BATCH_SIZE = 100  # Vectors to upsert at once
+QDRANT_UPSERT_CHUNK_SIZE = 500  # Documents per upsert_documents call when indexing off the event loop
+QDRANT_UPSERT_CONCURRENCY = 4  # Concurrent upsert chunks in flight
 
 # Limits
 MAX_DOCUMENTS_PER_REQUEST = 10000
@@ -144,6 +164,58 @@ CACHE_PREFIX_SEARCH = "search:"
 CACHE_PREFIX_SUGGEST = "suggest:"
 CACHE_PREFIX_HEALTH = "health:"
 
+# In-process search response cache (SimpleHybridSearch.search)
+SEARCH_RESULT_CACHE_SIZE = 2048  # Max cached (results, metadata) responses
+SEARCH_RESULT_CACHE_TTL = 20  # Seconds - short so fresh signals land quickly
+
+# get_stats post type breakdown
+STATS_CACHE_TTL = 60  # Seconds
+STATS_SCROLL_PAGE_SIZE = 1024  # Points per scroll page when recounting post types
+
+# Content-based alternative query suggestions (LLM output)
+ALT_QUERY_CACHE_SIZE = 1024
+ALT_QUERY_CACHE_TTL = 300  # Seconds
+
+# Query-independent per-document boosts (freshness, taxonomy depth)
+DOCUMENT_BOOST_REFRESH_SEC = 3600  # Recompute freshness boosts at least hourly
+FRESHNESS_AGE_DAYS = (7, 30, 90, 180)  # Age bucket upper bounds (days)
+FRESHNESS_BOOSTS = (2.0, 1.8, 1.5, 1.2, 1.0)  # Boost per age bucket, oldest last
+TFIDF_SCORE_CACHE_SIZE = 256  # Cached TF-IDF similarity vectors (one per recent query)
+TFIDF_QUERY_VECTOR_CACHE_SIZE = 1024  # Cached TF-IDF query vectors (lexical scores and Qdrant sparse vectors)
+NUMPY_SORT_MIN_ITEMS = 64  # Below this, sorting result dicts in Python beats building numpy key arrays
+NUMPY_NORMALIZE_MIN_ITEMS = 128  # Below this, min-max normalizing scores in Python beats numpy
+RRF_DEFAULT_K = 60  # Reciprocal Rank Fusion constant
+RRF_RECIPROCAL_TABLE_SIZE = 1000  # Ranks with a precomputed 1/(k + rank) for the default k
+
+# Query analysis (intent) cache
+INTENT_CACHE_SIZE = 1024  # Entries per tier (exact query / semantic ring buffer)
+INTENT_CACHE_TTL = 3600  # Seconds, both tiers
+INTENT_CACHE_SIMILARITY = 0.92  # Min cosine similarity to reuse a cached LLM intent
+
+# Zero-result alternative queries (ZeroResultHandler, LLM output)
+ZERO_RESULT_CACHE_SIZE = 1024  # Entries per tier (exact query / semantic ring buffer)
+ZERO_RESULT_CACHE_TTL = 3600  # Seconds, both tiers
+ZERO_RESULT_CACHE_SIMILARITY = 0.9  # Min cosine similarity to reuse cached alternatives
+ZERO_RESULT_LLM_MAX_RETRIES = 2  # Retries of a 408/409/429/5xx alternatives call (client backoff: 0.5s doubling, 8s cap, jittered, Retry-After honoured)
+ZERO_RESULT_REDIS_KEY_PREFIX = "zr:"  # Shared zero-result response keys: zr:{corpus version}:{blake2s(normalized query)}
+ZERO_RESULT_POPULAR_QUERY_LIMIT = 5000  # Most searched successful queries kept in memory for related searches
+ZERO_RESULT_POPULAR_REFRESH_SEC = 86400  # Reload the popular queries from analytics daily
+ZERO_RESULT_RELATED_LIMIT = 5  # Related searches returned per zero-result query
+ZERO_RESULT_RELATED_MIN_SIMILARITY = 0.5  # Min cosine similarity for a popular query to count as related
+
+# Autocomplete suggestions (SuggestionEngine)
+SUGGESTION_CACHE_SIZE = 4096  # Cached (prefix, limit) suggestion lists
+SUGGESTION_CACHE_TTL = 3600  # Seconds
+SUGGESTION_SKIP_QUERIES = frozenset({  # Bare function words: too unspecific to be worth a lookup
+    'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it',
+    'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'with',
+})
+SUGGESTION_BATCH_WINDOW_SEC = 0.02  # Wait this long for concurrent partial queries to share one LLM call
+SUGGESTION_BATCH_MAX = 8  # Max partial queries completed per LLM call
+SUGGESTION_TIMEOUT_SEC = 5.0  # Max wait for suggestions; autocomplete answers [] rather than hang
+SUGGESTION_REDIS_KEY_PREFIX = "sugg:"  # Shared cache keys: sugg:{partial query}:{limit}
+SUGGESTION_ANALYTICS_TABLE = "hybrid_search_analytics"  # WordPress plugin search log (query, timestamp), after settings.wordpress_table_prefix
+
 # ============================================================================
 # RATE LIMITING CONSTANTS
 # ============================================================================
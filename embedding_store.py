@@ -0,0 +1,143 @@
+"""
+On-disk store for query embeddings shared across worker processes.
+
+Vectors live in an append-only float32 file that every worker maps read-only
+with ``numpy.memmap``, so the kernel page cache holds a single copy no matter
+how many workers are running. Keys are kept in a JSON side-file that is
+replaced atomically; a reader only ever maps as many rows as the keys file it
+loaded lists, so a concurrent append never exposes a half-written row.
+
+New embeddings are buffered in memory and appended by ``flush()`` (called on
+graceful shutdown) under an exclusive ``fcntl.flock``. Where ``fcntl`` is not
+available (Windows) the store is disabled and callers keep their in-memory
+cache only.
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    fcntl = None
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_key(key: Any) -> str:
+    """Turn a query cache key (raw string or BLAKE2b digest) into a JSON string."""
+    if isinstance(key, bytes):
+        return "h:" + key.hex()
+    return "q:" + key
+
+
+class PersistentEmbeddingStore:
+    """Memory-mapped query embedding store with buffered, lock-protected appends."""
+
+    def __init__(self, path: str, dim: int, max_entries: int = 100_000):
+        self.path = Path(path)
+        self.keys_path = self.path.with_name(self.path.name + ".keys.json")
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.dim = dim
+        self.max_entries = max_entries
+        self._index: Dict[str, int] = {}
+        self._vectors: Optional[np.memmap] = None
+        self._pending: Dict[str, np.ndarray] = {}
+        self.load()
+
+    def load(self) -> None:
+        """(Re)map the vector file and key index from disk; start empty on any mismatch."""
+        self._index = {}
+        self._vectors = None
+        try:
+            keys = self._read_keys()
+            if not keys:
+                return
+            row_bytes = self.dim * np.dtype(np.float32).itemsize
+            if self.path.stat().st_size < len(keys) * row_bytes:
+                logger.warning("Embedding store %s is shorter than its key file - ignoring it", self.path)
+                return
+            self._vectors = np.memmap(self.path, dtype=np.float32, mode="r", shape=(len(keys), self.dim))
+            self._index = {key: row for row, key in enumerate(keys)}
+            logger.info("Loaded %d persisted query embeddings from %s", len(keys), self.path)
+        except Exception as e:
+            logger.warning(f"Could not load embedding store {self.path}: {e}")
+            self._index = {}
+            self._vectors = None
+
+    def _read_keys(self) -> list:
+        """Return the persisted key list, or [] if there is none or it was written for another dimension."""
+        if not self.keys_path.exists():
+            return []
+        with open(self.keys_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("dim") != self.dim:
+            logger.warning("Embedding store %s has dimension %s, expected %s - ignoring it", self.path, data.get("dim"), self.dim)
+            return []
+        return data.get("keys", [])
+
+    def get(self, key: Any) -> Optional[np.ndarray]:
+        """Return the stored embedding for a query cache key (read-only view), or None."""
+        encoded = _encode_key(key)
+        vector = self._pending.get(encoded)
+        if vector is not None:
+            return vector
+        row = self._index.get(encoded)
+        if row is None or self._vectors is None:
+            return None
+        return self._vectors[row]
+
+    def add(self, key: Any, embedding: np.ndarray) -> None:
+        """Buffer an embedding to be appended on the next flush()."""
+        encoded = _encode_key(key)
+        if encoded in self._index or encoded in self._pending:
+            return
+        if len(self._index) + len(self._pending) >= self.max_entries:
+            return
+        vector = np.asarray(embedding, dtype=np.float32)
+        if vector.shape != (self.dim,):
+            return
+        self._pending[encoded] = vector
+
+    def flush(self) -> int:
+        """
+        Append buffered embeddings to disk and atomically publish the new key list.
+
+        Returns:
+            Number of embeddings written
+        """
+        if not self._pending:
+            return 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        row_bytes = self.dim * np.dtype(np.float32).itemsize
+        with open(self.lock_path, "a+") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Another worker may have appended since we loaded
+                keys = self._read_keys()
+                known = set(keys)
+                new_items = [(key, vec) for key, vec in self._pending.items() if key not in known]
+                new_items = new_items[:max(0, self.max_entries - len(keys))]
+                if new_items:
+                    with open(self.path, "ab") as f:
+                        # Drop rows left over by an append that never got its keys published
+                        f.truncate(len(keys) * row_bytes)
+                        f.write(np.stack([vec for _, vec in new_items]).tobytes())
+                        f.flush()
+                        os.fsync(f.fileno())
+                    keys.extend(key for key, _ in new_items)
+                    tmp_path = self.keys_path.with_name(self.keys_path.name + f".{os.getpid()}.tmp")
+                    with open(tmp_path, "w", encoding="utf-8") as f:
+                        json.dump({"dim": self.dim, "keys": keys}, f)
+                    os.replace(tmp_path, self.keys_path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        self._pending.clear()
+        self.load()
+        return len(new_items)
@@ -0,0 +1,38 @@
+"""
+JSON encoding and decoding helpers.
+
+orjson parses and serializes several times faster than the stdlib json module
+(embedding payloads, WordPress pages, structured log records), so it is used
+when installed; otherwise these fall back to json with the same results.
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON bytes or text, preferring orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, pretty: bool = False) -> str:
+    """
+    Serialize obj to JSON text, preferring orjson when installed.
+
+    Non-string keys are stringified, as json.dumps does; pretty=True indents
+    by two spaces.
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode()
+    return json.dumps(obj, indent=2 if pretty else None)
@@ -42,7 +42,8 @@ class QdrantManager:
             url=settings.qdrant_url,
             api_key=settings.qdrant_api_key,
             timeout=10.0,  # Reduced to 10 seconds for faster failure detection
-            prefer_grpc=False  # Use HTTP instead of gRPC for better timeout handling
+            # HTTP by default for better timeout handling; gRPC sends vectors as protobuf
+            prefer_grpc=settings.qdrant_prefer_grpc
         )
         self.collection_name: str = settings.qdrant_collection_name
         self.embedding_dimension: int = settings.embedding_dimension
@@ -229,8 +230,10 @@ class QdrantManager:
                     # Fallback: use simple hash
                     point_id = abs(hash(str(doc['id']))) % (10 ** 18)
                 
-                # Prepare dense vector (embedding)
+                # Prepare dense vector (embedding); float32 arrays become lists only here
                 dense_vector = doc.get('embedding', [0.0] * self.embedding_dimension)
+                if isinstance(dense_vector, np.ndarray):
+                    dense_vector = dense_vector.tolist()
                 
                 # Prepare sparse vector (BM25-like weights)
                 sparse_vector = doc.get('sparse_vector', {})
@@ -314,7 +317,7 @@ class QdrantManager:
     def hybrid_search(
         self, 
         query: str, 
-        dense_vector: List[float],
+        dense_vector: Union[List[float], NDArray[np.float32]],
         sparse_vector: Dict[int, float],
         limit: int = 10,
         alpha: float = 0.7
@@ -324,7 +327,7 @@ class QdrantManager:
         
         Args:
             query: Search query text
-            dense_vector: Dense embedding vector
+            dense_vector: Dense embedding vector (list or float32 array, passed through as-is)
             sparse_vector: Sparse BM25-like vector
             limit: Maximum number of results
             alpha: Weight for dense vs sparse (0.0 = sparse only, 1.0 = dense only)
@@ -15,6 +15,13 @@ try:
 except Exception:  # pragma: no cover - fallback when config unavailable
     settings = None
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # Core keyword sets
@@ -321,6 +328,59 @@ ORGANIZATION_SUFFIXES = {
     "council",
 }
 
+# Keyword sets matched as substrings of the lowercased query, by group name
+_KEYWORD_GROUPS: Dict[str, Set[str]] = {
+    "service": SERVICE_KEYWORDS,
+    "service_phrase": SERVICE_PHRASES,
+    "role": ROLE_KEYWORDS,
+    "navigational": NAVIGATIONAL_KEYWORDS,
+    "transactional": TRANSACTIONAL_KEYWORDS,
+    "sector": SECTOR_KEYWORDS,
+    "sector_phrase": SECTOR_PHRASES,
+    "local_modifier": LOCAL_MODIFIERS,
+    "case_study": CASE_STUDY_KEYWORDS,
+    "regulatory": REGULATORY_KEYWORDS,
+    "state": US_STATE_NAMES,
+}
+
+
+def _build_keyword_automaton():
+    """Compile every keyword group into one Aho-Corasick automaton (None without pyahocorasick)."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    owners: Dict[str, List[str]] = {}
+    for group, keywords in _KEYWORD_GROUPS.items():
+        for keyword in keywords:
+            if keyword:
+                owners.setdefault(keyword, []).append(group)
+    automaton = ahocorasick.Automaton()
+    for keyword, groups in owners.items():
+        automaton.add_word(keyword, (keyword, tuple(groups)))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+
+def _match_keywords(query_lower: str) -> Dict[str, Set[str]]:
+    """
+    Find every keyword of every group that occurs in query_lower.
+    
+    Same result as ``{kw for kw in group if kw in query_lower}`` per group, but
+    with pyahocorasick all groups are matched in a single pass over the query.
+    """
+    if _KEYWORD_AUTOMATON is None:
+        return {
+            group: {kw for kw in keywords if kw and kw in query_lower}
+            for group, keywords in _KEYWORD_GROUPS.items()
+        }
+    hits: Dict[str, Set[str]] = {group: set() for group in _KEYWORD_GROUPS}
+    for _, (keyword, groups) in _KEYWORD_AUTOMATON.iter(query_lower):
+        for group in groups:
+            hits[group].add(keyword)
+    return hits
+
 
 @dataclass
 class QueryAnalysis:
@@ -488,15 +548,14 @@ def _extract_capitalized_phrases(query: str) -> List[str]:
     return cleaned
 
 
-def _extract_services(query_lower: str) -> List[str]:
+def _extract_services(query_lower: str, keyword_hits: Optional[Dict[str, Set[str]]] = None) -> List[str]:
     """
     Extract service-related terms from query.
     Enhanced to catch more service patterns and context.
     """
-    matches = {kw for kw in SERVICE_KEYWORDS if kw in query_lower}
-    for phrase in SERVICE_PHRASES:
-        if phrase in query_lower:
-            matches.add(phrase)
+    if keyword_hits is None:
+        keyword_hits = _match_keywords(query_lower)
+    matches = keyword_hits["service"] | keyword_hits["service_phrase"]
     
     # Additional service patterns (multi-word services)
     service_patterns = [
@@ -519,20 +578,17 @@ def _extract_services(query_lower: str) -> List[str]:
     return sorted(matches)
 
 
-def _extract_roles(query_lower: str) -> List[str]:
-    roles = set()
-    for kw in ROLE_KEYWORDS:
-        if kw in query_lower:
-            roles.add(kw)
-    return sorted(roles)
+def _extract_roles(query_lower: str, keyword_hits: Optional[Dict[str, Set[str]]] = None) -> List[str]:
+    if keyword_hits is None:
+        keyword_hits = _match_keywords(query_lower)
+    return sorted(keyword_hits["role"])
 
 
-def _extract_locations(query: str, query_lower: str) -> List[str]:
-    locations: Set[str] = set()
+def _extract_locations(query: str, query_lower: str, keyword_hits: Optional[Dict[str, Set[str]]] = None) -> List[str]:
+    if keyword_hits is None:
+        keyword_hits = _match_keywords(query_lower)
     # Match state names
-    for state in US_STATE_NAMES:
-        if state in query_lower:
-            locations.add(state.title())
+    locations: Set[str] = {state.title() for state in keyword_hits["state"]}
     # Match abbreviations (two letters uppercase)
     tokens = re.findall(r"\b[A-Za-z]{2}\b", query)
     for token in tokens:
@@ -576,7 +632,10 @@ def _determine_intent(
     services: List[str],
     locations: List[str],
     organizations: List[str],
+    keyword_hits: Optional[Dict[str, Set[str]]] = None,
 ) -> (str, float, Dict[str, Any]):
+    if keyword_hits is None:
+        keyword_hits = _match_keywords(query_lower)
     signals: Dict[str, Any] = {
         "is_question": False,
         "question_word": None,
@@ -599,16 +658,16 @@ def _determine_intent(
             signals["question_word"] = first_word
 
     lowered = query_lower
-    if any(modifier in lowered for modifier in LOCAL_MODIFIERS):
+    if keyword_hits["local_modifier"]:
         signals["has_local_modifier"] = True
 
     if re.search(r"\b\d{5}(?:-\d{4})?\b", lowered):
         signals["has_zip_code"] = True
 
-    if any(keyword in lowered for keyword in CASE_STUDY_KEYWORDS):
+    if keyword_hits["case_study"]:
         signals["has_case_study_signal"] = True
 
-    if any(keyword in lowered for keyword in REGULATORY_KEYWORDS):
+    if keyword_hits["regulatory"]:
         signals["has_regulatory_signal"] = True
 
     # Person / executive detection with improved context understanding
@@ -659,10 +718,10 @@ def _determine_intent(
         return "executive_role", 0.8, signals
 
     # Navigational vs transactional vs informational
-    if any(keyword in query_lower for keyword in NAVIGATIONAL_KEYWORDS):
+    if keyword_hits["navigational"]:
         return "navigational", 0.75, signals
 
-    if any(keyword in query_lower for keyword in TRANSACTIONAL_KEYWORDS):
+    if keyword_hits["transactional"]:
         return "transactional", 0.7, signals
 
     # Local service detection (service + location)
@@ -685,7 +744,7 @@ def _determine_intent(
         return "service", 0.8, signals
 
     # Sector detection
-    if any(keyword in query_lower for keyword in SECTOR_KEYWORDS) or any(phrase in query_lower for phrase in SECTOR_PHRASES):
+    if keyword_hits["sector"] or keyword_hits["sector_phrase"]:
         return "sector", 0.65, signals
 
     # Case study detection
@@ -903,10 +962,11 @@ def analyze_query(query: str, llm_client=None, use_ai: bool = True) -> Dict[str,
         ai_analysis = _analyze_query_with_ai(query, llm_client)
     
     # Always perform heuristic analysis as fallback/validation
+    keyword_hits = _match_keywords(query_lower)
     people = _extract_capitalized_phrases(query)
-    roles = _extract_roles(query_lower)
-    services = _extract_services(query_lower)
-    locations = _extract_locations(query, query_lower)
+    roles = _extract_roles(query_lower, keyword_hits)
+    services = _extract_services(query_lower, keyword_hits)
+    locations = _extract_locations(query, query_lower, keyword_hits)
     organizations = _extract_organizations(query, query_lower)
 
     intent, confidence, signals = _determine_intent(
@@ -917,14 +977,14 @@ def analyze_query(query: str, llm_client=None, use_ai: bool = True) -> Dict[str,
         services,
         locations,
         organizations,
+        keyword_hits,
     )
 
     keywords = _tokenize_keywords(query_lower)
 
-    sector_matches = {kw for kw in SECTOR_KEYWORDS if kw in query_lower}
-    sector_matches.update({phrase for phrase in SECTOR_PHRASES if phrase in query_lower})
+    sector_matches = keyword_hits["sector"] | keyword_hits["sector_phrase"]
 
-    regulatory_matches = [kw for kw in REGULATORY_KEYWORDS if kw in query_lower]
+    regulatory_matches = [kw for kw in REGULATORY_KEYWORDS if kw in keyword_hits["regulatory"]]
 
     entities = {
         "people": people,
@@ -934,7 +994,7 @@ def analyze_query(query: str, llm_client=None, use_ai: bool = True) -> Dict[str,
         "locations": locations,
         "organizations": organizations,
         "regulatory": regulatory_matches,
-        "local_modifiers": [modifier for modifier in LOCAL_MODIFIERS if modifier in query_lower],
+        "local_modifiers": [modifier for modifier in LOCAL_MODIFIERS if modifier in keyword_hits["local_modifier"]],
     }
 
     # Merge AI analysis if available (AI takes precedence for intent/confidence)
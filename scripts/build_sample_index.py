@@ -0,0 +1,32 @@
+"""
+Build the TF-IDF snapshot for the built-in sample documents.
+
+SimpleHybridSearch falls back to a few sample documents when no real content
+has been indexed. Fitting TF-IDF for them on every cold start is wasted work,
+so this script fits it once and writes ``sample_index.joblib`` next to
+``simple_hybrid_search.py``, where it is memory-mapped at runtime.
+
+Usage:
+    python scripts/build_sample_index.py
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import joblib
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from simple_hybrid_search import SAMPLE_INDEX_PATH, build_sample_index  # noqa: E402
+
+
+def main() -> None:
+    blob = build_sample_index()
+    # Stored uncompressed so the arrays can be memory-mapped on load
+    joblib.dump(blob, SAMPLE_INDEX_PATH)
+    print(f"Wrote {len(blob['documents'])} sample documents to {SAMPLE_INDEX_PATH}")
+
+
+if __name__ == "__main__":
+    main()
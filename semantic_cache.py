@@ -0,0 +1,59 @@
+"""
+In-process cache looked up by embedding similarity instead of an exact key.
+
+Entries live in a fixed-size ring buffer of normalized embeddings, so a lookup
+is one matrix-vector product and the oldest entry is overwritten once the
+buffer is full. Like ``ttl_cache.TTLCache`` it is synchronous and expires
+entries lazily: an entry older than ``ttl_sec`` is never returned.
+"""
+import time
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+
+class SemanticCache:
+    """Ring buffer of (embedding, value) pairs answering nearest-neighbour lookups."""
+
+    def __init__(self, max_items: int, dim: int, min_similarity: float, ttl_sec: float):
+        self.max_items = max_items
+        self.min_similarity = min_similarity
+        self.ttl_sec = ttl_sec
+        self._vectors = np.zeros((max_items, dim), dtype=np.float32)
+        self._expires_at = np.zeros(max_items, dtype=np.float64)
+        self._values: List[Any] = []
+        self._next_slot = 0
+
+    def get(self, embedding: np.ndarray) -> Optional[Tuple[Any, float]]:
+        """
+        Value of the most similar live entry and its cosine similarity, or None
+        when no entry reaches min_similarity. embedding must be L2-normalized.
+        """
+        count = len(self._values)
+        if count == 0:
+            return None
+        similarities = self._vectors[:count] @ embedding
+        similarities[self._expires_at[:count] <= time.monotonic()] = -np.inf
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.min_similarity:
+            return None
+        return self._values[best], float(similarities[best])
+
+    def set(self, embedding: np.ndarray, value: Any) -> None:
+        """Store value under a normalized embedding, overwriting the oldest slot when full."""
+        slot = self._next_slot
+        self._vectors[slot] = embedding
+        self._expires_at[slot] = time.monotonic() + self.ttl_sec
+        if slot < len(self._values):
+            self._values[slot] = value
+        else:
+            self._values.append(value)
+        self._next_slot = (slot + 1) % self.max_items
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._values = []
+        self._next_slot = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
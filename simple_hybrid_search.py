@@ -1,18 +1,34 @@
 """
 Simplified hybrid search implementation without complex LlamaIndex dependencies.
 """
+import base64
+import bisect
+import copy
+import functools
+import hashlib
+import heapq
 import logging
 import re
-from typing import List, Dict, Any, Optional
+import time
+from datetime import datetime, timezone
+from collections import OrderedDict, defaultdict
+from operator import itemgetter
+from pathlib import Path
+from typing import List, Dict, Any, FrozenSet, Optional, Set, Tuple
 from urllib.parse import urlsplit, urlunsplit
 import httpx
 import asyncio
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+import joblib
 import json
 from config import settings
 from query_analysis import analyze_query
+from ttl_cache import TTLCache
+from semantic_cache import SemanticCache
+from json_utils import json_loads
+from embedding_store import PersistentEmbeddingStore, FCNTL_AVAILABLE
 from constants import (
     EMBEDDING_DIMENSION,
     TFIDF_MAX_FEATURES,
@@ -22,18 +38,47 @@ from constants import (
     DEFAULT_CHUNK_SIZE,
     DEFAULT_CHUNK_OVERLAP,
     INDEX_BATCH_SIZE,
+    QDRANT_UPSERT_CHUNK_SIZE,
+    QDRANT_UPSERT_CONCURRENCY,
     MAX_SEARCH_RESULTS_FOR_ANSWER,
     MIN_RERANK_CANDIDATES,
     RERANK_BUFFER_SIZE,
     MAX_RERANK_CANDIDATES,
+    SEARCH_RESULT_CACHE_SIZE,
+    PERSISTED_EMBEDDING_CACHE_MAX_ENTRIES,
+    SEARCH_RESULT_CACHE_TTL,
+    STATS_CACHE_TTL,
+    STATS_SCROLL_PAGE_SIZE,
+    ALT_QUERY_CACHE_SIZE,
+    ALT_QUERY_CACHE_TTL,
+    DOCUMENT_BOOST_REFRESH_SEC,
+    FRESHNESS_AGE_DAYS,
+    FRESHNESS_BOOSTS,
+    TFIDF_SCORE_CACHE_SIZE,
+    TFIDF_QUERY_VECTOR_CACHE_SIZE,
+    NUMPY_SORT_MIN_ITEMS,
+    NUMPY_NORMALIZE_MIN_ITEMS,
+    RRF_DEFAULT_K,
+    RRF_RECIPROCAL_TABLE_SIZE,
+    INTENT_CACHE_SIZE,
+    INTENT_CACHE_TTL,
+    INTENT_CACHE_SIMILARITY,
     TFIDF_HIGH_CONFIDENCE_THRESHOLD,
+    SCORE_GAP_MARGIN,
     MAX_RESULT_LIMIT,
     RELEVANCE_HIGH_THRESHOLD,
     RELEVANCE_MEDIUM_THRESHOLD,
     RELEVANCE_LOW_THRESHOLD,
     OPENAI_EMBEDDING_MODEL,
     MAX_LLM_INPUT_LENGTH,
-    DEFAULT_EMBEDDING_MODEL
+    DEFAULT_EMBEDDING_MODEL,
+    HASH_EMBEDDING_CACHE_SIZE,
+    URL_NORMALIZE_CACHE_SIZE,
+    HASH_EMBEDDING_CACHE_MAX_TEXT,
+    QUERY_CACHE_KEY_MAX_RAW,
+    QUERY_EMBEDDING_ALIAS_CACHE_SIZE,
+    EMBED_COALESCE_WINDOW_SEC,
+    EMBED_COALESCE_MAX_BATCH,
 )
 
 logger = logging.getLogger(__name__)
@@ -65,6 +110,340 @@ except ImportError as e:
     SentenceTransformer = None
     SENTENCE_TRANSFORMERS_AVAILABLE = False
 
+# OpenAI SDK for hosted embeddings
+try:
+    from openai import AsyncOpenAI
+    OPENAI_AVAILABLE = True
+except ImportError as e:
+    logging.warning(f"OpenAI SDK not available, OpenAI embeddings disabled: {e}")
+    AsyncOpenAI = None
+    OPENAI_AVAILABLE = False
+
+def _openai_embeddings_configured() -> bool:
+    """Whether a real OpenAI API key is set, making OpenAI the first embedding backend."""
+    return bool(
+        OPENAI_AVAILABLE
+        and getattr(settings, 'openai_api_key', None)
+        and settings.openai_api_key != "your_openai_api_key_here"
+    )
+
+
+def _primary_embedding_source() -> Optional[str]:
+    """
+    Id of the embedding model queries are meant to be embedded with ("provider:model"),
+    or None when only hash fallback vectors are available.
+    """
+    if _openai_embeddings_configured():
+        return f"openai:{OPENAI_EMBEDDING_MODEL}"
+    if SENTENCE_TRANSFORMERS_AVAILABLE:
+        return f"sentence-transformers:{DEFAULT_EMBEDDING_MODEL}"
+    return None
+
+
+def _embedding_store_path(base_path: str, source: str) -> str:
+    """Per-model variant of the configured embedding cache path (cache.npy -> cache.openai-<model>.npy)."""
+    path = Path(base_path)
+    slug = re.sub(r'[^A-Za-z0-9_.-]+', '-', source)
+    return str(path.with_name(f"{path.stem}.{slug}{path.suffix}"))
+
+
+def _decode_embedding(value: Any) -> np.ndarray:
+    """float32 vector from a raw embeddings response item (base64 or a float list)."""
+    if isinstance(value, str):
+        return np.frombuffer(base64.b64decode(value), dtype=np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+
+def _canonical_query_key(query: str) -> str:
+    """
+    Fold a query to a canonical form for near-duplicate embedding reuse.
+    
+    Lowercases, drops punctuation and extra whitespace, and strips simple
+    English plural suffixes ("stands" -> "stand", "studies" -> "study").
+    """
+    tokens = []
+    for token in _QUERY_TOKEN_RE.findall(query.lower()):
+        if len(token) > 4 and token.endswith('ies'):
+            token = token[:-3] + 'y'
+        elif len(token) > 3 and token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+            token = token[:-1]
+        tokens.append(token)
+    return ' '.join(tokens)
+
+
+# Intent-specific reranking instructions (static text; the query is appended
+# last by SimpleHybridSearch._generate_intent_based_instructions)
+_INTENT_INSTRUCTIONS: Dict[str, str] = {
+    'person_name': """User is searching for a specific person.
+
+PRIORITY:
+1. SCS Professionals profiles where the person's full name appears in the title
+2. Biographical content about this specific person
+3. Press releases, announcements, or news about this person
+
+RULES:
+- Only show results about THIS specific person
+- Boost exact name matches in titles
+- Do NOT include general articles unless they're specifically about this person
+- If no professional profile exists, show news/articles about them""",
+    'executive_role': """User is asking about a specific executive role or position.
+
+PRIORITY:
+1. SCS Professionals profiles where the person holds the specific role mentioned (CEO, President, etc.)
+2. Press releases or announcements naming the person in that role
+3. Professional profiles that mention the role in title or content
+
+RULES:
+- Prioritize profiles where the person is CURRENTLY in that role
+- Look for role keywords: CEO, President, Executive, Chief, Director, Leader
+- Boost results where role appears in title (e.g., "Doug Doerr, CEO")
+- For "Who is the CEO?", the person currently holding that title should rank #1
+- Recent announcements about role changes are highly relevant""",
+    'service': """User is looking for services or solutions related to the query.
+
+PRIORITY:
+1. Service description pages that match the query
+2. Solution offerings and capabilities
+3. Service-specific landing pages
+
+RULES:
+- Prioritize actionable, practical service information
+- Show what services are available
+- Include capabilities and expertise areas
+- Avoid general informational content unless highly relevant""",
+    'howto': """User needs actionable guidance on the query topic.
+
+PRIORITY:
+1. Step-by-step guides and tutorials
+2. Instructional content with actionable steps
+3. "How to" articles with practical advice
+
+RULES:
+- Prioritize content with numbered steps or clear instructions
+- Look for practical, actionable advice
+- Skip theoretical content unless no practical guides exist
+- Focus on "how to do X" rather than "what is X" """,
+    'navigational': """User is looking for a specific page.
+
+PRIORITY:
+1. Exact match for the page they're looking for
+2. Related pages that might serve the same purpose
+
+RULES:
+- Match the navigation intent exactly
+- Trust AI ranking (don't override with post type priority)
+- Exact title matches should be #1""",
+    'transactional': """User wants to perform an action related to the query.
+
+PRIORITY:
+1. Pages where they can complete the action
+2. Service request pages
+3. Download/application pages
+
+RULES:
+- Show pages where user can DO something (not just read about it)
+- Prioritize actionable pages""",
+}
+
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first, in O(n) plus a sort of k items.
+    
+    Same result as a stable descending sort cut to k: ties (including the ones
+    straddling the cut-off) are resolved in index order.
+    """
+    k = min(k, scores.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < scores.size:
+        cutoff = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        above = np.flatnonzero(scores > cutoff)
+        ties = np.flatnonzero(scores == cutoff)[:k - above.size]
+        top = np.concatenate((above, ties))
+    else:
+        top = np.arange(scores.size)
+    return top[np.lexsort((top, -scores[top]))]
+
+
+def _add_fallback_explanations(
+    results: List[Dict[str, Any]],
+    reason: str,
+    post_type_priority: Optional[List[str]] = None,
+) -> None:
+    """Attach the ranking_explanation used when results are returned without AI reranking."""
+    priority_order = post_type_priority if post_type_priority else []
+    for position, result in enumerate(results, 1):
+        score = round(result.get('score', 0.0), 4)
+        result['ranking_explanation'] = {
+            'tfidf_score': score,
+            'ai_score': None,
+            'ai_score_raw': None,
+            'hybrid_score': score,
+            'tfidf_weight': 1.0,
+            'ai_weight': 0.0,
+            'ai_reason': reason,
+            'post_type': result.get('type', 'unknown'),
+            'position_before_priority': None,
+            'final_position': position,
+            'post_type_priority': 9999,
+            'priority_order': priority_order,
+        }
+
+
+@functools.lru_cache(maxsize=1)
+def _openai_client() -> "AsyncOpenAI":
+    """Shared async OpenAI client, created once so its HTTP connection pool is reused."""
+    return AsyncOpenAI(api_key=settings.openai_api_key)
+
+
+def _openai_dimension_args(model: str) -> Dict[str, Any]:
+    """
+    Ask text-embedding-3 models for EMBEDDING_DIMENSION-wide vectors directly.
+    
+    The API truncates and L2-normalizes server-side, which is cosine-equivalent to
+    truncating locally but sends a quarter of the floats. Passed via extra_body
+    because the pinned SDK predates the ``dimensions`` keyword.
+    """
+    if model.startswith('text-embedding-3'):
+        return {'extra_body': {'dimensions': EMBEDDING_DIMENSION}}
+    return {}
+
+
+def _hash_embed(text: str) -> np.ndarray:
+    """Deterministic md5-derived vector used as the non-semantic embedding fallback (read-only)."""
+    # Each digest byte becomes one component, normalized to 0-1 and zero-padded
+    # to the target dimension (writing into a preallocated vector beats np.pad)
+    raw = np.frombuffer(hashlib.md5(text.encode()).digest(), dtype=np.uint8)[:EMBEDDING_DIMENSION]
+    embedding = np.zeros(EMBEDDING_DIMENSION, dtype=np.float32)
+    embedding[:raw.size] = raw
+    embedding *= np.float32(1.0 / 255.0)
+    # Memoized arrays are shared between callers, so they must not be mutated
+    embedding.flags.writeable = False
+    return embedding
+
+
+_hash_embed_cached = functools.lru_cache(maxsize=HASH_EMBEDDING_CACHE_SIZE)(_hash_embed)
+
+
+_QUERY_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# HTML scanning for the heading/anchor boost (compiled once, used per scored document)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_HEADING_RE = re.compile(r'<h[1-3][^>]*>(.*?)</h[1-3]>', re.IGNORECASE | re.DOTALL)
+_ANCHOR_RE = re.compile(r'<a[^>]*>(.*?)</a>', re.IGNORECASE | re.DOTALL)
+
+
+def _strip_and_collapse(text: str) -> str:
+    """Drop HTML tags, collapse whitespace runs to single spaces, strip and lowercase."""
+    # Most headings/anchors carry no nested markup, so skip the tag pass for them;
+    # split()/join collapses and strips whitespace in one C-level pass
+    if '<' in text:
+        text = _HTML_TAG_RE.sub(' ', text)
+    return ' '.join(text.split()).lower()
+
+
+@functools.lru_cache(maxsize=URL_NORMALIZE_CACHE_SIZE)
+def _normalize_url(url: str) -> str:
+    """Canonical scheme://host/path form of a URL, used to match CTR signals to results."""
+    if not url:
+        return ""
+    try:
+        parsed = urlsplit(url)
+        scheme = parsed.scheme.lower()
+        netloc = parsed.netloc.lower()
+        path = parsed.path.rstrip('/') or '/'
+        return urlunsplit((scheme, netloc, path, '', ''))
+    except Exception:
+        return url.strip().lower().rstrip('/')
+
+
+# 1 / (k + rank) for ranks 1..RRF_RECIPROCAL_TABLE_SIZE at the default RRF constant
+_RRF_RECIPROCALS = tuple(1.0 / (RRF_DEFAULT_K + rank) for rank in range(1, RRF_RECIPROCAL_TABLE_SIZE + 1))
+
+
+def _rrf_reciprocals(k: int, count: int) -> Tuple[float, ...]:
+    """Table of 1 / (k + rank) for ranks 1..count (the shared one when it covers the request)."""
+    if k == RRF_DEFAULT_K and count <= RRF_RECIPROCAL_TABLE_SIZE:
+        return _RRF_RECIPROCALS
+    return tuple(1.0 / (k + rank) for rank in range(1, count + 1))
+
+
+def _prepare_query_tokens(query: str) -> Tuple[str, FrozenSet[str]]:
+    """Lowercased, stripped query and its words of 3+ characters, shared by the per-document boosts."""
+    query_lower = query.lower().strip()
+    return query_lower, frozenset(word for word in query_lower.split() if len(word) >= 3)
+
+
+# Sample documents used when no real content has been indexed yet
+SAMPLE_DOCUMENTS: List[Dict[str, Any]] = [
+    {
+        'id': 'sample1',
+        'title': 'Energy Audit Services',
+        'slug': 'energy-audit',
+        'type': 'post',
+        'url': 'https://www.scsengineers.com/energy-audit/',
+        'date': '2024-01-01',
+        'modified': '2024-01-01',
+        'author': 'SCS Engineers',
+        'categories': [],
+        'tags': [],
+        'excerpt': 'Professional energy audit services for industrial facilities.',
+        'content': 'SCS Engineers provides comprehensive energy audit services to help industrial facilities reduce energy costs and improve efficiency. Our certified energy auditors use advanced tools and techniques to identify energy-saving opportunities.',
+        'word_count': 25
+    },
+    {
+        'id': 'sample2',
+        'title': 'Environmental Consulting',
+        'slug': 'environmental-consulting',
+        'type': 'post',
+        'url': 'https://www.scsengineers.com/environmental-consulting/',
+        'date': '2024-01-02',
+        'modified': '2024-01-02',
+        'author': 'SCS Engineers',
+        'categories': [],
+        'tags': [],
+        'excerpt': 'Expert environmental consulting services.',
+        'content': 'SCS Engineers offers environmental consulting services including environmental impact assessments, remediation planning, and regulatory compliance assistance.',
+        'word_count': 20
+    },
+    {
+        'id': 'sample3',
+        'title': 'Waste Management Solutions',
+        'slug': 'waste-management',
+        'type': 'post',
+        'url': 'https://www.scsengineers.com/waste-management/',
+        'date': '2024-01-03',
+        'modified': '2024-01-03',
+        'author': 'SCS Engineers',
+        'categories': [],
+        'tags': [],
+        'excerpt': 'Comprehensive waste management solutions.',
+        'content': 'SCS Engineers provides innovative waste management solutions for industrial and municipal clients. Our services include waste characterization, treatment design, and regulatory compliance.',
+        'word_count': 22
+    }
+]
+
+# Prebuilt TF-IDF snapshot of SAMPLE_DOCUMENTS (see scripts/build_sample_index.py)
+SAMPLE_INDEX_PATH = Path(__file__).resolve().parent / "sample_index.joblib"
+
+
+def build_sample_index() -> Dict[str, Any]:
+    """Fit a TF-IDF index over SAMPLE_DOCUMENTS."""
+    vectorizer = TfidfVectorizer(
+        max_features=TFIDF_MAX_FEATURES,
+        stop_words='english',
+        ngram_range=(TFIDF_NGRAM_MIN, TFIDF_NGRAM_MAX)
+    )
+    documents = copy.deepcopy(SAMPLE_DOCUMENTS)
+    document_texts = [f"{doc['title']} {doc['content']}" for doc in documents]
+    return {
+        'vectorizer': vectorizer,
+        'matrix': vectorizer.fit_transform(document_texts),
+        'document_texts': document_texts,
+        'documents': documents,
+    }
+
 
 class SimpleHybridSearch:
     """Simplified hybrid search implementation."""
@@ -77,8 +456,54 @@ class SimpleHybridSearch:
         self._last_query_analysis: Optional[Dict[str, Any]] = None
         
         # OPTIMIZATION: Cache query embeddings (queries repeat often)
-        self._query_embedding_cache = {}
+        # (LRU: hits move to the end, the least recently used entry is evicted)
+        self._query_embedding_cache: "OrderedDict[Any, np.ndarray]" = OrderedDict()
         self._query_cache_max_size = 1000  # Max cached queries
+        # Second tier keyed by canonical query form, so near-duplicates
+        # ("laptop stand" / "Laptop stands!") share one embedding
+        self._query_embedding_alias_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        # Optional on-disk tier shared by all workers, so popular queries survive restarts.
+        # One file per embedding model, and only vectors from that (primary) model are
+        # written, so a model or provider change never serves vectors from another space
+        self._embedding_source = _primary_embedding_source()
+        self._persisted_embeddings: Optional[PersistentEmbeddingStore] = None
+        if settings.embedding_cache_path and self._embedding_source is not None:
+            if FCNTL_AVAILABLE:
+                self._persisted_embeddings = PersistentEmbeddingStore(
+                    _embedding_store_path(settings.embedding_cache_path, self._embedding_source),
+                    EMBEDDING_DIMENSION,
+                    max_entries=PERSISTED_EMBEDDING_CACHE_MAX_ENTRIES,
+                )
+            else:
+                logger.warning("fcntl not available - query embedding cache will not be persisted")
+        
+        # Single-text local encodes are queued and coalesced into batched encode calls
+        # (queue and worker are created on first use, bound to the running loop)
+        self._embed_queue: Optional[asyncio.Queue] = None
+        self._embed_worker_task: Optional[asyncio.Task] = None
+        # Fire-and-forget tasks (e.g. embedding warm-ups); the loop only keeps weak
+        # references, so they are held here until done
+        self._background_tasks: Set[asyncio.Task] = set()
+        
+        # Concurrent searches for the same query share one in-flight analyze_query call
+        self._inflight_analysis: Dict[str, asyncio.Future] = {}
+        
+        # Query analysis cache: exact query tier, plus a semantic tier (nearest query
+        # embedding) whose hits reuse the LLM-detected (intent, confidence)
+        self._intent_cache = TTLCache(max_items=INTENT_CACHE_SIZE, ttl_sec=INTENT_CACHE_TTL)
+        self._semantic_intents = SemanticCache(
+            INTENT_CACHE_SIZE, EMBEDDING_DIMENSION, INTENT_CACHE_SIMILARITY, INTENT_CACHE_TTL
+        )
+        
+        # Short-lived cache of full search() responses (pagination, repeated queries)
+        self._search_result_cache = TTLCache(max_items=SEARCH_RESULT_CACHE_SIZE, ttl_sec=SEARCH_RESULT_CACHE_TTL)
+        
+        # Post type breakdown for get_stats (keyed by collection size)
+        self._stats_cache = TTLCache(max_items=4, ttl_sec=STATS_CACHE_TTL)
+        
+        # LLM-generated alternative queries per (query, top result ids)
+        self._alt_query_cache = TTLCache(max_items=ALT_QUERY_CACHE_SIZE, ttl_sec=ALT_QUERY_CACHE_TTL)
+        self._known_post_types: List[str] = []
         
         # Initialize Qdrant if available
         if QDRANT_AVAILABLE and QdrantManager is not None:
@@ -137,6 +562,32 @@ class SimpleHybridSearch:
         self.tfidf_matrix = None
         self.documents = []
         self.document_texts = []
+        # Lowercased title/content/excerpt per document (parallel to self.documents)
+        self._titles_lower: List[str] = []
+        self._contents_lower: List[str] = []
+        self._excerpts_lower: List[str] = []
+        self._meta_texts_lower: List[str] = []
+        self._category_terms: List[List[Tuple[str, str]]] = []
+        self._tag_terms: List[List[Tuple[str, str]]] = []
+        # Inverted index over whitespace tokens of those fields: newline-joined
+        # vocabulary (for substring lookups), token start offsets and doc postings
+        self._token_vocab = ''
+        self._token_starts: List[int] = []
+        self._token_postings: List[List[int]] = []
+        # Query-independent boosts per document; freshness depends on the clock,
+        # so it is recomputed every DOCUMENT_BOOST_REFRESH_SEC
+        self._freshness_boosts: List[float] = []
+        self._taxonomy_depth_boosts: List[float] = []
+        self._freshness_boosts_at = 0.0
+        # Query-independent part of each document's TF-IDF result dict
+        self._result_templates: List[Dict[str, Any]] = []
+        # Bumped whenever self.documents / the TF-IDF matrix are replaced
+        self._corpus_version = 0
+        # TF-IDF similarity vector per (query, corpus version), so later pages skip the matmul
+        self._tfidf_score_cache: "OrderedDict[Tuple[str, int], np.ndarray]" = OrderedDict()
+        # TF-IDF query vector per (normalized query, corpus version), shared by the
+        # lexical scores and the sparse vector sent to Qdrant
+        self._tfidf_query_vector_cache: "OrderedDict[Tuple[str, int], Any]" = OrderedDict()
         
         # Don't initialize with sample data on startup - only when actually needed
         # Sample data will be initialized lazily if no real data is available
@@ -178,67 +629,25 @@ class SimpleHybridSearch:
         if self.tfidf_matrix is not None or len(self.documents) > 0:
             return  # Already have data, don't initialize sample data
         
+        blob = None
+        if SAMPLE_INDEX_PATH.exists():
+            try:
+                # Memory-map the prebuilt snapshot so workers share its pages
+                blob = joblib.load(SAMPLE_INDEX_PATH, mmap_mode='r')
+            except Exception as e:
+                logger.warning(f"Could not load sample index snapshot ({e}), fitting sample data instead")
+        
         try:
-            sample_docs = [
-                {
-                    'id': 'sample1',
-                    'title': 'Energy Audit Services',
-                    'slug': 'energy-audit',
-                    'type': 'post',
-                    'url': 'https://www.scsengineers.com/energy-audit/',
-                    'date': '2024-01-01',
-                    'modified': '2024-01-01',
-                    'author': 'SCS Engineers',
-                    'categories': [],
-                    'tags': [],
-                    'excerpt': 'Professional energy audit services for industrial facilities.',
-                    'content': 'SCS Engineers provides comprehensive energy audit services to help industrial facilities reduce energy costs and improve efficiency. Our certified energy auditors use advanced tools and techniques to identify energy-saving opportunities.',
-                    'word_count': 25
-                },
-                {
-                    'id': 'sample2',
-                    'title': 'Environmental Consulting',
-                    'slug': 'environmental-consulting',
-                    'type': 'post',
-                    'url': 'https://www.scsengineers.com/environmental-consulting/',
-                    'date': '2024-01-02',
-                    'modified': '2024-01-02',
-                    'author': 'SCS Engineers',
-                    'categories': [],
-                    'tags': [],
-                    'excerpt': 'Expert environmental consulting services.',
-                    'content': 'SCS Engineers offers environmental consulting services including environmental impact assessments, remediation planning, and regulatory compliance assistance.',
-                    'word_count': 20
-                },
-                {
-                    'id': 'sample3',
-                    'title': 'Waste Management Solutions',
-                    'slug': 'waste-management',
-                    'type': 'post',
-                    'url': 'https://www.scsengineers.com/waste-management/',
-                    'date': '2024-01-03',
-                    'modified': '2024-01-03',
-                    'author': 'SCS Engineers',
-                    'categories': [],
-                    'tags': [],
-                    'excerpt': 'Comprehensive waste management solutions.',
-                    'content': 'SCS Engineers provides innovative waste management solutions for industrial and municipal clients. Our services include waste characterization, treatment design, and regulatory compliance.',
-                    'word_count': 22
-                }
-            ]
-            
-            # Prepare documents for TF-IDF
-            document_texts = []
-            for doc in sample_docs:
-                combined_text = f"{doc['title']} {doc['content']}"
-                document_texts.append(combined_text)
+            if blob is None:
+                blob = build_sample_index()
             
-            # Fit TF-IDF
-            self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(document_texts)
-            self.document_texts = document_texts
-            self.documents = sample_docs
+            self.tfidf_vectorizer = blob['vectorizer']
+            self.tfidf_matrix = self._as_csr(blob['matrix'])
+            self.document_texts = blob['document_texts']
+            self.documents = blob['documents']
+            self._build_search_index()
             
-            logger.debug(f"Lazily initialized with {len(sample_docs)} sample documents (no real data available)")
+            logger.debug(f"Lazily initialized with {len(self.documents)} sample documents (no real data available)")
             
         except Exception as e:
             logger.error(f"Error initializing sample data: {e}")
@@ -294,6 +703,7 @@ class SimpleHybridSearch:
             # Generate embeddings in batches for efficiency
             batch_size = 50
             doc_embeddings = {}
+            zero_embedding = np.zeros(EMBEDDING_DIMENSION, dtype=np.float32)
             
             for i in range(0, len(chunked_documents), batch_size):
                 batch_docs = chunked_documents[i:i+batch_size]
@@ -323,17 +733,17 @@ class SimpleHybridSearch:
                     else:
                         logger.warning("No embedding service available, using zero vectors")
                         for doc in batch_docs:
-                            doc_embeddings[id(doc)] = [0.0] * EMBEDDING_DIMENSION
+                            doc_embeddings[id(doc)] = zero_embedding
                             
                 except Exception as e:
                     logger.error(f"Batch embedding failed: {e}, using zero vectors")
                     for doc in batch_docs:
-                        doc_embeddings[id(doc)] = [0.0] * EMBEDDING_DIMENSION
+                        doc_embeddings[id(doc)] = zero_embedding
             
             for doc in chunked_documents:
                 try:
-                    # Get pre-generated embedding
-                    embedding = doc_embeddings.get(id(doc), [0.0] * EMBEDDING_DIMENSION)
+                    # Get pre-generated embedding (float32 row; converted to a list only at upsert)
+                    embedding = doc_embeddings.get(id(doc), zero_embedding)
                     
                     # Prepare sparse vector
                     processed_doc = {
@@ -366,16 +776,18 @@ class SimpleHybridSearch:
                 return False
             
             # Fit TF-IDF on all documents
-            self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(document_texts)
+            self.tfidf_matrix = self._as_csr(self.tfidf_vectorizer.fit_transform(document_texts))
             self.document_texts = document_texts
             
-            # Add sparse vectors to documents
-            for i, doc in enumerate(processed_docs):
-                sparse_vector = self._get_sparse_vector(document_texts[i])
+            # Add sparse vectors to documents (rows of the fitted matrix - no need
+            # to run every text through the vectorizer a second time)
+            for doc, sparse_vector in zip(processed_docs, self._sparse_rows(self.tfidf_matrix)):
                 doc['sparse_vector'] = sparse_vector
             
             # Store documents in memory for TF-IDF search
             self.documents = processed_docs
+            self._build_search_index()
+            self._search_result_cache.clear()
             
             # Store in Qdrant for hybrid search (if available)
             try:
@@ -385,8 +797,8 @@ class SimpleHybridSearch:
                     self.qdrant_manager.create_collection()
                     
                     # Upsert documents to Qdrant (converts to proper format internally)
-                    self.qdrant_manager.upsert_documents(processed_docs)
-                    logger.info(f"Successfully indexed {len(processed_docs)} documents in Qdrant")
+                    upserted = await self._upsert_documents_async(processed_docs)
+                    logger.info(f"Successfully indexed {upserted}/{len(processed_docs)} documents in Qdrant")
                 else:
                     logger.warning("Qdrant not available - skipping vector storage")
             except Exception as e:
@@ -399,6 +811,40 @@ class SimpleHybridSearch:
             logger.error(f"Error indexing documents: {e}")
             return False
     
+    async def _upsert_documents_async(self, documents: List[Dict[str, Any]]) -> int:
+        """
+        Upsert documents to Qdrant without blocking the event loop.
+        
+        The synchronous QdrantManager.upsert_documents call runs in the default
+        executor on chunks of QDRANT_UPSERT_CHUNK_SIZE documents, with at most
+        QDRANT_UPSERT_CONCURRENCY chunks in flight. A failed chunk is logged and
+        skipped so the rest of the batch still lands.
+        
+        Args:
+            documents: Processed documents (with embeddings) to upsert
+            
+        Returns:
+            Number of documents in chunks that were upserted successfully
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(QDRANT_UPSERT_CONCURRENCY)
+        chunks = [
+            documents[i:i + QDRANT_UPSERT_CHUNK_SIZE]
+            for i in range(0, len(documents), QDRANT_UPSERT_CHUNK_SIZE)
+        ]
+        
+        async def upsert_chunk(chunk: List[Dict[str, Any]]) -> int:
+            async with semaphore:
+                try:
+                    ok = await loop.run_in_executor(None, self.qdrant_manager.upsert_documents, chunk)
+                except Exception as e:
+                    logger.warning(f"Qdrant upsert of {len(chunk)} documents failed: {e}")
+                    return 0
+            return len(chunk) if ok else 0
+        
+        counts = await asyncio.gather(*(upsert_chunk(chunk) for chunk in chunks))
+        return sum(counts)
+    
     async def search(
         self, 
         query: str, 
@@ -425,6 +871,48 @@ class SimpleHybridSearch:
         Returns:
             (results, metadata) tuple
         """
+        cache_key = (
+            query.strip(),
+            offset,
+            limit,
+            enable_ai_reranking,
+            ai_weight,
+            ai_reranking_instructions,
+            tuple(post_type_priority or ()),
+            json.dumps(behavioral_signals, sort_keys=True, default=str) if behavioral_signals else None,
+        )
+        cached = self._search_result_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Search result cache hit for '%s' (offset=%d, limit=%d)", query, offset, limit)
+            # Callers may mutate results (e.g. excerpt rewriting), so never hand out the cached objects
+            return copy.deepcopy(cached)
+        
+        results, metadata = await self._search_uncached(
+            query,
+            limit,
+            offset,
+            enable_ai_reranking,
+            ai_weight,
+            ai_reranking_instructions,
+            post_type_priority,
+            behavioral_signals,
+        )
+        if 'error' not in metadata:
+            self._search_result_cache.set(cache_key, copy.deepcopy((results, metadata)))
+        return results, metadata
+    
+    async def _search_uncached(
+        self,
+        query: str,
+        limit: int,
+        offset: int,
+        enable_ai_reranking: bool,
+        ai_weight: float,
+        ai_reranking_instructions: str,
+        post_type_priority: Optional[List[str]],
+        behavioral_signals: Optional[Dict[str, Any]],
+    ) -> tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Run the full search pipeline for search(), bypassing the response cache."""
         try:
             # Validate and sanitize pagination parameters
             if offset < 0:
@@ -434,16 +922,18 @@ class SimpleHybridSearch:
             if limit > MAX_RESULT_LIMIT:
                 limit = MAX_RESULT_LIMIT
             
-            logger.info(f"Search request: query='{query}', offset={offset}, limit={limit}")
+            logger.info("Search request: query='%s', offset=%d, limit=%d", query, offset, limit)
             
             # Step 0.5: Analyze query intent and entities (with AI if available)
-            query_analysis = analyze_query(query, llm_client=self.llm_client, use_ai=True)
+            query_analysis = await self._analyze_query_coalesced(query)
             detected_intent = query_analysis.get('intent', 'general')
             intent_confidence = query_analysis.get('confidence', 0.0)
             self._last_query_analysis = query_analysis
             logger.info(
-                f"🎯 Query intent detected: {detected_intent} "
-                f"(confidence={intent_confidence:.2f}) | entities={query_analysis.get('entities', {})}"
+                "🎯 Query intent detected: %s (confidence=%.2f) | entities=%s",
+                detected_intent,
+                intent_confidence,
+                query_analysis.get('entities', {}),
             )
             
             # Generate intent-based instructions and combine with user's custom instructions
@@ -452,11 +942,11 @@ class SimpleHybridSearch:
                 # Combine user's custom instructions with intent-based instructions
                 combined_instructions = f"{ai_reranking_instructions}\n\n{intent_instructions}"
                 ai_reranking_instructions = combined_instructions
-                logger.info(f"Combined user instructions with intent-based instructions")
+                logger.info("Combined user instructions with intent-based instructions")
             elif intent_instructions:
                 # Use intent-based instructions only
                 ai_reranking_instructions = intent_instructions
-                logger.info(f"Using intent-based instructions: {detected_intent}")
+                logger.info("Using intent-based instructions: %s", detected_intent)
             
             maps_input = behavioral_signals if settings.enable_ctr_boost else None
             behavioral_maps = self._prepare_behavioral_maps(maps_input)
@@ -478,8 +968,8 @@ class SimpleHybridSearch:
             if post_type_priority:
                 # Admin priority exists - use it as base, but apply context adjustments
                 # Context adjustments will reorder within admin's priority list
-                logger.info(f"Admin priority (base): {post_type_priority}")
-                logger.info(f"Context-recommended priority: {context_recommended_priority}")
+                logger.info("Admin priority (base): %s", post_type_priority)
+                logger.info("Context-recommended priority: %s", context_recommended_priority)
                 
                 # Merge: prioritize types that are in both lists, maintaining admin order for others
                 merged_priority = []
@@ -505,11 +995,11 @@ class SimpleHybridSearch:
                 
                 # Use merged priority
                 effective_priority = merged_priority
-                logger.info(f"Using merged priority (admin + context): {effective_priority}")
+                logger.info("Using merged priority (admin + context): %s", effective_priority)
             else:
                 # No admin priority - use context recommendations directly
                 effective_priority = context_recommended_priority
-                logger.info(f"Using context-recommended priority: {effective_priority}")
+                logger.info("Using context-recommended priority: %s", effective_priority)
             
             # Store for use in post type priority application
             post_type_priority = effective_priority
@@ -532,68 +1022,47 @@ class SimpleHybridSearch:
             
             # If we have TF-IDF fitted, use it for search
             if self.tfidf_matrix is not None and len(self.documents) > 0:
-                logger.info(f"Using TF-IDF search for '{query}' (getting {search_limit} candidates)")
+                logger.info("Using TF-IDF search for '%s' (getting %d candidates)", query, search_limit)
                 tfidf_candidates = self._tfidf_search(query, search_limit, 0, query_analysis, behavioral_maps)  # Always start from 0 for initial search
                 
                 # If TF-IDF returns poor results (low scores), add simple text search as backup
                 if len(tfidf_candidates) < 3 or (tfidf_candidates and tfidf_candidates[0]['score'] < 0.1):
-                    logger.info(f"TF-IDF returned poor results, adding simple text search fallback for '{query}'")
+                    logger.info("TF-IDF returned poor results, adding simple text search fallback for '%s'", query)
                     simple_results = self._simple_text_search(query, search_limit // 2, query_analysis, behavioral_maps)
                     tfidf_candidates.extend(simple_results)
             else:
                 # Fallback to simple text search
-                logger.info(f"Using simple text search for '{query}' (getting {search_limit} candidates)")
+                logger.info("Using simple text search for '%s' (getting %d candidates)", query, search_limit)
                 tfidf_candidates = self._simple_text_search(query, search_limit, query_analysis, behavioral_maps)
             
             # Perform Vector/Semantic search (if available)
             vector_candidates = []
             try:
-                vector_candidates = await self._vector_search(query, search_limit)
-                # Apply same boosting factors to vector results
-                for result in vector_candidates:
-                    field_boost = self._calculate_field_score(query, result, query_analysis)
-                    freshness_boost = self._calculate_freshness_boost(result.get('date', ''))
-                    category_tag_boost = self._calculate_category_tag_boost(query, result)
-                    heading_anchor_boost = self._calculate_heading_anchor_boost(query, result)
-                    taxonomy_depth_boost = self._calculate_taxonomy_depth_boost(result)
-                    behavioral_boost = self._calculate_behavioral_boost(result, behavioral_maps)
-                    result['score'] *= (
-                        field_boost
-                        * freshness_boost
-                        * category_tag_boost
-                        * heading_anchor_boost
-                        * taxonomy_depth_boost
-                        * behavioral_boost
-                    )
-                    meta = result.get('meta') if isinstance(result.get('meta'), dict) else {}
-                    meta.setdefault('boost_debug', {})
-                    meta['boost_debug'].update({
-                        'field': round(field_boost, 3),
-                        'freshness': round(freshness_boost, 3),
-                        'category_tag': round(category_tag_boost, 3),
-                        'heading_anchor': round(heading_anchor_boost, 3),
-                        'taxonomy_depth': round(taxonomy_depth_boost, 3),
-                        'behavioral': round(behavioral_boost, 3),
-                    })
-                    result['meta'] = meta
+                # Boosting factors are applied inside _vector_search
+                vector_candidates = await self._vector_search(query, search_limit, query_analysis, behavioral_maps)
             except Exception as e:
-                logger.warning(f"Vector search error: {e}, continuing with TF-IDF only")
+                logger.warning("Vector search error: %s, continuing with TF-IDF only", e)
             
             # Combine TF-IDF and Vector results using Reciprocal Rank Fusion (RRF)
             if vector_candidates and len(vector_candidates) > 0:
-                logger.info(f"Combining {len(tfidf_candidates)} TF-IDF and {len(vector_candidates)} vector results using RRF")
-                candidates = self._reciprocal_rank_fusion(tfidf_candidates, vector_candidates, k=60)
-                logger.info(f"RRF combined to {len(candidates)} unique candidates")
+                logger.info("Combining %d TF-IDF and %d vector results using RRF", len(tfidf_candidates), len(vector_candidates))
+                # Unsorted - the top-k selection below orders the candidates it keeps
+                candidates = self._reciprocal_rank_fusion(tfidf_candidates, vector_candidates, sort_results=False)
+                logger.info("RRF combined to %d unique candidates", len(candidates))
             else:
-                logger.info(f"Using TF-IDF results only ({len(tfidf_candidates)} candidates)")
+                logger.info("Using TF-IDF results only (%d candidates)", len(tfidf_candidates))
                 candidates = tfidf_candidates
             
-            # Sort candidates by score (RRF score if available, otherwise original score)
-            candidates.sort(key=lambda x: x.get('score', 0), reverse=True)
+            # Keep only the top candidates by score (RRF score if available, otherwise original score).
+            # Enough are kept to cover the rerank pool and the requested page; the full count is
+            # remembered so pagination totals are unaffected.
+            total_candidates = len(candidates)
+            top_k = max(MIN_RERANK_CANDIDATES, offset + limit + RERANK_BUFFER_SIZE)
+            candidates = heapq.nlargest(top_k, candidates, key=itemgetter('score'))
             
             # Apply post type priority if specified
             if post_type_priority and len(post_type_priority) > 0:
-                logger.info(f"Applying post type priority: {post_type_priority}")
+                logger.info("Applying post type priority: %s", post_type_priority)
                 candidates = self._apply_post_type_priority(candidates, post_type_priority)
             
             if not candidates:
@@ -616,27 +1085,23 @@ class SimpleHybridSearch:
             else:
                 enable_ai_reranking = bool(enable_ai_reranking)
             
-            # Debug logging
-            logger.info(f"🤖 AI Reranking Check:")
-            logger.info(f"   enable_ai_reranking parameter: {enable_ai_reranking} (type: {type(enable_ai_reranking).__name__})")
-            logger.info(f"   LLM client available: {self.llm_client is not None}")
-            if self.llm_client:
-                logger.info(f"   LLM client type: {type(self.llm_client).__name__}")
-                logger.info(f"   LLM model: {getattr(self.llm_client, 'model', 'unknown')}")
-            logger.info(f"   Will attempt reranking: {enable_ai_reranking and self.llm_client is not None}")
+            # Debug logging (gated - skipped entirely at production log levels)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("🤖 AI Reranking Check:")
+                logger.debug("   enable_ai_reranking parameter: %s (type: %s)", enable_ai_reranking, type(enable_ai_reranking).__name__)
+                logger.debug("   LLM client available: %s", self.llm_client is not None)
+                if self.llm_client:
+                    logger.debug("   LLM client type: %s", type(self.llm_client).__name__)
+                    logger.debug("   LLM model: %s", getattr(self.llm_client, 'model', 'unknown'))
+                logger.debug("   Will attempt reranking: %s", enable_ai_reranking and self.llm_client is not None)
             
             if enable_ai_reranking and self.llm_client:
-                # OPTIMIZATION: Skip reranking if top result has very high TF-IDF confidence
-                # This saves time and cost for obvious matches
-                skip_reranking = False
-                if candidates and len(candidates) > 0:
-                    top_score = candidates[0].get('score', 0.0)
-                    if top_score >= TFIDF_HIGH_CONFIDENCE_THRESHOLD:
-                        logger.info(f"⚡ Skipping AI reranking - top result has high TF-IDF confidence ({top_score:.3f} >= {TFIDF_HIGH_CONFIDENCE_THRESHOLD})")
-                        skip_reranking = True
+                # OPTIMIZATION: Skip reranking when the TF-IDF order can already be trusted
+                # (high top score or a clear score gap); decided per query, not per page
+                skip_reason = self._rerank_skip_reason(candidates)
                 
-                if not skip_reranking:
-                    logger.info(f"🤖 Applying AI reranking to {len(candidates)} results...")
+                if skip_reason is None:
+                    logger.info("🤖 Applying AI reranking to %d results...", total_candidates)
                     
                     # OPTIMIZATION: Limit candidates sent to LLM for faster processing
                     # For pagination to work with AI reranking, we need to rerank enough candidates
@@ -645,24 +1110,28 @@ class SimpleHybridSearch:
                     rerank_limit = min(rerank_limit, MAX_RERANK_CANDIDATES)  # Cap at max for performance
                     top_candidates = candidates[:min(rerank_limit, len(candidates))]
                     
-                    logger.info(f"📊 Reranking top {len(top_candidates)} candidates (optimized from {len(candidates)} total)")
+                    logger.info("📊 Reranking top %d candidates (optimized from %d total)", len(top_candidates), total_candidates)
                     
                     try:
-                        # Use async version for better performance
-                        reranking_result = await self.llm_client.rerank_results_async(
-                            query=query,
-                            results=top_candidates,
-                            custom_instructions=ai_reranking_instructions,
-                            ai_weight=ai_weight,
-                            post_type_priority=post_type_priority,
-                            query_context=query_analysis
+                        # Use async version for better performance; bounded so a slow or
+                        # hanging LLM falls back to TF-IDF instead of stalling the search
+                        reranking_result = await asyncio.wait_for(
+                            self.llm_client.rerank_results_async(
+                                query=query,
+                                results=top_candidates,
+                                custom_instructions=ai_reranking_instructions,
+                                ai_weight=ai_weight,
+                                post_type_priority=post_type_priority,
+                                query_context=query_analysis
+                            ),
+                            timeout=settings.rerank_timeout_sec
                         )
                         
                         reranked = reranking_result['results']
                         metadata = reranking_result['metadata']
                         
                         # Ensure total_results is included in metadata
-                        metadata['total_results'] = len(candidates)
+                        metadata['total_results'] = total_candidates
                         
                         # Add query intent info for admin tooltips
                         metadata['query_intent'] = detected_intent
@@ -679,78 +1148,44 @@ class SimpleHybridSearch:
                             if 'ranking_explanation' in result:
                                 result['ranking_explanation']['final_position'] = offset + idx + 1
                         
-                        logger.info(f"✅ AI reranking successful, returning {len(paginated_results)} results (offset={offset}, limit={limit})")
-                        logger.info(f"🔍 AI RERANKING DEBUG: total_candidates={len(candidates)}, reranked_count={len(reranked)}, paginated_count={len(paginated_results)}")
+                        logger.info("✅ AI reranking successful, returning %d results (offset=%d, limit=%d)", len(paginated_results), offset, limit)
+                        logger.debug("🔍 AI RERANKING DEBUG: total_candidates=%d, reranked_count=%d, paginated_count=%d", total_candidates, len(reranked), len(paginated_results))
                         
                         # Debug: Log if ranking_explanation exists
                         if paginated_results and 'ranking_explanation' in paginated_results[0]:
-                            logger.info(f"✅ First paginated result has ranking_explanation: {paginated_results[0]['ranking_explanation']}")
+                            logger.debug("✅ First paginated result has ranking_explanation: %s", paginated_results[0]['ranking_explanation'])
                         else:
-                            logger.warning(f"⚠️ First paginated result missing ranking_explanation!")
+                            logger.warning("⚠️ First paginated result missing ranking_explanation!")
                         
                         return paginated_results, metadata
                         
                     except Exception as e:
-                        logger.error(f"AI reranking failed: {e}, falling back to TF-IDF results")
+                        if isinstance(e, asyncio.TimeoutError):
+                            failure = f'AI reranking failed: timed out after {settings.rerank_timeout_sec}s'
+                        else:
+                            failure = f'AI reranking failed: {str(e)}'
+                        logger.error("%s, falling back to TF-IDF results", failure)
                         # Fall through to return TF-IDF results with proper pagination
-                        paginated_results = candidates[offset:offset + limit]
-                        
-                        # Add ranking explanation for fallback results
-                        for idx, result in enumerate(paginated_results):
-                            result['ranking_explanation'] = {
-                                'tfidf_score': round(result.get('score', 0.0), 4),
-                                'ai_score': None,
-                                'ai_score_raw': None,
-                                'hybrid_score': round(result.get('score', 0.0), 4),
-                                'tfidf_weight': 1.0,
-                                'ai_weight': 0.0,
-                                'ai_reason': f'AI reranking failed: {str(e)}',
-                                'post_type': result.get('type', 'unknown'),
-                                'position_before_priority': None,
-                                'final_position': idx + 1,
-                                'post_type_priority': 9999,
-                                'priority_order': post_type_priority if post_type_priority else []
-                            }
-                        
-                        logger.info(f"🔍 TF-IDF FALLBACK DEBUG: total_candidates={len(candidates)}, offset={offset}, limit={limit}, paginated_count={len(paginated_results)}")
-                        return paginated_results, {
-                            'ai_reranking_used': False,
-                            'reason': f'AI reranking failed: {str(e)}',
-                            'total_results': len(candidates),
-                            'query_context': query_analysis,
-                            'query_intent': detected_intent,
-                            'intent_instructions': intent_instructions if intent_instructions else None,
-                            'behavioral_applied': behavioral_enabled,
-                            'behavioral_signals': behavioral_signals,
-                        }
+                        return self._build_tfidf_response(
+                            candidates, offset, limit, failure, post_type_priority,
+                            total_candidates=total_candidates,
+                            query_analysis=query_analysis,
+                            detected_intent=detected_intent,
+                            intent_instructions=intent_instructions,
+                            behavioral_enabled=behavioral_enabled,
+                            behavioral_signals=behavioral_signals,
+                        )
                 else:
                     # Skip reranking due to high TF-IDF confidence - return TF-IDF results
-                    paginated_results = candidates[offset:offset + limit]
-                    for idx, result in enumerate(paginated_results):
-                        result['ranking_explanation'] = {
-                            'tfidf_score': round(result.get('score', 0.0), 4),
-                            'ai_score': None,
-                            'ai_score_raw': None,
-                            'hybrid_score': round(result.get('score', 0.0), 4),
-                            'tfidf_weight': 1.0,
-                            'ai_weight': 0.0,
-                            'ai_reason': 'Skipped - high TF-IDF confidence',
-                            'post_type': result.get('type', 'unknown'),
-                            'position_before_priority': None,
-                            'final_position': idx + 1,
-                            'post_type_priority': 9999,
-                            'priority_order': post_type_priority if post_type_priority else []
-                        }
-                    return paginated_results, {
-                        'ai_reranking_used': False,
-                        'reason': 'Skipped - high TF-IDF confidence',
-                        'total_results': len(candidates),
-                        'query_context': query_analysis,
-                        'query_intent': detected_intent,
-                        'intent_instructions': intent_instructions if intent_instructions else None,
-                        'behavioral_applied': behavioral_enabled,
-                        'behavioral_signals': behavioral_signals,
-                    }
+                    return self._build_tfidf_response(
+                        candidates, offset, limit, skip_reason, post_type_priority,
+                        total_candidates=total_candidates,
+                        query_analysis=query_analysis,
+                        detected_intent=detected_intent,
+                        intent_instructions=intent_instructions,
+                        behavioral_enabled=behavioral_enabled,
+                        behavioral_signals=behavioral_signals,
+                    )
             else:
                 if not enable_ai_reranking:
                     logger.info("❌ AI reranking disabled by parameter, using TF-IDF results")
@@ -767,39 +1202,18 @@ class SimpleHybridSearch:
                     disable_reason = "AI reranking unavailable"
             
             # No AI reranking, return TF-IDF results with offset
-            paginated_results = candidates[offset:offset + limit]
-            
-            # Add ranking explanation even when AI reranking is disabled
-            for idx, result in enumerate(paginated_results):
-                result['ranking_explanation'] = {
-                    'tfidf_score': round(result.get('score', 0.0), 4),
-                    'ai_score': None,
-                    'ai_score_raw': None,
-                    'hybrid_score': round(result.get('score', 0.0), 4),
-                    'tfidf_weight': 1.0,
-                    'ai_weight': 0.0,
-                    'ai_reason': disable_reason,
-                    'post_type': result.get('type', 'unknown'),
-                    'position_before_priority': None,
-                    'final_position': idx + 1,
-                    'post_type_priority': 9999,
-                    'priority_order': post_type_priority if post_type_priority else []
-                }
-            
-            logger.info(f"🔍 TF-IDF DEBUG: total_candidates={len(candidates)}, offset={offset}, limit={limit}, paginated_count={len(paginated_results)}")
-            return paginated_results, {
-                'ai_reranking_used': False,
-                'reason': disable_reason,
-                'total_results': len(candidates),
-                'query_context': query_analysis,
-                'query_intent': detected_intent,
-            'intent_instructions': intent_instructions if intent_instructions else None,
-            'behavioral_applied': behavioral_enabled,
-            'behavioral_signals': behavioral_signals,
-            }
+            return self._build_tfidf_response(
+                candidates, offset, limit, disable_reason, post_type_priority,
+                total_candidates=total_candidates,
+                query_analysis=query_analysis,
+                detected_intent=detected_intent,
+                intent_instructions=intent_instructions,
+                behavioral_enabled=behavioral_enabled,
+                behavioral_signals=behavioral_signals,
+            )
             
         except Exception as e:
-            logger.error(f"Error in search: {e}")
+            logger.error("Error in search: %s", e)
             return [], {
                 'error': str(e),
                 'total_results': 0,
@@ -809,6 +1223,174 @@ class SimpleHybridSearch:
             'behavioral_signals': behavioral_signals if 'behavioral_signals' in locals() else None,
             }
     
+    @staticmethod
+    def _rerank_skip_reason(candidates: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Reason to skip AI reranking for a query's ranked candidates, or None to rerank.
+        
+        Reranking is skipped when the top score is very high, or when it leads the
+        score at a fixed rank - the last slot of the minimum rerank pool - by at
+        least SCORE_GAP_MARGIN. Neither test looks at offset or limit: every page
+        of a query must take the same path, or reranked and unreranked pages
+        would overlap or leave results out.
+        """
+        if not candidates:
+            return None
+        
+        top_score = float(candidates[0].get('score', 0.0))
+        if top_score >= TFIDF_HIGH_CONFIDENCE_THRESHOLD:
+            logger.info("⚡ Skipping AI reranking - top result has high TF-IDF confidence (%.3f >= %s)", top_score, TFIDF_HIGH_CONFIDENCE_THRESHOLD)
+            return 'Skipped - high TF-IDF confidence'
+        
+        gap_rank = min(MIN_RERANK_CANDIDATES, len(candidates)) - 1
+        score_gap = top_score - float(candidates[gap_rank].get('score', 0.0))
+        if score_gap >= SCORE_GAP_MARGIN:
+            logger.info("⚡ Skipping AI reranking - stable TF-IDF ordering (score gap %.3f >= %s)", score_gap, SCORE_GAP_MARGIN)
+            return 'Skipped - stable TF-IDF ordering'
+        
+        return None
+    
+    def _build_tfidf_response(
+        self,
+        candidates: List[Dict[str, Any]],
+        offset: int,
+        limit: int,
+        reason: str,
+        post_type_priority: Optional[List[str]],
+        total_candidates: int,
+        query_analysis: Dict[str, Any],
+        detected_intent: str,
+        intent_instructions: Optional[str],
+        behavioral_enabled: bool,
+        behavioral_signals: Optional[Dict[str, Any]],
+    ) -> tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Build the (results, metadata) response for a search answered without AI reranking.
+        
+        Used when reranking is skipped, fails or is disabled; reason is reported
+        both in metadata and in each result's ranking_explanation.
+        """
+        paginated_results = candidates[offset:offset + limit]
+        _add_fallback_explanations(paginated_results, reason, post_type_priority)
+        
+        logger.debug("🔍 TF-IDF DEBUG: total_candidates=%d, offset=%d, limit=%d, paginated_count=%d", total_candidates, offset, limit, len(paginated_results))
+        return paginated_results, {
+            'ai_reranking_used': False,
+            'reason': reason,
+            'total_results': total_candidates,
+            'query_context': query_analysis,
+            'query_intent': detected_intent,
+            'intent_instructions': intent_instructions if intent_instructions else None,
+            'behavioral_applied': behavioral_enabled,
+            'behavioral_signals': behavioral_signals,
+        }
+    
+    async def _analyze_query_coalesced(self, query: str) -> Dict[str, Any]:
+        """
+        Analyze a query off the event loop, coalescing identical concurrent requests.
+        
+        analyze_query may make a blocking LLM round-trip, so it runs in the default
+        executor. While a call for a query is in flight, other searches for the same
+        query await the same future instead of issuing their own LLM call.
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            Query analysis dictionary (shared between coalesced callers, treat as read-only)
+        """
+        analysis = self._intent_cache.get(query)
+        if analysis is not None:
+            return analysis
+        
+        query_embedding = None
+        if self._semantic_intent_cache_enabled():
+            query_embedding = await self._get_query_embedding_cached(query)
+            analysis = self._lookup_semantic_intent(query, query_embedding)
+            if analysis is not None:
+                self._intent_cache.set(query, analysis)
+                return analysis
+        
+        future = self._inflight_analysis.get(query)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(None, analyze_query, query, self.llm_client, True)
+            self._inflight_analysis[query] = future
+            
+            def _forget(done: asyncio.Future) -> None:
+                if self._inflight_analysis.get(query) is done:
+                    del self._inflight_analysis[query]
+                if not done.cancelled() and done.exception() is None:
+                    self._remember_intent(query, query_embedding, done.result())
+            
+            future.add_done_callback(_forget)
+        else:
+            logger.debug(f"Joining in-flight query analysis for '{query}'")
+        
+        # Shield so one cancelled request does not cancel the shared call
+        return await asyncio.shield(future)
+    
+    def _semantic_intent_cache_enabled(self) -> bool:
+        """
+        Semantic intent reuse only pays off when analysis calls the LLM, and only
+        makes sense with real embeddings (hash fallback vectors are not semantic).
+        """
+        return self.llm_client is not None and self._semantic_embeddings_available()
+    
+    def _semantic_embeddings_available(self) -> bool:
+        """Whether queries get real embeddings (OpenAI or the local model), not hash vectors."""
+        return _openai_embeddings_configured() or self.embedding_model is not None
+    
+    async def get_semantic_query_embedding(self, query: str) -> Optional[np.ndarray]:
+        """
+        Normalized (cached) embedding of a query for similarity lookups, or None
+        when only hash fallback vectors are available - those are not semantic.
+        """
+        if not self._semantic_embeddings_available():
+            return None
+        return await self._get_query_embedding_cached(query)
+    
+    async def get_semantic_embeddings(self, texts: List[str]) -> Optional[np.ndarray]:
+        """
+        Normalized embeddings of several texts (one batched call), or None when
+        they could only be embedded with hash fallback vectors or not at all.
+        """
+        matrix, source = await self._get_embeddings_batch_with_source(texts)
+        if source is None or source == "hash":
+            return None
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+        return matrix
+    
+    def _lookup_semantic_intent(self, query: str, query_embedding: np.ndarray) -> Optional[Dict[str, Any]]:
+        """
+        Reuse the intent of a previously analyzed, semantically near-identical query.
+        
+        Only intent and confidence come from the cache; entities and keywords are
+        query-specific, so they are rebuilt with the (cheap) heuristic analyzer.
+        """
+        hit = self._semantic_intents.get(query_embedding)
+        if hit is None:
+            return None
+        
+        (intent, confidence), similarity = hit
+        analysis = analyze_query(query, llm_client=None, use_ai=False)
+        analysis['intent'] = intent
+        analysis['confidence'] = confidence
+        analysis['analysis_method'] = 'semantic_cache'
+        logger.debug(f"Semantic intent cache hit for '{query}' (similarity={similarity:.3f})")
+        return analysis
+    
+    def _remember_intent(self, query: str, query_embedding: Optional[np.ndarray], analysis: Dict[str, Any]) -> None:
+        """Cache a fresh query analysis in the exact tier and, with an embedding, the semantic tier."""
+        self._intent_cache.set(query, analysis)
+        if query_embedding is None or analysis.get('analysis_method') != 'ai_enhanced':
+            return
+        
+        self._semantic_intents.set(
+            query_embedding,
+            (analysis.get('intent', 'general'), float(analysis.get('confidence', 0.0)))
+        )
+    
     async def search_with_answer(
         self,
         query: str,
@@ -894,6 +1476,17 @@ class SimpleHybridSearch:
             # Extract content from top results
             top_results = search_results[:min(10, len(search_results))]  # Analyze top 10 results
             
+            # Same query over the same top results yields the same suggestions
+            cache_key = (
+                query.lower().strip(),
+                tuple(sorted(str(r.get('id')) for r in top_results)),
+                max_alternatives,
+            )
+            cached = self._alt_query_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Alternative query cache hit for: '{query}'")
+                return list(cached)
+            
             # Build context from results
             results_context = []
             for i, result in enumerate(top_results, 1):
@@ -954,16 +1547,22 @@ Return ONLY the queries, one per line, without numbering or bullet points.
             
             # Remove empty queries and limit to max_alternatives
             alternative_queries = [q for q in alternative_queries if q][:max_alternatives]
+            self._alt_query_cache.set(cache_key, tuple(alternative_queries))
             
             logger.info(f"Generated {len(alternative_queries)} content-based alternative queries: {alternative_queries}")
             
+            # Users often click a suggested alternative next; embed them all in one batch
+            # in the background so those searches hit the query embedding cache
+            if alternative_queries and self.qdrant_manager:
+                self._spawn_background(self.warm_query_embeddings(alternative_queries))
+            
             return alternative_queries
             
         except Exception as e:
             logger.error(f"Error generating content-based alternative queries: {e}")
             return []  # Return empty list on error, don't break search
     
-    async def _get_query_embedding_cached(self, query: str) -> List[float]:
+    async def _get_query_embedding_cached(self, query: str) -> np.ndarray:
         """
         Get query embedding with caching (optimization for repeated queries).
         
@@ -971,117 +1570,262 @@ Return ONLY the queries, one per line, without numbering or bullet points.
             query: Search query text
             
         Returns:
-            Embedding vector (384 dimensions)
+            L2-normalized float32 embedding vector (384 dimensions)
         """
-        import hashlib
-        
-        # Normalize query for cache key (lowercase, strip whitespace)
-        normalized_query = query.lower().strip()
-        cache_key = hashlib.md5(normalized_query.encode()).hexdigest()
+        cache_key = self._query_embedding_cache_key(query)
         
         # Check cache first
         if cache_key in self._query_embedding_cache:
             logger.debug(f"✅ Query embedding cache hit for: '{query[:50]}...'")
+            self._query_embedding_cache.move_to_end(cache_key)
             return self._query_embedding_cache[cache_key]
         
-        # Generate embedding
-        embedding = await self._get_embedding(query)
+        # Then embeddings persisted by this or another worker
+        if self._persisted_embeddings is not None:
+            embedding = self._persisted_embeddings.get(cache_key)
+            if embedding is not None:
+                logger.debug(f"✅ Persisted query embedding hit for: '{query[:50]}...'")
+                self._store_query_embedding(cache_key, embedding, persist=False)
+                return embedding
         
-        # Cache it (with size limit to prevent memory issues)
-        if len(self._query_embedding_cache) >= self._query_cache_max_size:
-            # Remove oldest entry (simple FIFO - remove first key)
-            oldest_key = next(iter(self._query_embedding_cache))
-            del self._query_embedding_cache[oldest_key]
-            logger.debug(f"Evicted oldest query embedding from cache (cache full)")
+        # Then the near-duplicate tier (case, punctuation, spacing and plural variants)
+        alias_key = _canonical_query_key(query)
+        embedding = self._query_embedding_alias_cache.get(alias_key)
+        if embedding is not None:
+            logger.debug(f"✅ Query embedding near-duplicate hit for: '{query[:50]}...'")
+            self._query_embedding_alias_cache.move_to_end(alias_key)
+            self._store_query_embedding(cache_key, embedding, persist=False)
+            return embedding
         
-        self._query_embedding_cache[cache_key] = embedding
+        # Generate embedding and keep it as a normalized float32 array so it can be
+        # handed to Qdrant as-is on every cache hit
+        embedding, source = await self._get_embedding_with_source(query)
+        embedding = np.asarray(embedding, dtype=np.float32)
+        if source is None:
+            # Zero vector after an error: never cache it, the next search retries
+            return embedding
+        embedding /= np.linalg.norm(embedding) + 1e-12
+        
+        self._store_query_embedding(cache_key, embedding, alias_key, persist=source == self._embedding_source)
         logger.debug(f"💾 Cached query embedding for: '{query[:50]}...'")
         
         return embedding
     
-    async def _get_embedding(self, text: str) -> List[float]:
-        """Get semantic embedding for text using OpenAI API or fallback."""
-        try:
-            # Try OpenAI embeddings first (if API key available)
-            if hasattr(settings, 'openai_api_key') and settings.openai_api_key and settings.openai_api_key != "your_openai_api_key_here":
-                try:
-                    from openai import OpenAI
-                    client = OpenAI(api_key=settings.openai_api_key)
-                    response = client.embeddings.create(
-                        model=OPENAI_EMBEDDING_MODEL,
-                        input=text[:MAX_LLM_INPUT_LENGTH]
-                    )
-                    embedding = response.data[0].embedding
-                    
-                    # Pad or truncate to target dimension
-                    if len(embedding) < EMBEDDING_DIMENSION:
-                        embedding = embedding + [0.0] * (EMBEDDING_DIMENSION - len(embedding))
-                    else:
-                        embedding = embedding[:EMBEDDING_DIMENSION]
-                    
-                    return embedding
-                except Exception as e:
-                    logger.warning(f"OpenAI embedding failed: {e}, using fallback")
+    def _spawn_background(self, coro) -> asyncio.Task:
+        """Run a coroutine in the background, keeping it referenced until it finishes."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_task_done)
+        return task
+    
+    def _background_task_done(self, task: asyncio.Task) -> None:
+        """Release a finished background task and log its failure, if any."""
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background task {task.get_coro().__qualname__} failed: {task.exception()}")
+    
+    async def warm_query_embeddings(self, queries: List[str]) -> int:
+        """
+        Embed and cache several queries with one batched encode call.
+        
+        Args:
+            queries: Queries likely to be searched soon (e.g. suggested alternatives)
             
-            # Use Sentence Transformers if available
-            if self.embedding_model is not None:
-                logger.debug(f"Generating semantic embedding for text (length: {len(text)} chars)")
-                
-                # Generate real semantic embedding
-                embedding = self.embedding_model.encode(
-                    text,
-                    convert_to_numpy=True,
-                    normalize_embeddings=True,
-                    show_progress_bar=False
-                )
+        Returns:
+            Number of newly cached query embeddings
+        """
+        pending: Dict[Any, str] = {}
+        for query in queries:
+            cache_key = self._query_embedding_cache_key(query)
+            if cache_key not in self._query_embedding_cache and cache_key not in pending:
+                pending[cache_key] = query
+        if not pending:
+            return 0
+        
+        matrix, source = await self._get_embeddings_batch_with_source(list(pending.values()))
+        if source is None:
+            return 0
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+        persist = source == self._embedding_source
+        for (cache_key, query), embedding in zip(pending.items(), matrix):
+            self._store_query_embedding(cache_key, embedding, _canonical_query_key(query), persist=persist)
+        
+        logger.debug(f"💾 Warmed {len(pending)} query embeddings")
+        return len(pending)
+    
+    @staticmethod
+    def _query_embedding_cache_key(query: str) -> Any:
+        """
+        Build the query embedding cache key (lowercase, stripped query).
+        
+        Short queries are their own key; longer ones use a 16-byte BLAKE2b digest
+        to bound key memory.
+        """
+        normalized_query = query.lower().strip()
+        if len(normalized_query) <= QUERY_CACHE_KEY_MAX_RAW:
+            return normalized_query
+        return hashlib.blake2b(normalized_query.encode(), digest_size=16).digest()
+    
+    def _store_query_embedding(
+        self,
+        cache_key: Any,
+        embedding: np.ndarray,
+        alias_key: Optional[str] = None,
+        persist: bool = True
+    ) -> None:
+        """
+        Cache a query embedding, evicting the least recently used entry when the cache is full.
+        
+        Only embeddings from the primary model (persist=True) go to the shared on-disk store.
+        """
+        if len(self._query_embedding_cache) >= self._query_cache_max_size:
+            self._query_embedding_cache.popitem(last=False)
+            logger.debug(f"Evicted least recently used query embedding from cache (cache full)")
+        
+        self._query_embedding_cache[cache_key] = embedding
+        if persist and self._persisted_embeddings is not None:
+            self._persisted_embeddings.add(cache_key, embedding)
+        
+        if alias_key:
+            if len(self._query_embedding_alias_cache) >= QUERY_EMBEDDING_ALIAS_CACHE_SIZE:
+                self._query_embedding_alias_cache.popitem(last=False)
+            self._query_embedding_alias_cache[alias_key] = embedding
+    
+    async def _get_embedding(self, text: str) -> np.ndarray:
+        """Get semantic embedding for text (float32 array) using OpenAI API or fallback."""
+        embedding, _ = await self._get_embedding_with_source(text)
+        return embedding
+    
+    async def _get_embedding_with_source(self, text: str) -> Tuple[np.ndarray, Optional[str]]:
+        """
+        Embedding of text plus the id of the backend that produced it: a
+        _primary_embedding_source()-style model id, "hash" for the hash fallback,
+        or None for the zero vector returned after an error.
+        """
+        try:
+            # Try OpenAI embeddings first (if API key available)
+            if _openai_embeddings_configured():
+                try:
+                    response = await _openai_client().embeddings.create(
+                        model=OPENAI_EMBEDDING_MODEL,
+                        input=text[:MAX_LLM_INPUT_LENGTH],
+                        **_openai_dimension_args(OPENAI_EMBEDDING_MODEL)
+                    )
+                    # Pad or truncate to target dimension
+                    return self._conform_dim(response.data[0].embedding), f"openai:{OPENAI_EMBEDDING_MODEL}"
+                except Exception as e:
+                    logger.warning(f"OpenAI embedding failed: {e}, using fallback")
+            
+            # Use Sentence Transformers if available
+            if self.embedding_model is not None:
+                logger.debug(f"Generating semantic embedding for text (length: {len(text)} chars)")
                 
-                # Ensure it's exactly the target dimension
-                if len(embedding) < EMBEDDING_DIMENSION:
-                    # Pad if needed
-                    embedding = np.pad(embedding, (0, EMBEDDING_DIMENSION - len(embedding)), mode='constant')
-                elif len(embedding) > EMBEDDING_DIMENSION:
-                    # Truncate if needed
-                    embedding = embedding[:EMBEDDING_DIMENSION]
+                # Generate real semantic embedding (batched with concurrent requests)
+                embedding = await self._encode_coalesced(text)
+                embedding = embedding / (np.linalg.norm(embedding) + 1e-12)
                 
-                return embedding.tolist()
+                # Ensure it's exactly the target dimension
+                return self._conform_dim(embedding), f"sentence-transformers:{DEFAULT_EMBEDDING_MODEL}"
             
             else:
                 # Fallback to hash-based embedding if Sentence Transformers not available
                 logger.warning("Using hash-based embedding fallback (install sentence-transformers for better quality)")
-                return self._hash_based_embedding(text)
+                return self._hash_based_embedding(text), "hash"
                 
         except Exception as e:
             logger.error(f"Error getting embedding: {e}")
             # Return zero vector as last resort
-            return [0.0] * 384
+            return np.zeros(EMBEDDING_DIMENSION, dtype=np.float32), None
     
-    def _hash_based_embedding(self, text: str) -> List[float]:
-        """Fallback hash-based embedding (not semantic, only for demo)."""
-        try:
-            import hashlib
+    async def _get_embeddings_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Batch counterpart of _get_embedding: same backends, one call for all texts.
+        
+        Args:
+            texts: Texts to embed
             
-            # Create a hash of the text
-            text_hash = hashlib.md5(text.encode()).hexdigest()
+        Returns:
+            float32 matrix of embeddings, one 384-dimension row per text
+        """
+        matrix, _ = await self._get_embeddings_batch_with_source(texts)
+        return matrix
+    
+    async def _get_embeddings_batch_with_source(self, texts: List[str]) -> Tuple[np.ndarray, Optional[str]]:
+        """Batch counterpart of _get_embedding_with_source (one backend id for the whole matrix)."""
+        if not texts:
+            return np.zeros((0, EMBEDDING_DIMENSION), dtype=np.float32), self._embedding_source
+        try:
+            # Try OpenAI embeddings first (if API key available)
+            if _openai_embeddings_configured():
+                try:
+                    client = _openai_client()
+                    response = await client.embeddings.create(
+                        model=OPENAI_EMBEDDING_MODEL,
+                        input=[text[:MAX_LLM_INPUT_LENGTH] for text in texts],
+                        **_openai_dimension_args(OPENAI_EMBEDDING_MODEL)
+                    )
+                    matrix = np.array([item.embedding for item in response.data], dtype=np.float32)
+                except Exception as e:
+                    logger.warning(f"OpenAI batch embedding failed: {e}, using fallback")
+                    matrix = None
+                if matrix is not None:
+                    return self._fit_embedding_width(matrix), f"openai:{OPENAI_EMBEDDING_MODEL}"
             
-            # Convert hash to 384-dimensional vector
-            embedding = []
-            for i in range(0, len(text_hash), 2):
-                # Take pairs of hex characters and convert to float
-                hex_pair = text_hash[i:i+2]
-                value = int(hex_pair, 16) / 255.0  # Normalize to 0-1
-                embedding.append(value)
+            # Use Sentence Transformers if available (off the event loop - encode is CPU-bound)
+            embedding_model = self.embedding_model
+            if embedding_model is not None:
+                matrix = await asyncio.to_thread(
+                    embedding_model.encode,
+                    texts,
+                    batch_size=32,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                    show_progress_bar=False
+                )
+                return (
+                    self._fit_embedding_width(np.asarray(matrix, dtype=np.float32)),
+                    f"sentence-transformers:{DEFAULT_EMBEDDING_MODEL}",
+                )
             
-            # Pad or truncate to exactly the target dimension
-            while len(embedding) < EMBEDDING_DIMENSION:
-                embedding.append(0.0)
-            embedding = embedding[:EMBEDDING_DIMENSION]
+            logger.warning("Using hash-based embedding fallback (install sentence-transformers for better quality)")
+            return np.array([self._hash_based_embedding(text) for text in texts], dtype=np.float32), "hash"
             
-            return embedding
+        except Exception as e:
+            logger.error(f"Error getting embedding batch: {e}")
+            return np.zeros((len(texts), EMBEDDING_DIMENSION), dtype=np.float32), None
+    
+    @staticmethod
+    def _conform_dim(vec: Any) -> np.ndarray:
+        """Return vec as a float32 array padded with zeros or truncated to EMBEDDING_DIMENSION."""
+        arr = np.asarray(vec, dtype=np.float32)
+        if arr.size == EMBEDDING_DIMENSION:
+            return arr
+        if arr.size > EMBEDDING_DIMENSION:
+            # Copy so cached vectors don't keep the full-width buffer alive
+            return arr[:EMBEDDING_DIMENSION].copy()
+        padded = np.zeros(EMBEDDING_DIMENSION, dtype=np.float32)
+        padded[:arr.size] = arr
+        return padded
+    
+    @staticmethod
+    def _fit_embedding_width(matrix: np.ndarray) -> np.ndarray:
+        """Pad or truncate an (n, d) embedding matrix to EMBEDDING_DIMENSION columns."""
+        if matrix.shape[1] < EMBEDDING_DIMENSION:
+            return np.pad(matrix, ((0, 0), (0, EMBEDDING_DIMENSION - matrix.shape[1])), mode='constant')
+        return matrix[:, :EMBEDDING_DIMENSION]
+    
+    def _hash_based_embedding(self, text: str) -> np.ndarray:
+        """Fallback hash-based embedding (not semantic, only for demo), as a float32 array."""
+        try:
+            # Only short texts are memoized so cache keys stay bounded in memory
+            if len(text) <= HASH_EMBEDDING_CACHE_MAX_TEXT:
+                return _hash_embed_cached(text).copy()
+            return _hash_embed(text).copy()
                 
         except Exception as e:
             logger.error(f"Error in hash-based embedding: {e}")
             # Return zero vector as fallback
-            return [0.0] * EMBEDDING_DIMENSION
+            return np.zeros(EMBEDDING_DIMENSION, dtype=np.float32)
     
     def _get_sparse_vector(self, text: str) -> Dict[int, float]:
         """Get sparse vector using TF-IDF."""
@@ -1089,20 +1833,38 @@ Return ONLY the queries, one per line, without numbering or bullet points.
             if self.tfidf_matrix is None:
                 return {}
             
-            # Transform text using fitted TF-IDF
-            text_vector = self.tfidf_vectorizer.transform([text])
+            # Transform text using fitted TF-IDF (shared with the lexical scores)
+            text_vector = self._tfidf_query_vector(text)
             
             # Convert to dictionary format
-            sparse_vector = {}
-            for idx, value in zip(text_vector.indices, text_vector.data):
-                sparse_vector[int(idx)] = float(value)
-            
-            return sparse_vector
+            return dict(zip(text_vector.indices.tolist(), text_vector.data.tolist()))
             
         except Exception as e:
             logger.error(f"Error getting sparse vector: {e}")
             return {}
     
+    @staticmethod
+    def _as_csr(matrix: Any) -> Any:
+        """
+        Store the TF-IDF matrix as CSR with sorted indices, the layout the
+        per-query matmul in _tfidf_scores is fastest on (no implicit conversion).
+        """
+        csr = matrix.tocsr()
+        csr.sort_indices()
+        return csr
+    
+    @staticmethod
+    def _sparse_rows(matrix: Any) -> List[Dict[int, float]]:
+        """Split a CSR matrix into one {term index: weight} dict per row, straight from its arrays."""
+        csr = matrix.tocsr()  # no-op for matrices stored via _as_csr
+        indptr = csr.indptr.tolist()
+        indices = csr.indices.tolist()
+        data = csr.data.tolist()
+        return [
+            dict(zip(indices[start:end], data[start:end]))
+            for start, end in zip(indptr, indptr[1:])
+        ]
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get search statistics including post type breakdown."""
         try:
@@ -1142,36 +1904,8 @@ Return ONLY the queries, one per line, without numbering or bullet points.
             
             if total_docs > 0 and self.qdrant_manager:
                 try:
-                    # Scroll through all points to get post type breakdown
-                    from qdrant_client.models import ScrollRequest
-                    offset = None
-                    post_type_counts = {}
-                    
-                    while True:
-                        scroll_result = self.qdrant_manager.client.scroll(
-                            collection_name=self.qdrant_manager.collection_name,
-                            limit=100,
-                            offset=offset,
-                            with_payload=True,
-                            with_vectors=False
-                        )
-                        
-                        points = scroll_result[0]
-                        if not points:
-                            break
-                        
-                        # Count by post type
-                        for point in points:
-                            if point.payload and 'type' in point.payload:
-                                post_type = str(point.payload['type'])
-                                post_type_counts[post_type] = post_type_counts.get(post_type, 0) + 1
-                        
-                        offset = scroll_result[1]
-                        if offset is None:
-                            break
-                    
-                    post_type_breakdown = post_type_counts
-                    indexed_post_types = sorted(post_type_counts.keys())
+                    post_type_breakdown = self._get_post_type_breakdown(total_docs)
+                    indexed_post_types = sorted(post_type_breakdown.keys())
                     
                     logger.debug(f"Post type breakdown: {post_type_breakdown}")
                     
@@ -1196,6 +1930,61 @@ Return ONLY the queries, one per line, without numbering or bullet points.
             logger.error(f"Error getting stats: {e}")
             return {}
     
+    def _get_post_type_breakdown(self, total_docs: int) -> Dict[str, int]:
+        """
+        Count indexed points per post type.
+        
+        Results are cached for STATS_CACHE_TTL seconds per collection size. Once the
+        post types are known they are refreshed with one filtered count request
+        per type; if those counts don't add up to total_docs (new or untyped
+        points) the collection is scrolled again in large, type-only pages.
+        """
+        cached = self._stats_cache.get(total_docs)
+        if cached is not None:
+            return dict(cached)
+        
+        client = self.qdrant_manager.client
+        collection_name = self.qdrant_manager.collection_name
+        
+        post_type_counts: Dict[str, int] = {}
+        if self._known_post_types:
+            from qdrant_client.models import FieldCondition, Filter, MatchValue
+            for post_type in self._known_post_types:
+                count_result = client.count(
+                    collection_name=collection_name,
+                    count_filter=Filter(must=[FieldCondition(key='type', match=MatchValue(value=post_type))]),
+                    exact=True
+                )
+                if count_result.count:
+                    post_type_counts[post_type] = count_result.count
+            if sum(post_type_counts.values()) != total_docs:
+                post_type_counts = {}
+        
+        if not post_type_counts:
+            # Scroll through all points, fetching only the type field
+            offset = None
+            while True:
+                points, offset = client.scroll(
+                    collection_name=collection_name,
+                    limit=STATS_SCROLL_PAGE_SIZE,
+                    offset=offset,
+                    with_payload=['type'],
+                    with_vectors=False
+                )
+                
+                # Count by post type
+                for point in points:
+                    if point.payload and 'type' in point.payload:
+                        post_type = str(point.payload['type'])
+                        post_type_counts[post_type] = post_type_counts.get(post_type, 0) + 1
+                
+                if not points or offset is None:
+                    break
+            self._known_post_types = sorted(post_type_counts)
+        
+        self._stats_cache.set(total_docs, dict(post_type_counts))
+        return post_type_counts
+    
     def _apply_post_type_priority(self, results: List[Dict[str, Any]], priority: List[str]) -> List[Dict[str, Any]]:
         """
         Re-sort results by post type priority.
@@ -1222,6 +2011,13 @@ Return ONLY the queries, one per line, without numbering or bullet points.
         
         # Sort by: existing score (descending), then priority (ascending - lower number = higher priority)
         # This maintains score-based ranking but prioritizes certain post types within same scores
+        n = len(results)
+        if n >= NUMPY_SORT_MIN_ITEMS:
+            # Same (stable) order via lexsort on key arrays - the last key is the primary one
+            scores = np.fromiter((r.get('score', 0.0) for r in results), dtype=np.float64, count=n)
+            priorities = np.fromiter((get_priority(r) for r in results), dtype=np.int64, count=n)
+            return [results[i] for i in np.lexsort((priorities, -scores)).tolist()]
+        
         sorted_results = sorted(
             results,
             key=lambda x: (-x.get('score', 0.0), get_priority(x))
@@ -1239,7 +2035,10 @@ Return ONLY the queries, one per line, without numbering or bullet points.
         Returns:
             Intent type: 'person_name', 'service', 'howto', 'navigational', 'transactional', or 'general'
         """
-        analysis = analyze_query(query, llm_client=self.llm_client, use_ai=True)
+        analysis = self._intent_cache.get(query)
+        if analysis is None:
+            analysis = analyze_query(query, llm_client=self.llm_client, use_ai=True)
+            self._intent_cache.set(query, analysis)
         intent = analysis.get('intent', 'general')
         self._last_query_analysis = analysis
         logger.info(f"Detected intent via shared analyzer: '{intent}' for query '{query}'")
@@ -1249,6 +2048,9 @@ Return ONLY the queries, one per line, without numbering or bullet points.
         """
         Generate AI instructions based on detected query intent.
         
+        The static per-intent text comes first and the query last, so the
+        instructions share a cacheable prompt prefix across queries.
+        
         Args:
             query: Search query
             intent: Detected intent ('person_name', 'service', etc.)
@@ -1256,89 +2058,10 @@ Return ONLY the queries, one per line, without numbering or bullet points.
         Returns:
             AI instructions string
         """
-        if intent == 'person_name':
-            return f"""User is searching for a specific person: "{query}".
-
-PRIORITY:
-1. SCS Professionals profiles where the person's full name appears in the title
-2. Biographical content about this specific person
-3. Press releases, announcements, or news about this person
-
-RULES:
-- Only show results about THIS specific person
-- Boost exact name matches in titles
-- Do NOT include general articles unless they're specifically about this person
-- If no professional profile exists, show news/articles about them"""
-        
-        elif intent == 'executive_role':
-            return f"""User is asking about a specific executive role or position: "{query}".
-
-PRIORITY:
-1. SCS Professionals profiles where the person holds the specific role mentioned (CEO, President, etc.)
-2. Press releases or announcements naming the person in that role
-3. Professional profiles that mention the role in title or content
-
-RULES:
-- Prioritize profiles where the person is CURRENTLY in that role
-- Look for role keywords: CEO, President, Executive, Chief, Director, Leader
-- Boost results where role appears in title (e.g., "Doug Doerr, CEO")
-- For "Who is the CEO?", the person currently holding that title should rank #1
-- Recent announcements about role changes are highly relevant"""
-        
-        elif intent == 'service':
-            return f"""User is looking for services or solutions related to: "{query}".
-
-PRIORITY:
-1. Service description pages that match the query
-2. Solution offerings and capabilities
-3. Service-specific landing pages
-
-RULES:
-- Prioritize actionable, practical service information
-- Show what services are available
-- Include capabilities and expertise areas
-- Avoid general informational content unless highly relevant"""
-        
-        elif intent == 'howto':
-            return f"""User needs actionable guidance on: "{query}".
-
-PRIORITY:
-1. Step-by-step guides and tutorials
-2. Instructional content with actionable steps
-3. "How to" articles with practical advice
-
-RULES:
-- Prioritize content with numbered steps or clear instructions
-- Look for practical, actionable advice
-- Skip theoretical content unless no practical guides exist
-- Focus on "how to do X" rather than "what is X" """
-        
-        elif intent == 'navigational':
-            return f"""User is looking for a specific page: "{query}".
-
-PRIORITY:
-1. Exact match for the page they're looking for
-2. Related pages that might serve the same purpose
-
-RULES:
-- Match the navigation intent exactly
-- Trust AI ranking (don't override with post type priority)
-- Exact title matches should be #1"""
-        
-        elif intent == 'transactional':
-            return f"""User wants to perform an action related to: "{query}".
-
-PRIORITY:
-1. Pages where they can complete the action
-2. Service request pages
-3. Download/application pages
-
-RULES:
-- Show pages where user can DO something (not just read about it)
-- Prioritize actionable pages"""
-        
-        else:
+        template = _INTENT_INSTRUCTIONS.get(intent)
+        if template is None:
             return ""  # General intent - use default behavior
+        return f'{template}\n\nQuery: "{query}"'
     
     def _tfidf_search(
         self,
@@ -1363,55 +2086,52 @@ RULES:
                 query_context = getattr(self, "_last_query_analysis", None)
             if behavioral_maps is None:
                 behavioral_maps = {}
-            # Transform query using fitted TF-IDF
-            query_vector = self.tfidf_vectorizer.transform([query])
+            self._ensure_document_boosts()
+            query_tokens = _prepare_query_tokens(query)
             
-            # Calculate cosine similarity with all documents
-            similarities = []
-            for i, doc_vector in enumerate(self.tfidf_matrix):
-                # Calculate cosine similarity
-                similarity = (query_vector * doc_vector.T).toarray()[0][0]
-                similarities.append((i, similarity))
+            scores = self._tfidf_scores(query)
             
-            # Sort by similarity and get top results
-            similarities.sort(key=lambda x: x[1], reverse=True)
+            # Select the top offset+limit documents in O(n), then sort only those.
+            # Documents with zero similarity are never returned, so they are left
+            # out of the selection and the boost loop below never visits them.
+            matching = int(np.count_nonzero(scores > 0))
+            order = _top_k_indices(scores, min(offset + limit, matching))
             
             # Debug logging
-            if similarities:
-                logger.info(f"TF-IDF top 5 scores: {[f'{s[1]:.4f}' for s in similarities[:5]]}")
+            if order.size:
+                logger.info(f"TF-IDF top 5 scores: {[f'{s:.4f}' for s in scores[order[:5]]]}")
             else:
                 logger.warning("TF-IDF returned no similarities")
             
             # Apply offset and limit to get the correct slice
-            start_idx = offset
-            end_idx = offset + limit
-            paginated_similarities = similarities[start_idx:end_idx]
+            paginated_indices = order[offset:offset + limit]
             
             results = []
-            for i, (doc_idx, score) in enumerate(paginated_similarities):
+            for i, doc_idx in enumerate(paginated_indices.tolist()):
+                score = float(scores[doc_idx])
                 if score > 0:  # Only include results with positive similarity
                     logger.debug(f"Including result {i+1}: doc_idx={doc_idx}, score={score:.4f}")
                     doc = self.documents[doc_idx]
                     
                     # Apply multiple boosting factors
                     # 1. Field-based boosting (improved phrase matching)
-                    field_boost = self._calculate_field_score(query, doc, query_context)
+                    field_boost = self._calculate_field_score(query, doc, query_context, doc_idx, query_tokens)
                     score *= field_boost
                     
                     # 2. Freshness/recency boosting
-                    freshness_boost = self._calculate_freshness_boost(doc.get('date', ''))
+                    freshness_boost = self._freshness_boosts[doc_idx]
                     score *= freshness_boost
                     
                     # 3. Category/tag matching boost
-                    category_tag_boost = self._calculate_category_tag_boost(query, doc)
+                    category_tag_boost = self._calculate_category_tag_boost(query, doc, doc_idx, query_tokens)
                     score *= category_tag_boost
                     
                     # 4. Heading/anchor boost
-                    heading_anchor_boost = self._calculate_heading_anchor_boost(query, doc)
+                    heading_anchor_boost = self._calculate_heading_anchor_boost(query, doc, query_tokens)
                     score *= heading_anchor_boost
                     
                     # 5. Taxonomy depth boost
-                    taxonomy_depth_boost = self._calculate_taxonomy_depth_boost(doc)
+                    taxonomy_depth_boost = self._taxonomy_depth_boosts[doc_idx]
                     score *= taxonomy_depth_boost
 
                     # 6. Behavioral (CTR) boost
@@ -1429,36 +2149,23 @@ RULES:
                         score,
                     )
                     
-                    result = {
-                        'id': doc['id'],
-                        'title': doc['title'],
-                        'url': doc['url'],
-                        'excerpt': doc['excerpt'],
-                        'type': doc.get('type', 'post'),  # Include post type!
-                        'date': doc.get('date', ''),
-                        'author': doc.get('author', ''),
-                        'categories': doc.get('categories', []),
-                        'tags': doc.get('tags', []),
-                        'content': doc.get('content', ''),
-                        'word_count': doc.get('word_count', 0),
-                        'featured_image': doc.get('featured_image', ''),
-                        'featured_media': doc.get('featured_media', 0),
-                        'score': float(score),
-                        'relevance': 'high' if score > 0.1 else 'medium' if score > 0.05 else 'low'
-                    }
+                    result = dict(self._result_templates[doc_idx])
+                    result['score'] = float(score)
+                    result['relevance'] = 'high' if score > 0.1 else 'medium' if score > 0.05 else 'low'
                     
                     if isinstance(doc.get('meta'), dict):
                         result_meta = dict(doc['meta'])
                     else:
                         result_meta = {}
-                    result_meta['boost_debug'] = {
-                        'field': round(field_boost, 3),
-                        'freshness': round(freshness_boost, 3),
-                        'category_tag': round(category_tag_boost, 3),
-                        'heading_anchor': round(heading_anchor_boost, 3),
-                        'taxonomy_depth': round(taxonomy_depth_boost, 3),
-                        'behavioral': round(behavioral_boost, 3),
-                    }
+                    if settings.expose_boost_debug:
+                        result_meta['boost_debug'] = {
+                            'field': round(field_boost, 3),
+                            'freshness': round(freshness_boost, 3),
+                            'category_tag': round(category_tag_boost, 3),
+                            'heading_anchor': round(heading_anchor_boost, 3),
+                            'taxonomy_depth': round(taxonomy_depth_boost, 3),
+                            'behavioral': round(behavioral_boost, 3),
+                        }
                     result['meta'] = result_meta
                     results.append(result)
             
@@ -1469,7 +2176,46 @@ RULES:
             logger.error(f"Error in TF-IDF search: {e}")
             return []
     
-    async def _generate_openai_embedding(self, text: str) -> List[float]:
+    def _tfidf_scores(self, query: str) -> np.ndarray:
+        """TF-IDF cosine similarity of query with every document (cached per corpus version)."""
+        cache_key = (query, self._corpus_version)
+        scores = self._tfidf_score_cache.get(cache_key)
+        if scores is not None:
+            self._tfidf_score_cache.move_to_end(cache_key)
+            return scores
+        
+        # Transform query using fitted TF-IDF, then score all documents in one
+        # sparse matmul (rows are L2-normalized, so the dot product is the cosine)
+        query_vector = self._tfidf_query_vector(query)
+        scores = np.asarray((self.tfidf_matrix @ query_vector.T).todense()).ravel()
+        scores.setflags(write=False)
+        
+        if len(self._tfidf_score_cache) >= TFIDF_SCORE_CACHE_SIZE:
+            self._tfidf_score_cache.popitem(last=False)
+        self._tfidf_score_cache[cache_key] = scores
+        return scores
+    
+    def _tfidf_query_vector(self, query: str) -> Any:
+        """
+        Fitted TF-IDF transform of query (1 x vocabulary CSR), cached per corpus version.
+        
+        The vectorizer lowercases and tokenizes on word characters, so the
+        stripped, lowercased query is an exact cache key.
+        """
+        cache_key = (query.strip().lower(), self._corpus_version)
+        query_vector = self._tfidf_query_vector_cache.get(cache_key)
+        if query_vector is not None:
+            self._tfidf_query_vector_cache.move_to_end(cache_key)
+            return query_vector
+        
+        query_vector = self.tfidf_vectorizer.transform([query])
+        
+        if len(self._tfidf_query_vector_cache) >= TFIDF_QUERY_VECTOR_CACHE_SIZE:
+            self._tfidf_query_vector_cache.popitem(last=False)
+        self._tfidf_query_vector_cache[cache_key] = query_vector
+        return query_vector
+    
+    async def _generate_openai_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding using available embedding service.
         Tries local model first (FREE), falls back to OpenAI if configured.
@@ -1478,7 +2224,7 @@ RULES:
             text: Text to embed
             
         Returns:
-            Embedding vector (384 dimensions)
+            float32 embedding vector (384 dimensions)
         """
         # Try local sentence-transformers first (FREE and FAST!)
         if SENTENCE_TRANSFORMERS_AVAILABLE:
@@ -1490,31 +2236,22 @@ RULES:
         # Fall back to OpenAI if configured
         if settings.openai_api_key and settings.openai_api_key != "your_openai_api_key_here":
             try:
-                from openai import AsyncOpenAI
-                
-                client = AsyncOpenAI(api_key=settings.openai_api_key)
+                client = _openai_client()
                 
                 # Truncate text if too long
                 max_length = 8000
                 if len(text) > max_length:
                     text = text[:max_length]
                 
+                model = settings.embed_model or "text-embedding-ada-002"
                 response = await client.embeddings.create(
-                    model=settings.embed_model or "text-embedding-ada-002",
-                    input=text
+                    model=model,
+                    input=text,
+                    **_openai_dimension_args(model)
                 )
                 
-                embedding = response.data[0].embedding
-                
                 # OpenAI returns 1536 dimensions, we need 384
-                if len(embedding) != EMBEDDING_DIMENSION:
-                    logger.debug(f"Adjusting embedding from {len(embedding)} to {EMBEDDING_DIMENSION} dimensions")
-                    if len(embedding) < EMBEDDING_DIMENSION:
-                        embedding = embedding + [0.0] * (EMBEDDING_DIMENSION - len(embedding))
-                    else:
-                        embedding = embedding[:EMBEDDING_DIMENSION]
-                
-                return embedding
+                return self._conform_dim(response.data[0].embedding)
                 
             except Exception as e:
                 logger.error(f"OpenAI embedding failed: {e}")
@@ -1523,7 +2260,7 @@ RULES:
         # No embedding service available
         raise Exception("No embedding service available. Install sentence-transformers or configure OpenAI API key.")
     
-    async def _generate_local_embedding(self, text: str) -> List[float]:
+    async def _generate_local_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding using local sentence-transformers model.
         FREE, fast, and private!
@@ -1532,7 +2269,7 @@ RULES:
             text: Text to embed
             
         Returns:
-            Embedding vector (384 dimensions)
+            float32 embedding vector (384 dimensions)
         """
         try:
             # Use lazy-loaded embedding model (single instance)
@@ -1546,26 +2283,71 @@ RULES:
             if len(text) > max_length:
                 text = text[:max_length]
             
-            # Generate embedding (runs on CPU/GPU locally)
-            embedding = embedding_model.encode(text, convert_to_numpy=True)
-            
-            # Convert to list and ensure correct dimension
-            embedding = embedding.tolist()
+            # Generate embedding (runs on CPU/GPU locally, batched with concurrent requests)
+            embedding = await self._encode_coalesced(text)
             
+            # Ensure correct dimension (kept as float32; lists are only built at the JSON boundary)
             if len(embedding) != EMBEDDING_DIMENSION:
                 logger.warning(f"Embedding dimension mismatch: got {len(embedding)}, expected {EMBEDDING_DIMENSION}")
-                if len(embedding) < EMBEDDING_DIMENSION:
-                    embedding = embedding + [0.0] * (EMBEDDING_DIMENSION - len(embedding))
-                else:
-                    embedding = embedding[:EMBEDDING_DIMENSION]
             
-            return embedding
+            return self._conform_dim(embedding)
             
         except Exception as e:
             logger.error(f"Error generating local embedding: {e}")
             raise
     
-    async def _generate_local_embedding_batch(self, texts: List[str]) -> List[List[float]]:
+    async def _encode_coalesced(self, text: str) -> np.ndarray:
+        """
+        Encode one text with the local model, sharing an encode call with other
+        texts submitted within EMBED_COALESCE_WINDOW_SEC.
+        
+        Returns:
+            Raw (unnormalized) float32 embedding from the model
+        """
+        loop = asyncio.get_running_loop()
+        worker = self._embed_worker_task
+        if worker is None or worker.done() or worker.get_loop() is not loop:
+            self._embed_queue = asyncio.Queue()
+            self._embed_worker_task = loop.create_task(self._embed_worker(self._embed_queue))
+        
+        future = loop.create_future()
+        self._embed_queue.put_nowait((text, future))
+        return await future
+    
+    async def _embed_worker(self, queue: asyncio.Queue) -> None:
+        """Drain the embed queue in batches of up to EMBED_COALESCE_MAX_BATCH texts."""
+        while True:
+            batch = [await queue.get()]
+            # Give concurrent requests a moment to join this batch
+            await asyncio.sleep(EMBED_COALESCE_WINDOW_SEC)
+            while len(batch) < EMBED_COALESCE_MAX_BATCH and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            # Skip requests whose callers have gone away
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+            try:
+                # Off the event loop - encode is CPU/GPU-bound (the next batch queues up meanwhile)
+                matrix = await asyncio.to_thread(
+                    self.embedding_model.encode,
+                    [text for text, _ in batch],
+                    batch_size=EMBED_COALESCE_MAX_BATCH,
+                    convert_to_numpy=True,
+                    show_progress_bar=False
+                )
+                matrix = np.asarray(matrix, dtype=np.float32)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), embedding in zip(batch, matrix):
+                if not future.done():
+                    future.set_result(embedding)
+    
+    async def _generate_local_embedding_batch(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for multiple texts in batch (MUCH faster!).
         
@@ -1573,40 +2355,37 @@ RULES:
             texts: List of texts to embed
             
         Returns:
-            List of embedding vectors (384 dimensions each)
+            float32 matrix of embeddings, one 384-dimension row per text
         """
         try:
             # Use lazy-loaded embedding model (single instance)
             embedding_model = self.embedding_model
             if embedding_model is None:
                 logger.warning("Embedding model not available, using hash-based fallback")
-                return [self._hash_based_embedding(text) for text in texts]
+                return np.array([self._hash_based_embedding(text) for text in texts], dtype=np.float32)
             
             # Truncate texts if too long
             max_length = 500
             truncated_texts = [text[:max_length] if len(text) > max_length else text for text in texts]
             
-            # Batch encode (sentence-transformers handles batching efficiently!)
-            embeddings = embedding_model.encode(truncated_texts, convert_to_numpy=True, batch_size=32, show_progress_bar=False)
-            
-            # Convert to list and ensure correct dimensions
-            results = []
-            for emb in embeddings:
-                emb_list = emb.tolist()
-                if len(emb_list) != EMBEDDING_DIMENSION:
-                    if len(emb_list) < EMBEDDING_DIMENSION:
-                        emb_list = emb_list + [0.0] * (EMBEDDING_DIMENSION - len(emb_list))
-                    else:
-                        emb_list = emb_list[:EMBEDDING_DIMENSION]
-                results.append(emb_list)
+            # Batch encode (sentence-transformers handles batching efficiently!),
+            # off the event loop so searches keep being served during indexing
+            embeddings = await asyncio.to_thread(
+                embedding_model.encode,
+                truncated_texts,
+                convert_to_numpy=True,
+                batch_size=32,
+                show_progress_bar=False
+            )
             
-            return results
+            # Fix the width of the whole matrix at once
+            return self._fit_embedding_width(np.asarray(embeddings, dtype=np.float32))
             
         except Exception as e:
             logger.error(f"Error generating local embedding batch: {e}")
             raise
     
-    async def _generate_openai_embedding_batch(self, texts: List[str]) -> List[List[float]]:
+    async def _generate_openai_embedding_batch(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for multiple texts using OpenAI (batch API).
         
@@ -1614,40 +2393,131 @@ RULES:
             texts: List of texts to embed
             
         Returns:
-            List of embedding vectors (1536 dimensions, converted to 384)
+            float32 matrix of embeddings (1536 dimensions, converted to 384)
         """
         try:
-            from openai import AsyncOpenAI
-            
-            client = AsyncOpenAI(api_key=settings.openai_api_key)
+            client = _openai_client()
             
             # Truncate texts if too long
             max_length = 8000
             truncated_texts = [text[:max_length] if len(text) > max_length else text for text in texts]
             
-            response = await client.embeddings.create(
-                model=settings.embed_model or "text-embedding-ada-002",
-                input=truncated_texts
+            # Read the raw body so the payload is parsed by orjson instead of the
+            # SDK's pydantic models. The raw body skips the SDK's decoding, so the
+            # (compact) base64 format is requested explicitly and decoded here
+            model = settings.embed_model or "text-embedding-ada-002"
+            raw_response = await client.embeddings.with_raw_response.create(
+                model=model,
+                input=truncated_texts,
+                encoding_format="base64",
+                extra_headers={"Accept-Encoding": "gzip"},
+                **_openai_dimension_args(model)
             )
+            body = json_loads(raw_response.content)
             
-            # Convert to list and ensure correct dimensions
-            results = []
-            for item in response.data:
-                embedding = item.embedding
-                # OpenAI returns 1536 dimensions, we need 384
-                if len(embedding) != EMBEDDING_DIMENSION:
-                    if len(embedding) < EMBEDDING_DIMENSION:
-                        embedding = embedding + [0.0] * (EMBEDDING_DIMENSION - len(embedding))
-                    else:
-                        embedding = embedding[:EMBEDDING_DIMENSION]
-                results.append(embedding)
-            
-            return results
+            # Build one contiguous float32 matrix, then fix the width in a single op
+            # (OpenAI returns 1536 dimensions, we need 384)
+            matrix = np.stack([_decode_embedding(item['embedding']) for item in body['data']])
+            return self._fit_embedding_width(matrix)
             
         except Exception as e:
             logger.error(f"Error generating OpenAI embedding batch: {e}")
             raise
     
+    def _build_search_index(self) -> None:
+        """
+        Lowercase document fields once and build the token inverted index
+        used by _simple_text_search.
+        """
+        self._titles_lower = [(doc.get('title') or '').lower() for doc in self.documents]
+        self._contents_lower = [(doc.get('content') or '').lower() for doc in self.documents]
+        self._excerpts_lower = [(doc.get('excerpt') or '').lower() for doc in self.documents]
+        self._meta_texts_lower = [self._meta_text_lower(doc) for doc in self.documents]
+        self._category_terms = [self._taxonomy_terms(doc.get('categories', [])) for doc in self.documents]
+        self._tag_terms = [self._taxonomy_terms(doc.get('tags', [])) for doc in self.documents]
+        
+        # defaultdict: setdefault(token, []) would build a throwaway list per token occurrence
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for idx, fields in enumerate(zip(self._titles_lower, self._contents_lower, self._excerpts_lower)):
+            for token in set(' '.join(fields).split()):
+                postings[token].append(idx)
+        
+        vocab = list(postings)
+        self._token_vocab = '\n'.join(vocab)
+        self._token_starts = []
+        start = 0
+        for token in vocab:
+            self._token_starts.append(start)
+            start += len(token) + 1
+        self._token_postings = [postings[token] for token in vocab]
+        
+        self._taxonomy_depth_boosts = [self._calculate_taxonomy_depth_boost(doc) for doc in self.documents]
+        self._refresh_freshness_boosts()
+        self._result_templates = [self._result_template(doc) for doc in self.documents]
+        
+        self._corpus_version += 1
+        self._tfidf_score_cache.clear()
+        self._tfidf_query_vector_cache.clear()
+    
+    @staticmethod
+    def _result_template(doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Document fields copied into every TF-IDF result for it (score, relevance and meta are added per query)."""
+        return {
+            'id': doc.get('id'),
+            'title': doc.get('title'),
+            'url': doc.get('url'),
+            'excerpt': doc.get('excerpt'),
+            'type': doc.get('type', 'post'),  # Include post type!
+            'date': doc.get('date', ''),
+            'author': doc.get('author', ''),
+            'categories': doc.get('categories', []),
+            'tags': doc.get('tags', []),
+            'content': doc.get('content', ''),
+            'word_count': doc.get('word_count', 0),
+            'featured_image': doc.get('featured_image', ''),
+            'featured_media': doc.get('featured_media', 0),
+        }
+    
+    def _refresh_freshness_boosts(self) -> None:
+        """Recompute the per-document freshness boosts (date parsing happens here, not per query)."""
+        now = datetime.now(timezone.utc)
+        self._freshness_boosts = [self._calculate_freshness_boost(doc.get('date', ''), now) for doc in self.documents]
+        self._freshness_boosts_at = time.monotonic()
+    
+    def _ensure_document_boosts(self) -> None:
+        """Make sure the per-document index and boosts match self.documents and are fresh."""
+        if len(self._titles_lower) != len(self.documents):
+            self._build_search_index()
+        elif time.monotonic() - self._freshness_boosts_at > DOCUMENT_BOOST_REFRESH_SEC:
+            self._refresh_freshness_boosts()
+    
+    def _candidate_documents(self, needles: List[str]) -> List[int]:
+        """
+        Indices (ascending) of documents with a field containing any of the needles.
+        
+        Needles must not contain whitespace: such a needle can only occur inside a
+        single whitespace-delimited token, so the matching tokens are found with
+        substring search over the vocabulary instead of over every document.
+        """
+        vocab = self._token_vocab
+        token_starts = self._token_starts
+        matched_tokens = set()
+        for needle in needles:
+            pos = vocab.find(needle)
+            while pos != -1:
+                token_idx = bisect.bisect_right(token_starts, pos) - 1
+                matched_tokens.add(token_idx)
+                # Continue after this token - one hit per token is enough
+                next_token = token_idx + 1
+                if next_token >= len(token_starts):
+                    break
+                pos = vocab.find(needle, token_starts[next_token])
+        
+        doc_indices = set()
+        for token_idx in matched_tokens:
+            doc_indices.update(self._token_postings[token_idx])
+        return sorted(doc_indices)
+    
     def _simple_text_search(
         self,
         query: str,
@@ -1666,39 +2536,46 @@ RULES:
             if not query_lower:
                 return []
 
-            query_words = [word for word in query_lower.split() if len(word) >= 3]
+            # Words long enough for partial matching (handles "James Wals" → "James Walsh")
+            query_pieces = query_lower.split()
+            partial_words = [word for word in query_pieces if len(word) >= 4]
             results = []
             
-            for doc in self.documents:
-                doc_title_lower = doc.get('title', '').lower()
-                doc_content_lower = doc.get('content', '').lower()
-                doc_excerpt_lower = doc.get('excerpt', '').lower()
-                
-                # Exact match (highest priority)
-                exact_title_match = query_lower in doc_title_lower
-                exact_content_match = query_lower in doc_content_lower
-                exact_excerpt_match = query_lower in doc_excerpt_lower
-                
-                # Partial word match (handles "James Wals" → "James Walsh")
-                partial_title_match = any(word in doc_title_lower for word in query_words if len(word) >= 4)
-                partial_content_match = any(word in doc_content_lower for word in query_words if len(word) >= 4)
-                partial_excerpt_match = any(word in doc_excerpt_lower for word in query_words if len(word) >= 4)
+            self._ensure_document_boosts()
+            query_tokens = _prepare_query_tokens(query)
+            
+            # Only documents containing a partial word, or the longest query word
+            # (which any exact phrase match must contain), can score above zero
+            needles = set(partial_words)
+            needles.add(max(query_pieces, key=len))
+            
+            # Partial matches only count where the exact phrase is missing, so a
+            # partial word equal to the whole query can never add anything
+            partial_words = [word for word in partial_words if word != query_lower]
+            
+            for idx in self._candidate_documents(list(needles)):
+                doc = self.documents[idx]
+                doc_title_lower = self._titles_lower[idx]
+                doc_content_lower = self._contents_lower[idx]
+                doc_excerpt_lower = self._excerpts_lower[idx]
                 
-                # Calculate simple score
+                # Calculate simple score: exact match (highest priority), else partial
+                # word match (substring, so prefixes of longer words count). Partial
+                # scans only run when the exact check failed.
                 score = 0.0
-                if exact_title_match:
+                if query_lower in doc_title_lower:
                     score += 5.0
-                elif partial_title_match:
+                elif any(word in doc_title_lower for word in partial_words):
                     score += 2.0
                     
-                if exact_excerpt_match:
+                if query_lower in doc_excerpt_lower:
                     score += 3.0
-                elif partial_excerpt_match:
+                elif any(word in doc_excerpt_lower for word in partial_words):
                     score += 1.0
                     
-                if exact_content_match:
+                if query_lower in doc_content_lower:
                     score += 2.0
-                elif partial_content_match:
+                elif any(word in doc_content_lower for word in partial_words):
                     score += 0.5
                 
                 if score > 0:
@@ -1706,9 +2583,9 @@ RULES:
                     normalized_score = score / 10.0
                     
                     # Apply boosting factors
-                    field_boost = self._calculate_field_score(query, doc, query_context)
-                    freshness_boost = self._calculate_freshness_boost(doc.get('date', ''))
-                    category_tag_boost = self._calculate_category_tag_boost(query, doc)
+                    field_boost = self._calculate_field_score(query, doc, query_context, idx, query_tokens)
+                    freshness_boost = self._freshness_boosts[idx]
+                    category_tag_boost = self._calculate_category_tag_boost(query, doc, idx, query_tokens)
                     behavioral_boost = self._calculate_behavioral_boost(doc, behavioral_maps)
                     
                     final_score = (
@@ -1732,30 +2609,33 @@ RULES:
                         'score': float(final_score),
                         'relevance': 'high' if final_score >= 0.5 else 'medium' if final_score >= 0.2 else 'low'
                     }
-                    result['meta'] = {
-                        'boost_debug': {
-                            'field': round(field_boost, 3),
-                            'freshness': round(freshness_boost, 3),
-                            'category_tag': round(category_tag_boost, 3),
-                            'behavioral': round(behavioral_boost, 3),
+                    if settings.expose_boost_debug:
+                        result['meta'] = {
+                            'boost_debug': {
+                                'field': round(field_boost, 3),
+                                'freshness': round(freshness_boost, 3),
+                                'category_tag': round(category_tag_boost, 3),
+                                'behavioral': round(behavioral_boost, 3),
+                            }
                         }
-                    }
                     results.append(result)
             
-            # Sort by score and limit results
-            results.sort(key=lambda x: x['score'], reverse=True)
-            return results[:limit]
+            # Select the top results without sorting every match
+            scores = np.fromiter((r['score'] for r in results), dtype=np.float64, count=len(results))
+            return [results[i] for i in _top_k_indices(scores, limit).tolist()]
             
         except Exception as e:
             logger.error(f"Error in simple text search: {e}")
             return []
 
-    def _calculate_freshness_boost(self, doc_date: str) -> float:
+    def _calculate_freshness_boost(self, doc_date: str, now: Optional[datetime] = None) -> float:
         """
         Boost recent content (decay over time).
         
         Args:
             doc_date: Document date string (ISO format)
+            now: Timezone-aware reference time; pass one value for a whole batch
+                of documents to avoid reading the clock per document
             
         Returns:
             Boost multiplier (1.0 = no boost, >1.0 = boosted)
@@ -1764,38 +2644,27 @@ RULES:
             return 1.0
         
         try:
-            from datetime import datetime, timezone
-            
-            # Parse date (handle various formats)
+            # fromisoformat covers 'YYYY-MM-DD', 'YYYY-MM-DD HH:MM:SS' and full ISO timestamps
             try:
+                doc_datetime = datetime.fromisoformat(doc_date.replace('Z', '+00:00'))
+            except ValueError:
+                logger.warning(f"Could not parse date: {doc_date}, using no boost")
+                return 1.0
+            
+            if doc_datetime.tzinfo is None:
+                # Bare dates are UTC; naive ISO timestamps (WordPress 'date') are server local time
                 if 'T' in doc_date:
-                    doc_datetime = datetime.fromisoformat(doc_date.replace('Z', '+00:00'))
+                    doc_datetime = doc_datetime.astimezone()
                 else:
-                    doc_datetime = datetime.strptime(doc_date, '%Y-%m-%d')
-                    doc_datetime = doc_datetime.replace(tzinfo=timezone.utc)
-            except ValueError:
-                # Try other formats
-                try:
-                    doc_datetime = datetime.strptime(doc_date, '%Y-%m-%d %H:%M:%S')
                     doc_datetime = doc_datetime.replace(tzinfo=timezone.utc)
-                except ValueError:
-                    logger.warning(f"Could not parse date: {doc_date}, using no boost")
-                    return 1.0
             
             # Calculate days old
-            now = datetime.now(doc_datetime.tzinfo)
+            if now is None:
+                now = datetime.now(timezone.utc)
             days_old = (now - doc_datetime).days
             
             # Boost: 2.0x for <7 days, 1.8x for <30 days, 1.5x for <90 days, 1.2x for <180 days, 1.0x for older
-            if days_old < 7:
-                return 2.0  # Very recent content gets strong boost
-            elif days_old < 30:
-                return 1.8  # Recent content gets strong boost
-            elif days_old < 90:
-                return 1.5  # Moderately recent content gets moderate boost
-            elif days_old < 180:
-                return 1.2  # Somewhat recent content gets slight boost
-            return 1.0
+            return FRESHNESS_BOOSTS[bisect.bisect_right(FRESHNESS_AGE_DAYS, days_old)]
             
         except Exception as e:
             logger.warning(f"Error calculating freshness boost: {e}")
@@ -1806,6 +2675,8 @@ RULES:
         query: str,
         doc: Dict[str, Any],
         query_context: Optional[Dict[str, Any]] = None,
+        doc_idx: Optional[int] = None,
+        query_tokens: Optional[Tuple[str, FrozenSet[str]]] = None,
     ) -> float:
         """
         Calculate field-based relevance score with improved phrase matching.
@@ -1814,6 +2685,10 @@ RULES:
             query: Search query
             doc: Document dictionary
             query_context: Optional heuristic analysis (intent/entities)
+            doc_idx: Index of doc in self.documents, to reuse its precomputed
+                lowercased fields (omit for documents outside the corpus)
+            query_tokens: _prepare_query_tokens(query), computed once per query
+                by callers scoring many documents
             
         Returns:
             Boost multiplier
@@ -1821,13 +2696,18 @@ RULES:
         if query_context is None:
             query_context = getattr(self, "_last_query_analysis", None)
 
-        query_lower = query.lower().strip()
-        query_words = [word for word in query_lower.split() if len(word) >= 3]
-        query_word_set = set(query_words)
+        query_lower, query_words = query_tokens or _prepare_query_tokens(query)
         
-        title_lower = doc.get('title', '').lower()
-        excerpt_lower = (doc.get('excerpt', '') or '').lower()
-        content_lower = doc.get('content', '').lower()
+        if doc_idx is not None:
+            title_lower = self._titles_lower[doc_idx]
+            excerpt_lower = self._excerpts_lower[doc_idx]
+            content_lower = self._contents_lower[doc_idx]
+            meta_text = self._meta_texts_lower[doc_idx]
+        else:
+            title_lower = doc.get('title', '').lower()
+            excerpt_lower = (doc.get('excerpt', '') or '').lower()
+            content_lower = doc.get('content', '').lower()
+            meta_text = self._meta_text_lower(doc)
         doc_type = (doc.get('type') or '').lower()
         
         boost = 0.0
@@ -1836,7 +2716,7 @@ RULES:
         if query_lower in title_lower:
             boost += 2.0  # Base 1.0 + 2.0 = 3.0 (previous behaviour)
         # All words in title (phrase match)
-        elif query_word_set and query_word_set.issubset(set(title_lower.split())):
+        elif query_words and query_words.issubset(set(title_lower.split())):
             boost += 1.2
         # Some words in title
         elif any(word in title_lower for word in query_words):
@@ -1849,38 +2729,10 @@ RULES:
             boost += 0.3
         
         # Content matches (lowest priority)
-        if query_word_set and any(word in content_lower for word in query_words):
+        if query_words and any(word in content_lower for word in query_words):
             boost += 0.15
 
         # Meta keywords / custom fields
-        meta = doc.get('meta', {}) if isinstance(doc.get('meta'), dict) else {}
-        meta_text_parts: List[str] = []
-        if meta:
-            for key in (
-                'focus_keyword',
-                'focus_keywords',
-                'keywords',
-                'yoast_focus_keyword',
-                'yoast_focus_keywords',
-                'topics',
-                'key_topics',
-                'summary',
-                'meta_keywords',
-            ):
-                value = meta.get(key)
-                if not value:
-                    continue
-                if isinstance(value, str):
-                    meta_text_parts.append(value.lower())
-                elif isinstance(value, (list, tuple, set)):
-                    meta_text_parts.extend(str(item).lower() for item in value if item)
-        if isinstance(doc.get('custom_fields'), dict):
-            for val in doc['custom_fields'].values():
-                if isinstance(val, str):
-                    meta_text_parts.append(val.lower())
-                elif isinstance(val, (list, tuple, set)):
-                    meta_text_parts.extend(str(item).lower() for item in val if item)
-        meta_text = " ".join(meta_text_parts)
         if meta_text:
             if query_lower and query_lower in meta_text:
                 boost += 0.6
@@ -1897,17 +2749,26 @@ RULES:
                 for service in entities.get('services', [])
                 if isinstance(service, str)
             ]
+            location_entities = [
+                str(loc).lower()
+                for loc in entities.get('locations', [])
+                if isinstance(loc, str)
+            ]
+            # One joined blob per document so each entity costs a single substring
+            # scan; fields are NUL-separated so no match can span two of them.
+            # Locations are matched without the content prefix.
+            location_blob = service_blob = ''
+            if service_entities or location_entities:
+                location_blob = f"{title_lower}\0{excerpt_lower}\0{meta_text}"
+                if service_entities:
+                    service_blob = f"{location_blob}\0{content_lower[:2000]}"
+            
             for service in service_entities:
                 if not service:
                     continue
                 if service in query_lower:
                     continue  # already covered above
-                if (
-                    service in title_lower
-                    or service in excerpt_lower
-                    or (meta_text and service in meta_text)
-                    or service in content_lower[:2000]
-                ):
+                if service in service_blob:
                     boost += 0.75
                     break
 
@@ -1928,19 +2789,10 @@ RULES:
                 if doc_type in {'scs-professionals', 'staff', 'team'}:
                     boost += 0.4
 
-            location_entities = [
-                str(loc).lower()
-                for loc in entities.get('locations', [])
-                if isinstance(loc, str)
-            ]
             for location in location_entities:
                 if not location or location in query_lower:
                     continue
-                if (
-                    location in title_lower
-                    or location in excerpt_lower
-                    or (meta_text and location in meta_text)
-                ):
+                if location in location_blob:
                     boost += 0.3
                     break
 
@@ -1961,92 +2813,149 @@ RULES:
         # Return boost multiplier (minimum 1.0)
         return max(score, 1.0)
     
-    def _calculate_category_tag_boost(self, query: str, doc: Dict[str, Any]) -> float:
+    @staticmethod
+    def _meta_text_lower(doc: Dict[str, Any]) -> str:
+        """Flatten a document's SEO meta keywords and custom fields into one lowercased string."""
+        meta = doc.get('meta', {}) if isinstance(doc.get('meta'), dict) else {}
+        meta_text_parts: List[str] = []
+        if meta:
+            for key in (
+                'focus_keyword',
+                'focus_keywords',
+                'keywords',
+                'yoast_focus_keyword',
+                'yoast_focus_keywords',
+                'topics',
+                'key_topics',
+                'summary',
+                'meta_keywords',
+            ):
+                value = meta.get(key)
+                if not value:
+                    continue
+                if isinstance(value, str):
+                    meta_text_parts.append(value.lower())
+                elif isinstance(value, (list, tuple, set)):
+                    meta_text_parts.extend(str(item).lower() for item in value if item)
+        if isinstance(doc.get('custom_fields'), dict):
+            for val in doc['custom_fields'].values():
+                if isinstance(val, str):
+                    meta_text_parts.append(val.lower())
+                elif isinstance(val, (list, tuple, set)):
+                    meta_text_parts.extend(str(item).lower() for item in val if item)
+        return " ".join(meta_text_parts)
+    
+    def _calculate_category_tag_boost(
+        self,
+        query: str,
+        doc: Dict[str, Any],
+        doc_idx: Optional[int] = None,
+        query_tokens: Optional[Tuple[str, FrozenSet[str]]] = None,
+    ) -> float:
         """
         Boost if query matches categories or tags.
         
         Args:
             query: Search query
             doc: Document dictionary
+            doc_idx: Index of doc in self.documents, to reuse its precomputed
+                category/tag terms (omit for documents outside the corpus)
+            query_tokens: _prepare_query_tokens(query), computed once per query
             
         Returns:
             Boost multiplier (capped at 1.5x)
         """
-        query_lower = query.lower().strip()
-        query_words = set(query_lower.split())
+        query_lower, query_words = query_tokens or _prepare_query_tokens(query)
+        
+        if doc_idx is not None:
+            category_terms = self._category_terms[doc_idx]
+            tag_terms = self._tag_terms[doc_idx]
+        else:
+            category_terms = self._taxonomy_terms(doc.get('categories', []))
+            tag_terms = self._taxonomy_terms(doc.get('tags', []))
         
         boost = 1.0
         
         # Check categories
-        categories = doc.get('categories', [])
-        for cat in categories:
-            if isinstance(cat, dict):
-                cat_slug = cat.get('slug', '').lower()
-                cat_name = cat.get('name', '').lower()
-            else:
-                cat_slug = str(cat).lower()
-                cat_name = cat_slug
-            
+        for cat_slug, cat_name in category_terms:
             if query_lower in cat_slug or query_lower in cat_name:
                 boost += 0.3
-            elif any(word in cat_slug or word in cat_name for word in query_words if len(word) >= 3):
+            elif any(word in cat_slug or word in cat_name for word in query_words):
                 boost += 0.15
         
         # Check tags
-        tags = doc.get('tags', [])
-        for tag in tags:
-            if isinstance(tag, dict):
-                tag_slug = tag.get('slug', '').lower()
-                tag_name = tag.get('name', '').lower()
-            else:
-                tag_slug = str(tag).lower()
-                tag_name = tag_slug
-            
+        for tag_slug, tag_name in tag_terms:
             if query_lower in tag_slug or query_lower in tag_name:
                 boost += 0.2
-            elif any(word in tag_slug or word in tag_name for word in query_words if len(word) >= 3):
+            elif any(word in tag_slug or word in tag_name for word in query_words):
                 boost += 0.1
         
         return min(boost, 1.5)  # Cap at 1.5x
     
-    def _create_normalized_score_map(self, results: List[Dict[str, Any]]) -> Dict[str, float]:
-        """
-        Normalize scores (0-1) for a list of results.
+    @staticmethod
+    def _taxonomy_terms(items: List[Any]) -> List[Tuple[str, str]]:
+        """Lowercased (slug, name) pairs for a document's categories or tags."""
+        terms = []
+        for item in items or []:
+            if isinstance(item, dict):
+                terms.append(((item.get('slug') or '').lower(), (item.get('name') or '').lower()))
+            else:
+                slug = str(item).lower()
+                terms.append((slug, slug))
+        return terms
+    
+    @staticmethod
+    def _rank_and_normalize(
+        results: List[Dict[str, Any]],
+    ) -> List[Tuple[Tuple[int, str, Dict[str, Any]], float]]:
         """
-        if not results:
-            return {}
+        Pair each result that has an id with its 1-based rank and its score
+        normalized to 0-1 across the list.
         
+        Returns:
+            ((rank, doc_id, result), normalized_score) tuples in list order
+        """
+        ranked = []
         scores = []
-        ids = []
-        for result in results:
+        for rank, result in enumerate(results, 1):
             doc_id = str(result.get('id', ''))
             if not doc_id:
                 continue
-            ids.append(doc_id)
+            ranked.append((rank, doc_id, result))
             scores.append(max(float(result.get('score', 0.0)), 0.0))
         
         if not scores:
-            return {}
+            return []
         
         max_score = max(scores)
         min_score = min(scores)
         if max_score == min_score:
-            return {doc_id: 1.0 for doc_id in ids}
+            normalized = [1.0] * len(scores)
+        elif len(scores) >= NUMPY_NORMALIZE_MIN_ITEMS:
+            # Fresh array, so both steps can run in place without temporaries
+            values = np.asarray(scores, dtype=np.float64)
+            np.subtract(values, min_score, out=values)
+            np.divide(values, max_score - min_score, out=values)
+            normalized = values.tolist()
+        else:
+            score_range = max_score - min_score
+            normalized = [(score - min_score) / score_range for score in scores]
         
-        return {
-            doc_id: (score - min_score) / (max_score - min_score)
-            for doc_id, score in zip(ids, scores)
-        }
+        return list(zip(ranked, normalized))
     
-    def _calculate_heading_anchor_boost(self, query: str, doc: Dict[str, Any]) -> float:
+    def _calculate_heading_anchor_boost(
+        self,
+        query: str,
+        doc: Dict[str, Any],
+        query_tokens: Optional[Tuple[str, FrozenSet[str]]] = None,
+    ) -> float:
         """
         Boost documents where the query appears in headings or anchor text.
         """
-        query_lower = query.lower().strip()
+        query_lower, query_words = query_tokens or _prepare_query_tokens(query)
         if not query_lower:
             return 1.0
         
-        query_words = [word for word in query_lower.split() if len(word) >= 3]
         boost = 1.0
         
         meta = doc.get('meta', {})
@@ -2057,17 +2966,13 @@ RULES:
                 headings.extend(str(h) for h in headings_meta)
         
         content = doc.get('content', '') or ''
-        if content and not headings:
-            raw_headings = re.findall(r'<h[1-3][^>]*>(.*?)</h[1-3]>', content, flags=re.IGNORECASE | re.DOTALL)
+        # Cheap substring checks keep plain-text content away from the regex scans
+        # (both cases, since the patterns are case-insensitive)
+        if content and not headings and ('<h' in content or '<H' in content):
+            raw_headings = _HEADING_RE.findall(content)
             headings.extend(raw_headings)
         
-        def clean_text(text: str) -> str:
-            # Remove HTML tags and collapse whitespace
-            cleaned = re.sub(r'<[^>]+>', ' ', text)
-            cleaned = re.sub(r'\s+', ' ', cleaned)
-            return cleaned.strip().lower()
-        
-        headings = [clean_text(h) for h in headings if isinstance(h, str) and h.strip()]
+        headings = [_strip_and_collapse(h) for h in headings if isinstance(h, str) and h.strip()]
         
         for heading in headings:
             if not heading:
@@ -2080,9 +2985,9 @@ RULES:
                 break
         
         # Anchor text
-        anchors = re.findall(r'<a[^>]*>(.*?)</a>', content, flags=re.IGNORECASE | re.DOTALL) if content else []
+        anchors = _ANCHOR_RE.findall(content) if content and ('<a' in content or '<A' in content) else []
         for anchor in anchors:
-            anchor_text = clean_text(anchor)
+            anchor_text = _strip_and_collapse(anchor)
             if not anchor_text:
                 continue
             if query_lower in anchor_text:
@@ -2114,9 +3019,15 @@ RULES:
                 if parent_id:
                     depth_score += 0.1
                 if isinstance(slug, str):
-                    # Count nesting indicators (e.g., waste/services/hazardous)
-                    depth_score += 0.05 * slug.count('/')
-                    depth_score += 0.05 * slug.count('>')
+                    # Count nesting indicators (e.g., waste/services/hazardous);
+                    # flat slugs, the common case, skip both counts
+                    if '/' in slug:
+                        depth_score += 0.05 * slug.count('/')
+                    if '>' in slug:
+                        depth_score += 0.05 * slug.count('>')
+                if depth_score >= 0.4:
+                    # Already at the 1.4x cap, the remaining terms cannot change it
+                    return 1.4
         
         return min(1.0 + depth_score, 1.4)
 
@@ -2140,7 +3051,7 @@ RULES:
                 if not url or weight is None:
                     continue
                 try:
-                    normalized_url = self._normalize_url(url)
+                    normalized_url = _normalize_url(url)
                     ctr_weight = float(weight)
                 except (ValueError, TypeError):
                     continue
@@ -2151,18 +3062,6 @@ RULES:
 
         return maps
 
-    def _normalize_url(self, url: str) -> str:
-        if not url:
-            return ""
-        try:
-            parsed = urlsplit(url)
-            scheme = parsed.scheme.lower()
-            netloc = parsed.netloc.lower()
-            path = parsed.path.rstrip('/') or '/'
-            return urlunsplit((scheme, netloc, path, '', ''))
-        except Exception:
-            return url.strip().lower().rstrip('/')
-
     def _calculate_behavioral_boost(
         self,
         doc: Dict[str, Any],
@@ -2174,7 +3073,7 @@ RULES:
 
         url = doc.get('url')
         if url:
-            norm_url = self._normalize_url(url)
+            norm_url = _normalize_url(url)
         else:
             norm_url = ""
 
@@ -2185,7 +3084,13 @@ RULES:
 
         return boost
     
-    def _reciprocal_rank_fusion(self, results1: List[Dict[str, Any]], results2: List[Dict[str, Any]], k: int = 60) -> List[Dict[str, Any]]:
+    def _reciprocal_rank_fusion(
+        self,
+        results1: List[Dict[str, Any]],
+        results2: List[Dict[str, Any]],
+        k: int = RRF_DEFAULT_K,
+        sort_results: bool = True,
+    ) -> List[Dict[str, Any]]:
         """
         Combine two result lists using Reciprocal Rank Fusion (RRF).
         
@@ -2193,42 +3098,45 @@ RULES:
             results1: First result list (e.g., TF-IDF results)
             results2: Second result list (e.g., Vector results)
             k: RRF constant (default 60)
+            sort_results: Sort by RRF score. Callers that select a top-k with
+                heapq.nlargest afterwards can skip the full sort (same order, ties included).
             
         Returns:
-            Combined and reranked results
+            Combined and reranked results. The input result dicts are merged in
+            place (not copied), so callers must not reuse results1/results2.
         """
         scores = {}
-        lexical_norm_map = self._create_normalized_score_map(results1)
-        vector_norm_map = self._create_normalized_score_map(results2)
-        
-        # Score results from first list
-        for rank, result in enumerate(results1, 1):
-            doc_id = str(result.get('id', ''))
-            if not doc_id:
-                continue
-            entry = scores.setdefault(doc_id, {'doc': result.copy(), 'rrf_score': 0.0})
-            entry['rrf_score'] += 1.0 / (k + rank)
+        reciprocals = _rrf_reciprocals(k, max(len(results1), len(results2)))
+        
+        # Score results from first list (one visit per result: rank, raw and normalized score)
+        for (rank, doc_id, result), normalized in self._rank_and_normalize(results1):
+            entry = scores.get(doc_id)
+            if entry is None:
+                scores[doc_id] = entry = {'doc': result, 'rrf_score': 0.0}
+            entry['rrf_score'] += reciprocals[rank - 1]
             doc_entry = entry['doc']
             doc_entry['lexical_score'] = result.get('score', 0.0)
-            doc_entry['lexical_score_normalized'] = lexical_norm_map.get(doc_id, 0.0)
+            doc_entry['lexical_score_normalized'] = normalized
             doc_entry['lexical_rank'] = rank
         
         # Score results from second list
-        for rank, result in enumerate(results2, 1):
-            doc_id = str(result.get('id', ''))
-            if not doc_id:
-                continue
-            entry = scores.setdefault(doc_id, {'doc': result.copy(), 'rrf_score': 0.0})
-            entry['rrf_score'] += 1.0 / (k + rank)
+        for (rank, doc_id, result), normalized in self._rank_and_normalize(results2):
+            entry = scores.get(doc_id)
+            if entry is None:
+                scores[doc_id] = entry = {'doc': result, 'rrf_score': 0.0}
+            entry['rrf_score'] += reciprocals[rank - 1]
             doc_entry = entry['doc']
             doc_entry.setdefault('lexical_score', 0.0)
             doc_entry.setdefault('lexical_score_normalized', 0.0)
             doc_entry['vector_score'] = result.get('score', 0.0)
-            doc_entry['vector_score_normalized'] = vector_norm_map.get(doc_id, 0.0)
+            doc_entry['vector_score_normalized'] = normalized
             doc_entry['vector_rank'] = rank
         
         # Sort by RRF score
-        combined = sorted(scores.values(), key=lambda x: x['rrf_score'], reverse=True)
+        if sort_results:
+            combined = sorted(scores.values(), key=lambda x: x['rrf_score'], reverse=True)
+        else:
+            combined = list(scores.values())
         
         # Update scores in results
         for item in combined:
@@ -2254,13 +3162,24 @@ RULES:
         
         return [item['doc'] for item in combined]
     
-    async def _vector_search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+    async def _vector_search(
+        self,
+        query: str,
+        limit: int,
+        query_context: Optional[Dict[str, Any]] = None,
+        behavioral_maps: Optional[Dict[str, Dict[str, float]]] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Perform vector/semantic search using embeddings.
         
+        The same boosting factors used for TF-IDF results are applied to each
+        vector result before it is returned.
+        
         Args:
             query: Search query
             limit: Maximum number of results
+            query_context: Optional heuristic analysis (intent/entities)
+            behavioral_maps: Optional CTR maps from _prepare_behavioral_maps
             
         Returns:
             List of search results
@@ -2274,7 +3193,7 @@ RULES:
             query_embedding = await self._get_query_embedding_cached(query)
             
             # Check if embedding is valid (not all zeros)
-            if all(x == 0.0 for x in query_embedding):
+            if not np.any(query_embedding):
                 logger.warning("Query embedding is all zeros, skipping vector search")
                 return []
             
@@ -2292,6 +3211,48 @@ RULES:
             )
             
             logger.info(f"Vector search returned {len(vector_results)} results")
+            
+            if behavioral_maps is None:
+                behavioral_maps = {}
+            
+            # Hoist bound methods out of the per-result loop
+            field_score = self._calculate_field_score
+            freshness_score = self._calculate_freshness_boost
+            category_tag_score = self._calculate_category_tag_boost
+            heading_anchor_score = self._calculate_heading_anchor_boost
+            taxonomy_depth_score = self._calculate_taxonomy_depth_boost
+            behavioral_score = self._calculate_behavioral_boost
+            expose_boost_debug = settings.expose_boost_debug
+            query_tokens = _prepare_query_tokens(query)
+            
+            for result in vector_results:
+                field_boost = field_score(query, result, query_context, query_tokens=query_tokens)
+                freshness_boost = freshness_score(result.get('date', ''))
+                category_tag_boost = category_tag_score(query, result, query_tokens=query_tokens)
+                heading_anchor_boost = heading_anchor_score(query, result, query_tokens)
+                taxonomy_depth_boost = taxonomy_depth_score(result)
+                behavioral_boost = behavioral_score(result, behavioral_maps)
+                result['score'] *= (
+                    field_boost
+                    * freshness_boost
+                    * category_tag_boost
+                    * heading_anchor_boost
+                    * taxonomy_depth_boost
+                    * behavioral_boost
+                )
+                if expose_boost_debug:
+                    meta = result.get('meta') if isinstance(result.get('meta'), dict) else {}
+                    meta.setdefault('boost_debug', {})
+                    meta['boost_debug'].update({
+                        'field': round(field_boost, 3),
+                        'freshness': round(freshness_boost, 3),
+                        'category_tag': round(category_tag_boost, 3),
+                        'heading_anchor': round(heading_anchor_boost, 3),
+                        'taxonomy_depth': round(taxonomy_depth_boost, 3),
+                        'behavioral': round(behavioral_boost, 3),
+                    })
+                    result['meta'] = meta
+            
             return vector_results
             
         except Exception as e:
@@ -2300,5 +3261,15 @@ RULES:
     
     def close(self):
         """Close the search system."""
+        if self._embed_worker_task is not None:
+            self._embed_worker_task.cancel()
+        for task in list(self._background_tasks):
+            task.cancel()
+        if self._persisted_embeddings is not None:
+            try:
+                written = self._persisted_embeddings.flush()
+                logger.info(f"Persisted {written} new query embeddings")
+            except Exception as e:
+                logger.warning(f"Failed to persist query embeddings: {e}")
         if self.qdrant_manager:
             self.qdrant_manager.close()
@@ -3,14 +3,31 @@ Comprehensive logging module for the hybrid search API.
 Provides structured logging with different levels and contexts.
 """
 import logging
-import json
 import time
 import traceback
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 import os
 from contextvars import ContextVar
 
+from json_utils import json_dumps
+
+class _StructuredMessage:
+    """Log message that serializes its payload to JSON only when a handler formats the record."""
+    
+    __slots__ = ('payload', '_text')
+    
+    def __init__(self, payload: Dict[str, Any]):
+        self.payload = payload
+        self._text: Optional[str] = None
+    
+    def __str__(self) -> str:
+        # Cached so several handlers formatting the same record serialize once
+        if self._text is None:
+            self._text = json_dumps(self.payload)
+        return self._text
+
+
 # Context variables for request tracking
 request_id_var: ContextVar[str] = ContextVar('request_id', default='')
 user_id_var: ContextVar[str] = ContextVar('user_id', default='')
@@ -57,8 +74,12 @@ class StructuredLogger:
             'timestamp': datetime.utcnow().isoformat(),
         }
     
-    def _log_structured(self, level: str, message: str, **kwargs):
-        """Log structured message with context."""
+    def _log_structured(self, level_num: int, level: str, message: str, **kwargs):
+        """Log structured message with context (level_num is the logging constant for level)."""
+        # Skip building and serializing the payload when the level is filtered out
+        if not self.logger.isEnabledFor(level_num):
+            return
+        
         context = self._get_context()
         context.update(kwargs)
         
@@ -71,28 +92,29 @@ class StructuredLogger:
         if level == 'ERROR' and 'exception' in kwargs:
             log_data['traceback'] = traceback.format_exc()
         
-        # Log as JSON for structured logging
-        self.logger.log(getattr(logging, level), json.dumps(log_data))
+        # Log as JSON for structured logging; serialization is deferred until a
+        # handler emits the record, and the context is attached for JSON-aware formatters
+        self.logger.log(level_num, _StructuredMessage(log_data), extra={'context': context})
     
     def info(self, message: str, **kwargs):
         """Log info message."""
-        self._log_structured('INFO', message, **kwargs)
+        self._log_structured(logging.INFO, 'INFO', message, **kwargs)
     
     def warning(self, message: str, **kwargs):
         """Log warning message."""
-        self._log_structured('WARNING', message, **kwargs)
+        self._log_structured(logging.WARNING, 'WARNING', message, **kwargs)
     
     def error(self, message: str, **kwargs):
         """Log error message."""
-        self._log_structured('ERROR', message, **kwargs)
+        self._log_structured(logging.ERROR, 'ERROR', message, **kwargs)
     
     def debug(self, message: str, **kwargs):
         """Log debug message."""
-        self._log_structured('DEBUG', message, **kwargs)
+        self._log_structured(logging.DEBUG, 'DEBUG', message, **kwargs)
     
     def critical(self, message: str, **kwargs):
         """Log critical message."""
-        self._log_structured('CRITICAL', message, **kwargs)
+        self._log_structured(logging.CRITICAL, 'CRITICAL', message, **kwargs)
 
 
 class PerformanceLogger:
@@ -100,25 +122,21 @@ class PerformanceLogger:
     
     def __init__(self):
         self.logger = StructuredLogger('performance')
-        self._timers: Dict[str, float] = {}
     
-    def start_timer(self, operation: str) -> str:
-        """Start timing an operation."""
-        timer_id = f"{operation}_{int(time.time() * 1000)}"
-        self._timers[timer_id] = time.time()
-        return timer_id
+    def start_timer(self, operation: str) -> Tuple[str, int]:
+        """Start timing an operation; pass the returned token to end_timer."""
+        return operation, time.perf_counter_ns()
     
-    def end_timer(self, timer_id: str, **kwargs):
+    def end_timer(self, timer: Tuple[str, int], **kwargs):
         """End timing and log performance."""
-        if timer_id in self._timers:
-            duration = time.time() - self._timers[timer_id]
-            del self._timers[timer_id]
-            
-            self.logger.info(
-                f"Performance: {timer_id.split('_')[0]} completed",
-                duration_ms=round(duration * 1000, 2),
-                **kwargs
-            )
+        operation, started_ns = timer
+        duration_ns = time.perf_counter_ns() - started_ns
+        
+        self.logger.info(
+            f"Performance: {operation} completed",
+            duration_ms=round(duration_ns / 1e6, 2),
+            **kwargs
+        )
     
     def log_search_performance(self, query: str, result_count: int, duration: float, **kwargs):
         """Log search performance metrics."""
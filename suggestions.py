@@ -2,21 +2,51 @@
 Query suggestions and autocomplete functionality.
 Combines LLM suggestions with popular searches from analytics.
 """
+import asyncio
+import json
 import logging
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
+import re
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+from cerebras_llm import extract_json_array_from_text
+from config import settings
+from constants import (
+    MIN_SUGGESTION_QUERY_LENGTH,
+    SUGGESTION_ANALYTICS_TABLE,
+    SUGGESTION_BATCH_MAX,
+    SUGGESTION_BATCH_WINDOW_SEC,
+    SUGGESTION_CACHE_SIZE,
+    SUGGESTION_CACHE_TTL,
+    SUGGESTION_REDIS_KEY_PREFIX,
+    SUGGESTION_SKIP_QUERIES,
+    SUGGESTION_TIMEOUT_SEC,
+)
+from ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# "1. foo" / "2) foo" list numbering the LLM sometimes adds despite the prompt
+_LIST_NUMBER_RE = re.compile(r'^\d+[.)]\s+')
+
 
 class SuggestionEngine:
     """Generate query suggestions for autocomplete."""
     
-    def __init__(self, llm_client=None, analytics_db=None):
+    def __init__(self, llm_client=None, analytics_db=None, redis_client=None):
         self.llm_client = llm_client
         self.analytics_db = analytics_db
-        self.suggestion_cache = {}  # Cache suggestions
-        self.cache_ttl = 3600  # 1 hour
+        # Optional redis.asyncio client: suggestions cached by any worker are shared
+        # with all of them; the in-process cache stays in front of it
+        self.redis_client = redis_client
+        # (lowercased partial query, limit) -> suggestions; bounded, entries expire lazily
+        self.suggestion_cache = TTLCache(max_items=SUGGESTION_CACHE_SIZE, ttl_sec=SUGGESTION_CACHE_TTL)
+        # Cache key -> in-flight computation, so concurrent identical requests share one LLM call
+        self._inflight: Dict[Tuple[str, int], "asyncio.Future[List[str]]"] = {}
+        # Micro-batching of LLM completions (partial queries arriving together share one call)
+        self._llm_queue: Optional[asyncio.Queue] = None
+        self._llm_worker_task: Optional[asyncio.Task] = None
+        # In-flight batch completions; the loop only keeps weak references to tasks
+        self._batch_tasks: Set[asyncio.Task] = set()
     
     async def get_suggestions(
         self, 
@@ -26,16 +56,56 @@ class SuggestionEngine:
     ) -> List[str]:
         """Get suggestions for partial query."""
         try:
-            if len(partial_query) < 2:
+            if len(partial_query) < MIN_SUGGESTION_QUERY_LENGTH:
+                return []
+            if partial_query.strip().lower() in SUGGESTION_SKIP_QUERIES:
                 return []
             
-            # Check cache first
-            cache_key = f"{partial_query.lower()}_{limit}"
-            cached = self._get_cached_suggestion(cache_key)
+            # Check cache first (this prefix, or a shorter one the user typed earlier)
+            cache_key = (partial_query.lower(), limit)
+            cached = await self._get_cached_suggestion(cache_key)
             if cached:
                 logger.debug(f"Returning cached suggestions for: {partial_query}")
                 return cached
             
+            future = self._inflight.get(cache_key)
+            if future is None:
+                future = asyncio.ensure_future(
+                    self._compute_suggestions(partial_query, limit, include_popular, cache_key)
+                )
+                self._inflight[cache_key] = future
+                
+                def _forget(done: asyncio.Future) -> None:
+                    if self._inflight.get(cache_key) is done:
+                        del self._inflight[cache_key]
+                
+                future.add_done_callback(_forget)
+            else:
+                logger.debug(f"Joining in-flight suggestions for: {partial_query}")
+            
+            # Shield so one cancelled (or timed out) request does not cancel the shared call
+            return await asyncio.wait_for(asyncio.shield(future), timeout=SUGGESTION_TIMEOUT_SEC)
+            
+        except asyncio.TimeoutError:
+            logger.warning(f"Suggestions for '{partial_query}' timed out after {SUGGESTION_TIMEOUT_SEC}s")
+            # Let the next request start afresh rather than join a stuck computation
+            if self._inflight.get(cache_key) is future:
+                del self._inflight[cache_key]
+            return []
+            
+        except Exception as e:
+            logger.error(f"Error getting suggestions: {e}")
+            return []
+    
+    async def _compute_suggestions(
+        self,
+        partial_query: str,
+        limit: int,
+        include_popular: bool,
+        cache_key: Tuple[str, int],
+    ) -> List[str]:
+        """Build (and cache) suggestions from popular searches and the LLM."""
+        try:
             suggestions = []
             
             # 1. Get popular searches that match prefix
@@ -48,20 +118,21 @@ class SuggestionEngine:
                 remaining = limit - len(suggestions)
                 llm_suggestions = await self._get_llm_suggestions(partial_query, remaining)
                 suggestions.extend(llm_suggestions)
+                
+                # 3. Remove duplicates (case-insensitive, first spelling wins), preserve
+                # order, and stop as soon as limit unique suggestions are collected.
+                # Popular searches alone are already distinct, so only needed here
+                unique_suggestions: Dict[str, str] = {}
+                for s in suggestions:
+                    if len(unique_suggestions) >= limit:
+                        break
+                    unique_suggestions.setdefault(s.lower(), s)
+                suggestions = list(unique_suggestions.values())
             
-            # 3. Remove duplicates, preserve order
-            unique_suggestions = []
-            seen = set()
-            for s in suggestions:
-                s_lower = s.lower()
-                if s_lower not in seen:
-                    unique_suggestions.append(s)
-                    seen.add(s_lower)
-            
-            result = unique_suggestions[:limit]
+            result = suggestions[:limit]
             
             # Cache the result
-            self._cache_suggestion(cache_key, result)
+            await self._cache_suggestion(cache_key, result)
             
             return result
             
@@ -81,13 +152,89 @@ class SuggestionEngine:
             return []
     
     async def _get_llm_suggestions(self, partial_query: str, limit: int) -> List[str]:
-        """Get LLM-generated query completions."""
+        """
+        Get LLM-generated query completions, sharing one LLM call with other
+        partial queries submitted within SUGGESTION_BATCH_WINDOW_SEC.
+        """
         try:
             if not self.llm_client:
                 return []
             
-            # Use LLM to complete/expand the partial query
-            prompt = f"""Given the partial search query "{partial_query}", suggest {limit} complete search queries that a user might want to search for.
+            loop = asyncio.get_running_loop()
+            worker = self._llm_worker_task
+            if worker is None or worker.done() or worker.get_loop() is not loop:
+                self._llm_queue = asyncio.Queue()
+                self._llm_worker_task = loop.create_task(self._llm_batch_worker(self._llm_queue))
+            
+            future = loop.create_future()
+            self._llm_queue.put_nowait((partial_query, limit, future))
+            return await future
+            
+        except Exception as e:
+            logger.error(f"Error getting LLM suggestions: {e}")
+            return []
+    
+    async def _llm_batch_worker(self, queue: asyncio.Queue) -> None:
+        """Drain the completion queue in batches of up to SUGGESTION_BATCH_MAX partial queries."""
+        while True:
+            batch = [await queue.get()]
+            # Give concurrent keystrokes a moment to join this batch
+            await asyncio.sleep(SUGGESTION_BATCH_WINDOW_SEC)
+            while len(batch) < SUGGESTION_BATCH_MAX and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            # Skip requests whose callers have gone away
+            batch = [item for item in batch if not item[2].done()]
+            if batch:
+                # Not awaited here, so the next batch can form while this LLM call is in flight
+                task = asyncio.get_running_loop().create_task(self._complete_batch(batch))
+                self._batch_tasks.add(task)
+                task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _complete_batch(self, batch: List[Tuple[str, int, asyncio.Future]]) -> None:
+        """Resolve each queued future with its completions (one LLM call for the whole batch)."""
+        try:
+            if len(batch) == 1:
+                partial_query, limit, _ = batch[0]
+                results = [await self._request_llm_suggestions(partial_query, limit)]
+            else:
+                results = await self._request_llm_suggestions_batch(
+                    [partial_query for partial_query, _, _ in batch],
+                    max(limit for _, limit, _ in batch),
+                )
+        except Exception as e:
+            logger.warning(f"Batched LLM suggestions failed ({e}), completing queries one by one")
+            results = await asyncio.gather(
+                *(self._request_llm_suggestions(partial_query, limit) for partial_query, limit, _ in batch),
+                return_exceptions=True,
+            )
+        
+        for (partial_query, limit, future), suggestions in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(suggestions, BaseException):
+                future.set_exception(suggestions)
+            else:
+                future.set_result(self._filter_suggestions(partial_query, suggestions, limit))
+    
+    @staticmethod
+    def _filter_suggestions(partial_query: str, suggestions: List[str], limit: int) -> List[str]:
+        """Keep suggestions that contain the partial query, up to limit."""
+        # Filter out suggestions that don't start with the partial query
+        # (allow some flexibility); stop lowercasing once limit are kept
+        partial_lower = partial_query.lower()
+        filtered: List[str] = []
+        for s in suggestions:
+            if len(filtered) >= limit:
+                break
+            if partial_lower in s.lower():
+                filtered.append(s)
+        return filtered
+    
+    async def _request_llm_suggestions(self, partial_query: str, limit: int) -> List[str]:
+        """Ask the LLM for completions of a single partial query (one per line)."""
+        # Use LLM to complete/expand the partial query
+        prompt = f"""Given the partial search query "{partial_query}", suggest {limit} complete search queries that a user might want to search for.
 
 Focus on:
 - Completing the partial query naturally
@@ -105,58 +252,219 @@ environmental impact assessment
 environmental consulting services
 environmental regulations
 """
-            
-            # Use async client to avoid blocking the event loop
-            response = await self.llm_client.async_client.chat.completions.create(
-                model=self.llm_client.model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful search suggestion assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=200
-            )
-            
-            result = response.choices[0].message.content.strip()
-            
-            # Parse line-by-line
-            suggestions = [line.strip() for line in result.split('\n') if line.strip()]
-            
-            # Filter out suggestions that don't start with the partial query
-            # (allow some flexibility)
-            filtered = [
-                s for s in suggestions 
-                if partial_query.lower() in s.lower()
-            ]
-            
-            return filtered[:limit]
-            
-        except Exception as e:
-            logger.error(f"Error getting LLM suggestions: {e}")
-            return []
+        
+        # Use async client to avoid blocking the event loop. Streamed, so generation
+        # can be abandoned once limit usable lines have arrived
+        stream = await self.llm_client.async_client.chat.completions.create(
+            model=self.llm_client.model,
+            messages=[
+                {"role": "system", "content": "You are a helpful search suggestion assistant."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=200,
+            stream=True
+        )
+        
+        # Parse line-by-line as text arrives
+        partial_lower = partial_query.lower()
+        suggestions: List[str] = []
+        usable = 0
+        buffer = ""
+        complete = True
+        try:
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                buffer += chunk.choices[0].delta.content
+                *lines, buffer = buffer.split('\n')
+                for line in lines:
+                    line = line.strip()
+                    if line[:1].isdigit():
+                        line = _LIST_NUMBER_RE.sub('', line)
+                    if line:
+                        suggestions.append(line)
+                        usable += partial_lower in line.lower()
+                if usable >= limit:
+                    complete = False
+                    break
+        finally:
+            # Closing the response stops the server generating the rest
+            await stream.response.aclose()
+        
+        # The trailing line is only whole if the stream ran to the end
+        line = buffer.strip()
+        if line[:1].isdigit():
+            line = _LIST_NUMBER_RE.sub('', line)
+        if complete and line:
+            suggestions.append(line)
+        return suggestions
     
-    def _get_cached_suggestion(self, key: str) -> List[str]:
-        """Get suggestion from cache if not expired."""
-        if key in self.suggestion_cache:
-            cached_data, timestamp = self.suggestion_cache[key]
-            age = (datetime.now() - timestamp).total_seconds()
-            if age < self.cache_ttl:
-                return cached_data
-            else:
-                # Expired, remove from cache
-                del self.suggestion_cache[key]
+    async def _request_llm_suggestions_batch(self, partial_queries: List[str], limit: int) -> List[List[str]]:
+        """
+        Ask the LLM for completions of several partial queries in one call.
+        
+        Returns:
+            One suggestion list per partial query, in input order
+        
+        Raises:
+            ValueError: If the response is not one JSON array of suggestions per query
+        """
+        numbered = "\n".join(f'{i}. "{query}"' for i, query in enumerate(partial_queries, 1))
+        prompt = f"""For each of the following {len(partial_queries)} partial search queries, suggest {limit} complete search queries that a user might want to search for.
+
+{numbered}
+
+Focus on:
+- Completing the partial query naturally
+- Related searches users might want
+- Common variations and expansions
+- Domain-relevant queries (environmental, compliance, engineering, audits)
+
+Return ONLY a JSON array with one array of suggestion strings per partial query, in the same order, without explanations.
+
+Example for 1. "environ" and 2. "audit":
+[["environmental compliance", "environmental impact assessment"], ["audit services", "energy audit"]]
+"""
+        
+        response = await self.llm_client.async_client.chat.completions.create(
+            model=self.llm_client.model,
+            messages=[
+                {"role": "system", "content": "You are a helpful search suggestion assistant."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=200 * len(partial_queries)
+        )
+        
+        parsed = extract_json_array_from_text(response.choices[0].message.content or "")
+        if len(parsed) != len(partial_queries) or not all(isinstance(item, list) for item in parsed):
+            raise ValueError(f"expected {len(partial_queries)} suggestion lists, got {str(parsed)[:200]}")
+        return [[str(s).strip() for s in item if str(s).strip()] for item in parsed]
+    
+    async def _get_cached_suggestion(self, key: Tuple[str, int]) -> Optional[List[str]]:
+        """
+        Get unexpired suggestions for (partial query, limit).
+        
+        On a miss, the longest shorter prefix with cached suggestions is tried:
+        its suggestions that still contain the longer partial query are served
+        (and cached under it), so typing "env" -> "envi" -> "envir" needs one
+        lookup per keystroke instead of one LLM call. With a shared Redis cache
+        the partial query and all its prefixes are fetched in one round trip.
+        """
+        cached = self.suggestion_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        query_lower, limit = key
+        prefixes = [query_lower[:end] for end in range(len(query_lower), MIN_SUGGESTION_QUERY_LENGTH - 1, -1)]
+        shared = await self._get_shared_suggestions(prefixes, limit)
+        for prefix, suggestions in zip(prefixes, shared):
+            if suggestions is None:
+                suggestions = self.suggestion_cache.get((prefix, limit))
+                if suggestions is None:
+                    continue
+            if prefix != query_lower:
+                suggestions = [s for s in suggestions if query_lower in s.lower()]
+                if not suggestions:
+                    continue
+            self.suggestion_cache.set(key, suggestions)
+            return suggestions
         return None
     
-    def _cache_suggestion(self, key: str, suggestions: List[str]):
-        """Cache suggestion result."""
-        self.suggestion_cache[key] = (suggestions, datetime.now())
+    @staticmethod
+    def _shared_key(query_lower: str, limit: int) -> str:
+        """Redis key for a (lowercased partial query, limit) cache entry."""
+        return f"{SUGGESTION_REDIS_KEY_PREFIX}{query_lower}:{limit}"
     
-    def get_trending_searches(self, limit: int = 10, hours: int = 24) -> List[Dict[str, Any]]:
-        """Get trending search queries from recent analytics."""
+    async def _get_shared_suggestions(self, prefixes: List[str], limit: int) -> List[Optional[List[str]]]:
+        """Fetch suggestions for each prefix from Redis (None where absent or Redis is unavailable)."""
+        if self.redis_client is None:
+            return [None] * len(prefixes)
         try:
-            # This would query your analytics for trending searches
-            # Return format: [{"query": "...", "count": N, "trend": "up"}]
-            return []
+            raw_values = await self.redis_client.mget([self._shared_key(prefix, limit) for prefix in prefixes])
+            return [json.loads(raw) if raw else None for raw in raw_values]
+        except Exception as e:
+            logger.warning(f"Shared suggestion cache read failed: {e}")
+            return [None] * len(prefixes)
+    
+    async def _cache_suggestion(self, key: Tuple[str, int], suggestions: List[str]):
+        """Cache suggestion result in process and, if configured, in Redis."""
+        self.suggestion_cache.set(key, suggestions)
+        if self.redis_client is None:
+            return
+        try:
+            await self.redis_client.set(self._shared_key(*key), json.dumps(suggestions), ex=SUGGESTION_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"Shared suggestion cache write failed: {e}")
+    
+    async def invalidate_cached_suggestions(self, prefix: str = "") -> int:
+        """
+        Drop cached suggestions, e.g. after re-indexing changes the content.
+        
+        The in-process cache is cleared entirely; in Redis only the entries whose
+        partial query starts with prefix (all of them by default) are deleted.
+        
+        Returns:
+            Number of Redis entries deleted
+        """
+        self.suggestion_cache.clear()
+        if self.redis_client is None:
+            return 0
+        
+        # Escape glob metacharacters so the prefix matches literally
+        pattern_prefix = "".join(f"\\{c}" if c in "*?[]\\" else c for c in prefix.lower())
+        deleted = 0
+        try:
+            batch = []
+            async for key in self.redis_client.scan_iter(match=f"{SUGGESTION_REDIS_KEY_PREFIX}{pattern_prefix}*", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    deleted += await self.redis_client.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += await self.redis_client.delete(*batch)
+        except Exception as e:
+            logger.warning(f"Shared suggestion cache invalidation failed: {e}")
+        return deleted
+    
+    async def get_trending_searches(self, limit: int = 10, hours: int = 24) -> List[Dict[str, Any]]:
+        """
+        Get trending search queries from recent analytics.
+        
+        Counting, ranking and the comparison with the preceding window of the
+        same length all happen in one aggregate query on the analytics database
+        (a ``databases``-style client: ``await fetch_all(query, values)``), served
+        by the plugin's (timestamp, query) index; no raw rows reach Python.
+        
+        Returns:
+            [{"query": "...", "count": N, "trend": "up" | "down" | "flat"}], most searched first
+        """
+        try:
+            if not self.analytics_db:
+                return []
+            
+            rows = await self.analytics_db.fetch_all(
+                query=f"""
+                    SELECT query,
+                           SUM(timestamp >= NOW() - INTERVAL :hours HOUR) AS count,
+                           SUM(timestamp < NOW() - INTERVAL :hours HOUR) AS previous_count
+                    FROM {settings.wordpress_table_prefix}{SUGGESTION_ANALYTICS_TABLE}
+                    WHERE timestamp >= NOW() - INTERVAL :window_hours HOUR
+                    GROUP BY query
+                    HAVING count > 0
+                    ORDER BY count DESC
+                    LIMIT :limit
+                """,
+                values={"hours": hours, "window_hours": 2 * hours, "limit": limit},
+            )
+            
+            trending = []
+            for row in rows:
+                count, previous = int(row["count"]), int(row["previous_count"])
+                trend = "up" if count > previous else "down" if count < previous else "flat"
+                trending.append({"query": row["query"], "count": count, "trend": trend})
+            return trending
             
         except Exception as e:
             logger.error(f"Error getting trending searches: {e}")
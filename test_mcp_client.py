@@ -3,9 +3,10 @@ Test client for MCP Hybrid Search Server
 Demonstrates how to use the MCP server programmatically
 """
 import asyncio
-import json
 from typing import Any, Dict
 
+from json_utils import json_dumps, json_loads
+
 try:
     from mcp import ClientSession, StdioServerParameters
     from mcp.client.stdio import stdio_client
@@ -13,7 +14,6 @@ except ImportError:
     print("ERROR: MCP SDK not installed. Install with: pip install mcp")
     exit(1)
 
-
 async def test_search():
     """Test the hybrid search MCP server"""
     
@@ -48,7 +48,7 @@ async def test_search():
                 print("="*60)
                 
                 stats_result = await session.call_tool("get_search_stats", {})
-                print(json.dumps(stats_result.content[0].text, indent=2))
+                print(json_dumps(stats_result.content[0].text, pretty=True))
                 
                 # Test 2: Search for content
                 print("\n" + "="*60)
@@ -65,7 +65,7 @@ async def test_search():
                     }
                 )
                 
-                search_data = json.loads(search_result.content[0].text)
+                search_data = json_loads(search_result.content[0].text)
                 print(f"\n✅ Found {search_data.get('total_results', 0)} results")
                 print(f"⏱️  Processing time: {search_data.get('processing_time_seconds', 0):.3f}s")
                 
@@ -91,7 +91,7 @@ async def test_search():
                     }
                 )
                 
-                answer_data = json.loads(answer_result.content[0].text)
+                answer_data = json_loads(answer_result.content[0].text)
                 print(f"\n🤖 AI Answer:")
                 print(f"{answer_data.get('answer', 'No answer generated')}")
                 print(f"\n📚 Based on {len(answer_data.get('sources', []))} sources")
@@ -108,7 +108,7 @@ async def test_search():
                     }
                 )
                 
-                expand_data = json.loads(expand_result.content[0].text)
+                expand_data = json_loads(expand_result.content[0].text)
                 print(f"\n🔍 Original query: {expand_data.get('original_query', '')}")
                 print(f"🌟 Expanded queries:")
                 for expanded in expand_data.get('expanded_queries', [])[:5]:
@@ -150,8 +150,8 @@ async def test_indexing():
                     }
                 )
                 
-                index_data = json.loads(index_result.content[0].text)
-                print(json.dumps(index_data, indent=2))
+                index_data = json_loads(index_result.content[0].text)
+                print(json_dumps(index_data, pretty=True))
                 
     except Exception as e:
         print(f"\n❌ Error: {e}")
@@ -195,7 +195,7 @@ async def interactive_search():
                         }
                     )
                     
-                    data = json.loads(result.content[0].text)
+                    data = json_loads(result.content[0].text)
                     
                     print(f"\n✅ Found {data.get('total_results', 0)} results:")
                     for i, item in enumerate(data.get('results', []), 1):
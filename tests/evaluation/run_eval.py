@@ -6,34 +6,53 @@ against a running Hybrid Search API, and reports ranking metrics (MRR, NDCG).
 
 Usage:
     HYBRID_SEARCH_EVAL_API=http://localhost:8000/search \
-    python tests/evaluation/run_eval.py
+    python -m tests.evaluation.run_eval
+
+Queries are sent concurrently (HYBRID_SEARCH_EVAL_CONCURRENCY at a time, over
+HTTP/2 when the ``h2`` package is installed); per-query lines are still printed
+in dataset order.
 """
 from __future__ import annotations
 
 import asyncio
-import json
-import math
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, FrozenSet, List
 
 import httpx
+import numpy as np
+
+from json_utils import json_loads
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 DATASET_PATH = Path(__file__).with_name("sample_dataset.json")
 API_URL = os.environ.get("HYBRID_SEARCH_EVAL_API", "http://localhost:8000/search")
 TOP_K = int(os.environ.get("HYBRID_SEARCH_EVAL_TOP_K", 10))
+CONCURRENCY = int(os.environ.get("HYBRID_SEARCH_EVAL_CONCURRENCY", 16))
+
+# Position discounts 1 / log2(rank + 1) for ranks 1..TOP_K, computed once
+_DISCOUNTS = 1.0 / np.log2(np.arange(2, TOP_K + 2))
 
 
-def dcg(relevances: List[int]) -> float:
-    return sum(rel / math.log2(idx + 2) for idx, rel in enumerate(relevances))
+def _discounts(k: int) -> np.ndarray:
+    return _DISCOUNTS[:k] if k <= TOP_K else 1.0 / np.log2(np.arange(2, k + 2))
 
 
 def ndcg(relevant_ranks: List[int], k: int) -> float:
     if not relevant_ranks:
         return 0.0
-    relevances = [1 if (idx + 1) in relevant_ranks else 0 for idx in range(k)]
-    ideal = sum(1 / math.log2(idx + 2) for idx in range(min(len(relevant_ranks), k)))
-    return dcg(relevances) / ideal if ideal > 0 else 0.0
+    discounts = _discounts(k)
+    # Binary relevance: DCG is the sum of the discounts at the relevant ranks within the top k
+    positions = [rank - 1 for rank in set(relevant_ranks) if 1 <= rank <= k]
+    gain = float(discounts[positions].sum())
+    ideal = float(discounts[:min(len(relevant_ranks), k)].sum())
+    return gain / ideal if ideal > 0 else 0.0
 
 
 def mrr(relevant_ranks: List[int]) -> float:
@@ -42,14 +61,15 @@ def mrr(relevant_ranks: List[int]) -> float:
     return 1.0 / min(relevant_ranks)
 
 
-async def evaluate_query(client: httpx.AsyncClient, query: str, relevant_urls: List[str]) -> Dict[str, float]:
+async def evaluate_query(
+    client: httpx.AsyncClient, query: str, normalized_relevant: FrozenSet[str]
+) -> Dict[str, float]:
     payload = {"query": query, "limit": TOP_K, "offset": 0, "include_answer": False}
     response = await client.post(API_URL, json=payload, timeout=30)
     response.raise_for_status()
-    data = response.json()
+    data = json_loads(response.content)
     results = data.get("data", {}).get("results", [])
 
-    normalized_relevant = {normalize_url(url) for url in relevant_urls}
     ranks: List[int] = []
     for idx, item in enumerate(results, start=1):
         url = normalize_url(item.get("url", ""))
@@ -65,6 +85,7 @@ async def evaluate_query(client: httpx.AsyncClient, query: str, relevant_urls: L
     return metrics
 
 
+@lru_cache(maxsize=4096)
 def normalize_url(url: str) -> str:
     if not url:
         return ""
@@ -78,13 +99,23 @@ async def run_evaluation() -> None:
     if not DATASET_PATH.exists():
         raise FileNotFoundError(f"Dataset not found: {DATASET_PATH}")
 
-    dataset = json.loads(DATASET_PATH.read_text())
-    async with httpx.AsyncClient() as client:
+    dataset = json_loads(DATASET_PATH.read_bytes())
+    for entry in dataset:
+        entry["_normalized_relevant"] = frozenset(map(normalize_url, entry.get("relevant_urls", [])))
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    limits = httpx.Limits(max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY)
+
+    async with httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=limits) as client:
+
+        async def bounded_evaluate(entry: Dict) -> Dict[str, float]:
+            async with semaphore:
+                return await evaluate_query(client, entry["query"], entry["_normalized_relevant"])
+
+        all_metrics = await asyncio.gather(*(bounded_evaluate(entry) for entry in dataset))
+
         aggregate = {"mrr": 0.0, "ndcg": 0.0, "queries": 0, "hits": 0, "relevant": 0}
-        for entry in dataset:
+        for entry, metrics in zip(dataset, all_metrics):
             query = entry["query"]
-            relevant_urls = entry.get("relevant_urls", [])
-            metrics = await evaluate_query(client, query, relevant_urls)
             aggregate["queries"] += 1
             aggregate["mrr"] += metrics["mrr"]
             aggregate["ndcg"] += metrics["ndcg"]
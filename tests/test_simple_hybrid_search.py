@@ -0,0 +1,120 @@
+"""
+Unit tests for SimpleHybridSearch: ranking decisions that must not depend on
+which page of results is requested, decoding of OpenAI embedding batches, and
+which query embeddings reach the shared on-disk store.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import heapq
+import json
+from collections import OrderedDict
+from operator import itemgetter
+from typing import Any, Dict, List
+
+import httpx
+import numpy as np
+import pytest
+from openai import AsyncOpenAI
+
+import simple_hybrid_search
+from constants import EMBEDDING_DIMENSION, MIN_RERANK_CANDIDATES, RERANK_BUFFER_SIZE
+from simple_hybrid_search import SimpleHybridSearch
+
+
+def _page_candidates(all_candidates: List[Dict[str, Any]], offset: int, limit: int) -> List[Dict[str, Any]]:
+    """Candidates as _search_uncached keeps them for a given page."""
+    top_k = max(MIN_RERANK_CANDIDATES, offset + limit + RERANK_BUFFER_SIZE)
+    return heapq.nlargest(top_k, all_candidates, key=itemgetter('score'))
+
+
+@pytest.mark.parametrize("step", [0.005, 0.01, 0.02])
+def test_rerank_skip_decision_is_the_same_for_every_page(step):
+    # Scores fall off slowly, so the gap to rank 10 and to rank 20 differ
+    all_candidates = [{'id': str(i), 'score': 0.6 - i * step} for i in range(60)]
+
+    first_page = SimpleHybridSearch._rerank_skip_reason(_page_candidates(all_candidates, 0, 10))
+    second_page = SimpleHybridSearch._rerank_skip_reason(_page_candidates(all_candidates, 10, 10))
+
+    assert first_page == second_page
+
+
+def test_rerank_skip_reasons():
+    assert SimpleHybridSearch._rerank_skip_reason([]) is None
+    assert SimpleHybridSearch._rerank_skip_reason([{'score': 0.9}]) == 'Skipped - high TF-IDF confidence'
+    close_scores = [{'score': 0.5 - i * 0.001} for i in range(30)]
+    assert SimpleHybridSearch._rerank_skip_reason(close_scores) is None
+    spread_scores = [{'score': 0.5 - i * 0.02} for i in range(30)]
+    assert SimpleHybridSearch._rerank_skip_reason(spread_scores) == 'Skipped - stable TF-IDF ordering'
+
+
+def test_openai_embedding_batch_decodes_base64_response(monkeypatch):
+    # Shaped like the embeddings API answer to encoding_format=base64
+    vectors = np.arange(2 * 1536, dtype=np.float32).reshape(2, 1536) / 1000
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        data = [
+            {"object": "embedding", "index": i, "embedding": base64.b64encode(vector.tobytes()).decode()}
+            for i, vector in enumerate(vectors)
+        ]
+        return httpx.Response(200, json={
+            "object": "list", "data": data, "model": "text-embedding-ada-002",
+            "usage": {"prompt_tokens": 4, "total_tokens": 4},
+        })
+
+    client = AsyncOpenAI(api_key="test", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(simple_hybrid_search, "_openai_client", lambda: client)
+    monkeypatch.setattr(simple_hybrid_search.settings, "embed_model", "text-embedding-ada-002")
+
+    search = SimpleHybridSearch.__new__(SimpleHybridSearch)
+    matrix = asyncio.run(search._generate_openai_embedding_batch(["landfill gas", "air permits"]))
+
+    assert requests[0]["encoding_format"] == "base64"
+    assert matrix.dtype == np.float32
+    np.testing.assert_array_equal(matrix, vectors[:, :EMBEDDING_DIMENSION])
+
+
+def test_embedding_store_path_is_per_model():
+    assert simple_hybrid_search._embedding_store_path(
+        "/var/cache/query_embeddings.npy", "openai:text-embedding-3-small"
+    ) == "/var/cache/query_embeddings.openai-text-embedding-3-small.npy"
+
+
+class _RecordingStore:
+    def __init__(self):
+        self.added = []
+
+    def get(self, key):
+        return None
+
+    def add(self, key, embedding):
+        self.added.append(key)
+
+
+@pytest.mark.parametrize("source, cached, persisted", [
+    ("openai:text-embedding-3-small", True, True),
+    ("hash", True, False),
+    (None, False, False),
+])
+def test_only_primary_query_embeddings_are_persisted(monkeypatch, source, cached, persisted):
+    search = SimpleHybridSearch.__new__(SimpleHybridSearch)
+    search._query_embedding_cache = OrderedDict()
+    search._query_embedding_alias_cache = OrderedDict()
+    search._query_cache_max_size = 10
+    search._persisted_embeddings = _RecordingStore()
+    search._embedding_source = "openai:text-embedding-3-small"
+
+    async def embed(text):
+        vector = np.zeros(EMBEDDING_DIMENSION, dtype=np.float32)
+        if source is not None:
+            vector[0] = 1.0
+        return vector, source
+
+    monkeypatch.setattr(search, "_get_embedding_with_source", embed)
+    asyncio.run(search._get_query_embedding_cached("landfill gas"))
+
+    assert ("landfill gas" in search._query_embedding_cache) is cached
+    assert bool(search._persisted_embeddings.added) is persisted
@@ -0,0 +1,97 @@
+"""
+Tests for the WordPress re-crawl cache: a page may only be answered from a
+304 while all of its items can be served from the item tier.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List
+
+import httpx
+
+from wordpress_cache import WordPressResponseCache
+from wordpress_client import WordPressContentFetcher
+
+CONTENT = "<p>" + "landfill gas monitoring " * 10 + "</p>"
+
+
+def _item(item_id: int, modified: str = "2024-01-01T00:00:00") -> Dict[str, Any]:
+    return {
+        "id": item_id,
+        "modified": modified,
+        "title": {"rendered": f"Post {item_id}"},
+        "content": {"rendered": CONTENT},
+    }
+
+
+def _crawl(cache: WordPressResponseCache, pages: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Record one crawl of the 'post' type that loaded only the given pages."""
+    for page_key, batch in pages.items():
+        cache.store_page(page_key, "post", {"ETag": f'"{page_key}"'}, batch, 2)
+        for item in batch:
+            if not cache.lookup_item("post", item)[0]:
+                cache.store_item("post", item, {"id": str(item["id"])})
+    cache.mark_crawled(["post"])
+    cache.save()
+
+
+def test_page_whose_items_were_pruned_is_not_revalidated(tmp_path):
+    path = tmp_path / "cache.json"
+    page_1, page_2 = [_item(1), _item(2)], [_item(3), _item(4)]
+
+    _crawl(WordPressResponseCache(str(path)), {"p1": page_1, "p2": page_2})
+
+    # Page 2 fails to load on the next crawl, so its items are not seen and pruned
+    _crawl(WordPressResponseCache(str(path)), {"p1": page_1})
+
+    cache = WordPressResponseCache(str(path))
+    assert cache.conditional_headers("p1") == {"If-None-Match": '"p1"'}
+    assert cache.conditional_headers("p2") == {}
+    assert cache.cached_page("p2") is None
+    assert cache.lookup_item("post", _item(1))[0]
+
+
+def test_cached_page_with_missing_item_is_forgotten(tmp_path):
+    cache = WordPressResponseCache(str(tmp_path / "cache.json"))
+    cache.store_page("p1", "post", {"ETag": '"p1"'}, [_item(1), _item(2)], 1)
+    cache.store_item("post", _item(1), {"id": "1"})
+
+    assert cache.cached_page("p1") is None
+    assert cache.conditional_headers("p1") == {}
+
+
+def test_not_modified_page_with_uncached_items_is_refetched(tmp_path):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"p1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=[_item(1), _item(2)], headers={"X-WP-TotalPages": "1", "ETag": '"p1"'})
+
+    async def crawl_page():
+        fetcher = WordPressContentFetcher(base_url="https://example.com/wp-json/wp/v2")
+        fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        fetcher.clean_processes = 0
+        fetcher.response_cache = cache
+        semaphore = asyncio.Semaphore(1)
+        items: List[Dict[str, Any]] = []
+        try:
+            batch, _ = await fetcher._fetch_post_type_page("post", endpoint, 1, semaphore)
+            await fetcher._collect_post_type_items("post", 1, batch, items, semaphore)
+        finally:
+            await fetcher.close()
+        return items
+
+    endpoint = "https://example.com/wp-json/wp/v2/posts"
+    cache = WordPressResponseCache(str(tmp_path / "cache.json"))
+    page_key = f"{endpoint}?per_page=50&page=1"
+    # Validators survived but one item's document did not
+    cache.store_page(page_key, "post", {"ETag": '"p1"'}, [_item(1), _item(2)], 1)
+    cache.store_item("post", _item(1), {"id": "1", "type": "post"})
+
+    items = asyncio.run(crawl_page())
+
+    assert requests == ['"p1"', None]
+    assert sorted(item["id"] for item in items) == ["1", "2"]
+    assert cache.lookup_item("post", _item(2))[1]["id"] == "2"
@@ -0,0 +1,26 @@
+"""
+Tests for the DOM-free plain-text extraction used when indexing WordPress content.
+"""
+from __future__ import annotations
+
+import pytest
+
+from wordpress_client import _clean_html
+
+
+@pytest.mark.parametrize(
+    "markup, expected",
+    [
+        ("<p>Env<strong>iron</strong>mental impact</p>", "Environmental impact"),
+        ("<p>CO<sub>2</sub> emissions</p>", "CO2 emissions"),
+        ('<a href="/x">Landfill</a> <em>gas</em>', "Landfill gas"),
+        ("<p>One</p><p>Two</p>", "One Two"),
+        ("a<br/>b", "a b"),
+        ("<p>Hi</p><!-- if a > b then --><p>there</p>", "Hi there"),
+        ("<p>5 < 6 and 7 > 3</p>", "5 < 6 and 7 > 3"),
+        ("<script>var a = 1 < 2;</script><p>ok</p>", "ok"),
+        ("&lt;tag&gt; &amp; more", "<tag> & more"),
+    ],
+)
+def test_clean_html_extracts_text(markup: str, expected: str) -> None:
+    assert _clean_html(markup) == expected
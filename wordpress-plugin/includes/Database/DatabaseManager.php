@@ -340,6 +340,8 @@ class DatabaseManager {
         if ($this->tableExists('analytics')) {
             $this->wpdb->query("CREATE INDEX IF NOT EXISTS idx_analytics_query_timestamp ON $analytics_table (query, timestamp)");
             $this->wpdb->query("CREATE INDEX IF NOT EXISTS idx_analytics_session_timestamp ON $analytics_table (session_id, timestamp)");
+            // Time-window aggregations (trending searches) filter on timestamp and group by query
+            $this->wpdb->query("CREATE INDEX IF NOT EXISTS idx_analytics_timestamp_query ON $analytics_table (timestamp, query)");
         }
         
         // CTR table indexes
@@ -0,0 +1,184 @@
+"""
+On-disk cache that lets a re-crawl of WordPress skip unchanged content.
+
+Two tiers are kept in one JSON file:
+
+* pages: the ``ETag`` / ``Last-Modified`` validators of every REST listing page,
+  with the ``(id, modified)`` stubs of its items, so the next crawl can send a
+  conditional request and treat a ``304 Not Modified`` as "same items as last
+  time" without downloading the page.
+* items: each item's cleaned document keyed by post type and ID, reused as long
+  as the item's ``modified`` timestamp has not moved, so an item whose page did
+  change (e.g. shifted by a new post) is still not re-cleaned.
+
+A page is only answered from the cache while every one of its stubs still has
+an unchanged cleaned document; otherwise it has to be fetched in full again.
+
+The file is loaded when the fetcher is created and rewritten atomically by
+``save()`` at the end of a crawl. Bump ``FORMAT_VERSION`` whenever the shape of
+cleaned documents (or of the page entries) changes so stale entries are discarded.
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2
+
+
+class WordPressResponseCache:
+    """Conditional-request validators and cleaned documents from the previous crawl."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._pages: Dict[str, Dict[str, Any]] = {}
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._seen_items: Set[str] = set()
+        self._crawled_types: Set[str] = set()
+        self.load()
+
+    def load(self) -> None:
+        """Read the cache file; start empty if it is missing, unreadable or from another format version."""
+        self._pages, self._items = {}, {}
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != FORMAT_VERSION:
+                logger.info("WordPress response cache %s has an old format - ignoring it", self.path)
+                return
+            self._pages = data.get("pages", {})
+            self._items = data.get("items", {})
+            logger.info("Loaded WordPress response cache: %d pages, %d items", len(self._pages), len(self._items))
+        except Exception as e:
+            logger.warning(f"Could not load WordPress response cache {self.path}: {e}")
+            self._pages, self._items = {}, {}
+
+    @staticmethod
+    def _item_key(post_type: str, item_id: Any) -> str:
+        return f"{post_type}:{item_id}"
+
+    def conditional_headers(self, page_key: str) -> Dict[str, str]:
+        """Validators to send with the request for a listing page (empty if it was never seen)."""
+        entry = self._pages.get(page_key)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _page_items_cached(self, entry: Dict[str, Any], items: Dict[str, Dict[str, Any]]) -> bool:
+        """Whether every stub of a page entry has an unchanged document in items."""
+        post_type = entry.get("post_type")
+        for stub in entry["items"]:
+            cached = items.get(self._item_key(post_type, stub.get("id")))
+            if cached is None or cached.get("modified") != stub.get("modified"):
+                return False
+        return True
+
+    def cached_page(self, page_key: str) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """
+        Item stubs and total page count recorded for a page, for a 304 response.
+
+        Returns None - and forgets the page, so its next request is unconditional -
+        if any stub has no cleaned document to be served from.
+        """
+        entry = self._pages.get(page_key)
+        if entry is None:
+            return None
+        if not self._page_items_cached(entry, self._items):
+            del self._pages[page_key]
+            return None
+        return entry["items"], entry.get("total_pages", 0)
+
+    def store_page(
+        self,
+        page_key: str,
+        post_type: str,
+        headers: Any,
+        batch_items: List[Dict[str, Any]],
+        total_pages: int,
+    ) -> None:
+        """
+        Remember a page's validators and item stubs.
+
+        Pages without validators, or with an item lacking ``modified`` (which
+        could not be served from the item tier), are not kept.
+        """
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if (not etag and not last_modified) or not all(item.get("modified") for item in batch_items):
+            self._pages.pop(page_key, None)
+            return
+        self._pages[page_key] = {
+            "post_type": post_type,
+            "etag": etag,
+            "last_modified": last_modified,
+            "total_pages": total_pages,
+            "items": [{"id": item.get("id"), "modified": item.get("modified")} for item in batch_items],
+        }
+
+    def lookup_item(self, post_type: str, item: Dict[str, Any]) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Cleaned document for an unchanged item.
+
+        Returns:
+            (True, document) if the item is unchanged since it was cached - the
+            document is None if the item was rejected last time - or
+            (False, None) if it is new or was modified since
+        """
+        key = self._item_key(post_type, item.get("id"))
+        entry = self._items.get(key)
+        if entry is None or not item.get("modified") or entry.get("modified") != item.get("modified"):
+            return False, None
+        self._seen_items.add(key)
+        document = entry["document"]
+        return True, dict(document) if document is not None else None
+
+    def store_item(self, post_type: str, item: Dict[str, Any], document: Optional[Dict[str, Any]]) -> None:
+        """Remember the cleaned document (or None for a rejected item) for the item's current version."""
+        if not item.get("modified"):
+            return
+        key = self._item_key(post_type, item.get("id"))
+        self._items[key] = {"modified": item.get("modified"), "document": dict(document) if document is not None else None}
+        self._seen_items.add(key)
+
+    def mark_crawled(self, post_types: Iterable[str]) -> None:
+        """Record the post types crawled this run; their items not seen again are dropped on save()."""
+        self._crawled_types.update(post_types)
+
+    def save(self) -> None:
+        """
+        Atomically write the cache, pruning deleted items of the crawled post types.
+
+        Items not seen this crawl may only have been missed (e.g. their page
+        failed to load), so pages referring to a pruned item are dropped too:
+        a later 304 for them could not be served and must not be sent.
+        """
+        items = {
+            key: entry for key, entry in self._items.items()
+            if key in self._seen_items or key.split(":", 1)[0] not in self._crawled_types
+        }
+        pages = {
+            key: entry for key, entry in self._pages.items()
+            if self._page_items_cached(entry, items)
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": FORMAT_VERSION, "pages": pages, "items": items}, f)
+            os.replace(tmp_path, self.path)
+            self._pages, self._items = pages, items
+            logger.info("Saved WordPress response cache: %d pages, %d items", len(pages), len(items))
+        except Exception as e:
+            logger.warning(f"Could not save WordPress response cache {self.path}: {e}")
+        finally:
+            self._seen_items.clear()
+            self._crawled_types.clear()
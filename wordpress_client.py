@@ -1,15 +1,140 @@
 """
 WordPress content fetcher and processor.
 """
+import html
 import httpx
 import asyncio
-from typing import List, Dict, Any, Optional
-from bs4 import BeautifulSoup
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from bs4 import BeautifulSoup, SoupStrainer
 import logging
 from config import settings
+from json_utils import json_loads
+from ttl_cache import TTLCache
+from wordpress_cache import WordPressResponseCache
+from constants import (
+    MIN_CONTENT_LENGTH,
+    WP_CONNECT_TIMEOUT,
+    WP_FETCH_CONCURRENCY,
+    WP_KEEPALIVE_EXPIRY,
+    WP_MAX_CONNECTIONS,
+    WP_MAX_KEEPALIVE_CONNECTIONS,
+    WP_MAX_PAGES,
+    WP_POSTS_PER_PAGE,
+    WP_REQUEST_TIMEOUT,
+    WP_TYPES_CACHE_TTL,
+)
 
 logger = logging.getLogger(__name__)
 
+# With h2 installed, concurrent page fetches are multiplexed over one HTTP/2 connection
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# lxml's C parser is several times faster than the pure-Python html.parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+
+# Plain-text extraction without building a DOM (_clean_html)
+_SCRIPT_STYLE_RE = re.compile(r'<(script|style)\b[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+# Inline elements sit inside words ("Env<strong>iron</strong>mental", "CO<sub>2</sub>"),
+# so they are removed without a break; every other tag separates words
+_INLINE_TAG_RE = re.compile(
+    r'</?(?:a|abbr|b|code|em|i|mark|span|strong|sub|sup|u)\b[^>]*>', re.IGNORECASE
+)
+# Only "<" followed by a tag name or "/" opens a tag; a bare "<" in text is kept
+_TAG_RE = re.compile(r'</?[A-Za-z][^>]*>')
+_IMG_TAG_RE = re.compile(r'<img\b', re.IGNORECASE)
+# Only <img> elements are built when looking for an inline image (_extract_image_from_content)
+_IMG_STRAINER = SoupStrainer('img')
+
+# Featured image sizes, most preferred first (_media_source_url)
+_IMAGE_SIZE_PREFERENCE = ("medium_large", "medium", "large", "full")
+_NO_SIZE: Dict[str, Any] = {}
+
+
+def _parse_html(markup: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """Parse HTML with the fastest available parser, retrying with html.parser if it fails."""
+    try:
+        return BeautifulSoup(markup, HTML_PARSER, parse_only=parse_only)
+    except Exception:
+        if HTML_PARSER == 'html.parser':
+            raise
+        return BeautifulSoup(markup, 'html.parser', parse_only=parse_only)
+
+
+def _count_words(text: str) -> int:
+    """Count words in clean_html_content output (single-space separated) without splitting it."""
+    return text.count(' ') + 1 if text else 0
+
+
+def _clean_html(html_content: str) -> str:
+    """Clean HTML content and extract text (module-level so worker processes can run it)."""
+    if not html_content:
+        return ""
+    
+    try:
+        # Drop script/style blocks, comments and tags, decode entities, collapse whitespace
+        # (plain-text excerpts skip the regex passes, entity-free text the unescape)
+        text = html_content
+        has_markup = '<' in text
+        if has_markup:
+            text = _COMMENT_RE.sub(' ', _SCRIPT_STYLE_RE.sub(' ', text))
+            text = _TAG_RE.sub(' ', _INLINE_TAG_RE.sub('', text))
+        if '&' in text:
+            text = html.unescape(text)
+        text = ' '.join(text.split())
+        
+        if not text and has_markup:
+            # Nothing survived the fast path: let the parser have a go at the markup
+            soup = _parse_html(html_content)
+            for script in soup(["script", "style"]):
+                script.decompose()
+            text = ' '.join(soup.get_text(' ').split())
+        
+        # Limit text length to prevent issues
+        if len(text) > 10000:
+            text = text[:10000] + "..."
+        
+        return text
+        
+    except Exception as e:
+        logger.error(f"Error cleaning HTML content: {e}")
+        # Return a safe fallback
+        return "Content processing error"
+
+
+def _clean_post_text(raw_content: str, excerpt_raw: str) -> Tuple[str, str]:
+    """
+    Clean a post's content and excerpt.
+    
+    The excerpt is left empty for content too short to index (under
+    MIN_CONTENT_LENGTH chars), which _clean_post_data rejects anyway.
+    """
+    # Cleaning never lengthens text, so short markup cannot yield indexable content
+    if len(raw_content) < MIN_CONTENT_LENGTH:
+        return "", ""
+    content = _clean_html(raw_content)
+    if len(content) < MIN_CONTENT_LENGTH or not excerpt_raw:
+        return content, ""
+    return content, _clean_html(excerpt_raw)
+
+
+def _clean_post_texts(texts: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Clean a page of (content, excerpt) pairs in one worker call."""
+    return [_clean_post_text(raw_content, excerpt_raw) for raw_content, excerpt_raw in texts]
+
 
 class WordPressContentFetcher:
     """Fetches and processes content from WordPress REST API."""
@@ -33,15 +158,33 @@ class WordPressContentFetcher:
         
         self.client = httpx.AsyncClient(
             auth=auth,
-            timeout=30.0,
+            timeout=httpx.Timeout(WP_REQUEST_TIMEOUT, connect=WP_CONNECT_TIMEOUT),
             limits=httpx.Limits(
-                max_keepalive_connections=20,
-                max_connections=100,
-                keepalive_expiry=30.0
+                max_keepalive_connections=WP_MAX_KEEPALIVE_CONNECTIONS,
+                max_connections=WP_MAX_CONNECTIONS,
+                keepalive_expiry=WP_KEEPALIVE_EXPIRY
             ),
             headers={"User-Agent": "HybridSearchBot/1.0"},
-            http2=False  # Disable HTTP/2 to avoid h2 dependency issues
+            http2=HTTP2_AVAILABLE  # Only when h2 is installed; HTTP/1.1 keep-alive pool otherwise
         )
+        
+        # Optional on-disk record of the previous crawl, so unchanged pages come back
+        # as 304s and unchanged items are not cleaned again
+        self.response_cache: Optional[WordPressResponseCache] = None
+        if settings.wordpress_cache_path:
+            self.response_cache = WordPressResponseCache(settings.wordpress_cache_path)
+        
+        # Post HTML is cleaned in worker processes so the event loop keeps fetching
+        # while pages are cleaned on every core; started on the first crawl
+        self.clean_processes = settings.wordpress_clean_processes
+        if self.clean_processes is None:
+            cpus = os.cpu_count() or 1
+            self.clean_processes = cpus if cpus > 1 else 0
+        self._clean_pool: Optional[ProcessPoolExecutor] = None
+        
+        # The registered post types rarely change, so re-indexing skips the /types request
+        self._types_cache = TTLCache(max_items=1, ttl_sec=WP_TYPES_CACHE_TTL)
+        self._closed = False
     
     async def fetch_all_posts(self) -> List[Dict[str, Any]]:
         """Fetch all published posts from WordPress."""
@@ -62,15 +205,17 @@ class WordPressContentFetcher:
                 )
                 response.raise_for_status()
                 
-                batch_posts = response.json()
+                batch_posts = json_loads(response.content)
                 if not batch_posts:
                     break
                 
+                media_urls = await self._resolve_featured_media(batch_posts)
+                
                 # Process posts one by one to handle errors gracefully
                 for post in batch_posts:
                     try:
                         # Clean and validate post data
-                        cleaned_post = self._clean_post_data(post)
+                        cleaned_post = self._clean_post_data(post, media_urls)
                         if cleaned_post:
                             posts.append(cleaned_post)
                     except Exception as e:
@@ -110,14 +255,16 @@ class WordPressContentFetcher:
                 )
                 response.raise_for_status()
                 
-                batch_pages = response.json()
+                batch_pages = json_loads(response.content)
                 if not batch_pages:
                     break
                 
+                media_urls = await self._resolve_featured_media(batch_pages)
+                
                 # Process pages one by one
                 for page_item in batch_pages:
                     try:
-                        cleaned_page = self._clean_post_data(page_item)
+                        cleaned_page = self._clean_post_data(page_item, media_urls)
                         if cleaned_page:
                             pages.append(cleaned_page)
                     except Exception as e:
@@ -140,42 +287,16 @@ class WordPressContentFetcher:
     
     def clean_html_content(self, html_content: str) -> str:
         """Clean HTML content and extract text."""
-        if not html_content:
-            return ""
-        
-        try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Get text content
-            text = soup.get_text()
-            
-            # Clean up whitespace
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            # Limit text length to prevent issues
-            if len(text) > 10000:
-                text = text[:10000] + "..."
-            
-            return text
-            
-        except Exception as e:
-            logger.error(f"Error cleaning HTML content: {e}")
-            # Return a safe fallback
-            return "Content processing error"
+        return _clean_html(html_content)
     
-    def process_content_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+    def process_content_item(self, item: Dict[str, Any], media_urls: Optional[Dict[int, str]] = None) -> Dict[str, Any]:
         """Process a single WordPress content item."""
         try:
-            logger.info(f"Processing item: {item.get('id', 'unknown')} - {item.get('title', {}).get('rendered', 'No title')}")
-            logger.info(f"Available fields in item: {list(item.keys())}")
-            logger.info(f"Featured media field: {item.get('featured_media')}")
-            logger.info(f"Featured media type: {type(item.get('featured_media'))}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Processing item: {item.get('id', 'unknown')} - {item.get('title', {}).get('rendered', 'No title')}")
+                logger.debug(f"Available fields in item: {list(item.keys())}")
+                logger.debug(f"Featured media field: {item.get('featured_media')}")
+                logger.debug(f"Featured media type: {type(item.get('featured_media'))}")
             
             # Extract basic information with safe defaults
             processed = {
@@ -197,7 +318,7 @@ class WordPressContentFetcher:
             # Clean and extract content
             raw_content = self._safe_get_text(item.get("content", {}), "rendered", "")
             processed["content"] = self.clean_html_content(raw_content)
-            processed["word_count"] = len(processed["content"].split())
+            processed["word_count"] = _count_words(processed["content"])
             
             # Extract excerpt
             excerpt_raw = self._safe_get_text(item.get("excerpt", {}), "rendered", "")
@@ -205,13 +326,14 @@ class WordPressContentFetcher:
                 processed["excerpt"] = self.clean_html_content(excerpt_raw)
             
             # Extract featured image
-            featured_image = self._extract_featured_image(item)
+            featured_image = self._extract_featured_image(item, media_urls)
             processed["featured_image"] = featured_image
             
             # Pass the featured_media ID for frontend URL construction
             featured_media_id = item.get("featured_media", 0)
             processed["featured_media"] = featured_media_id
-            logger.info(f"Processed item {item.get('id', 'unknown')}: featured_media={featured_media_id}, type={type(featured_media_id)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Processed item {item.get('id', 'unknown')}: featured_media={featured_media_id}, type={type(featured_media_id)}")
             
             # If no featured image, try to extract from content
             if not featured_image:
@@ -262,75 +384,28 @@ class WordPressContentFetcher:
                 "word_count": 0
             }
     
-    def _extract_featured_image(self, item: Dict[str, Any]) -> str:
-        """Extract featured image URL from WordPress item using multiple methods."""
+    def _extract_featured_image(self, item: Dict[str, Any], media_urls: Optional[Dict[int, str]] = None) -> str:
+        """
+        Extract featured image URL from WordPress item using multiple methods.
+        
+        Images inside the post body are left to _extract_image_from_content,
+        which callers fall back to, so the content is parsed at most once.
+        
+        Args:
+            item: Raw WordPress REST item
+            media_urls: Featured media ID -> image URL for the item's page (see
+                _resolve_featured_media); built from the item alone if omitted
+        """
         try:
-            # Method 1: Check for featured_media field with embedded data
+            # Method 1/2: Featured media, embedded or looked up for the whole page at once
             featured_media_id = item.get("featured_media", 0)
             
             if featured_media_id and featured_media_id > 0:
-                # Look for embedded media
-                if "_embedded" in item and "wp:featuredmedia" in item["_embedded"]:
-                    for media in item["_embedded"]["wp:featuredmedia"]:
-                        if str(media.get("id", "")) == str(featured_media_id):
-                            # Get the source URL from media details
-                            media_details = media.get("media_details", {})
-                            if media_details:
-                                sizes = media_details.get("sizes", {})
-                                
-                                # Try different sizes in order of preference
-                                for size_name in ["medium_large", "medium", "large", "full"]:
-                                    if size_name in sizes:
-                                        source_url = sizes[size_name].get("source_url", "")
-                                        if source_url:
-                                            return source_url
-                                
-                                # Fallback to any available size
-                                for size_name, size_data in sizes.items():
-                                    source_url = size_data.get("source_url", "")
-                                    if source_url:
-                                        return source_url
-                            
-                            # Direct source_url fallback
-                            source_url = media.get("source_url", "")
-                            if source_url:
-                                return source_url
+                if media_urls is None:
+                    media_urls = self._index_embedded_media([item])
                 
-                # Method 2: Try to fetch media URL from WordPress REST API if we have base_url
-                # This is a synchronous fallback - frontend will also try async fetch
-                if hasattr(self, 'base_url') and self.base_url:
-                    try:
-                        import requests
-                        media_url = f"{self.base_url}/wp-json/wp/v2/media/{featured_media_id}"
-                        response = requests.get(media_url, timeout=2)
-                        if response.status_code == 200:
-                            media_data = response.json()
-                            media_details = media_data.get("media_details", {})
-                            if media_details:
-                                sizes = media_details.get("sizes", {})
-                                # Try different sizes in order of preference
-                                for size_name in ["medium_large", "medium", "large", "full"]:
-                                    if size_name in sizes:
-                                        source_url = sizes[size_name].get("source_url", "")
-                                        if source_url:
-                                            logger.info(f"Fetched featured image from REST API: {source_url}")
-                                            return source_url
-                                # Fallback to any available size
-                                for size_name, size_data in sizes.items():
-                                    source_url = size_data.get("source_url", "")
-                                    if source_url:
-                                        logger.info(f"Fetched featured image from REST API (fallback): {source_url}")
-                                        return source_url
-                            # Direct source_url fallback
-                            source_url = media_data.get("source_url", "")
-                            if source_url:
-                                logger.info(f"Fetched featured image from REST API (direct): {source_url}")
-                                return source_url
-                    except Exception as e:
-                        logger.debug(f"Could not fetch media from REST API: {e}, frontend will fetch async")
-                
-                # Return empty string - frontend will fetch via REST API using media ID
-                return ""
+                # Return empty string if unresolved - frontend will fetch via REST API using media ID
+                return media_urls.get(featured_media_id, "")
             
             # Method 3: Check for direct image fields in the item
             direct_image_fields = ['featured_image', 'thumbnail', 'image', 'featured_image_url', 'post_thumbnail']
@@ -340,32 +415,107 @@ class WordPressContentFetcher:
                     if image_url and image_url != '0' and image_url != 'false':
                         return image_url
             
-            # Method 4: Check for image in content
-            content = self._safe_get_text(item.get("content", {}), "rendered", "")
-            if content:
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(content, 'html.parser')
-                img_tags = soup.find_all('img')
-                if img_tags:
-                    # Return the first image found
-                    first_img = img_tags[0]
-                    src = first_img.get('src', '')
-                    if src and src.startswith('http'):
-                        return src
-            
             return ""
             
         except Exception as e:
             return ""
     
+    @staticmethod
+    def _media_source_url(media: Dict[str, Any]) -> str:
+        """Pick the preferred image URL from a WordPress media object."""
+        media_details = media.get("media_details", {})
+        if media_details:
+            sizes = media_details.get("sizes", {})
+            
+            # Try different sizes in order of preference
+            for size_name in _IMAGE_SIZE_PREFERENCE:
+                source_url = sizes.get(size_name, _NO_SIZE).get("source_url")
+                if source_url:
+                    return source_url
+            
+            # Fallback to any available size
+            source_url = next((url for url in (size.get("source_url") for size in sizes.values()) if url), "")
+            if source_url:
+                return source_url
+        
+        # Direct source_url fallback
+        return media.get("source_url", "")
+    
+    def _index_media(self, media_objects: Iterable[Dict[str, Any]]) -> Dict[int, str]:
+        """Map media objects to their preferred image URL, resolving each media ID once."""
+        media_urls: Dict[int, str] = {}
+        for media in media_objects:
+            try:
+                media_id = int(media.get("id", 0))
+            except (TypeError, ValueError):
+                continue
+            if media_id not in media_urls:
+                source_url = self._media_source_url(media)
+                if source_url:
+                    media_urls[media_id] = source_url
+        return media_urls
+    
+    def _index_embedded_media(self, items: List[Dict[str, Any]]) -> Dict[int, str]:
+        """Map every featured media object embedded in items (``_embed``) to its preferred image URL."""
+        return self._index_media(
+            media for item in items for media in item.get("_embedded", {}).get("wp:featuredmedia", ())
+        )
+    
+    async def _resolve_featured_media(
+        self, items: List[Dict[str, Any]], semaphore: Optional[asyncio.Semaphore] = None
+    ) -> Dict[int, str]:
+        """
+        Map the featured media IDs of a page of items to image URLs.
+        
+        Pages are requested with ``_embed``, so this only fires for the odd item
+        whose media could not be embedded (e.g. restricted attachments). All
+        missing media IDs are requested together through the media endpoint's
+        ``include`` filter (100 per request, requests run concurrently) instead
+        of one blocking lookup per item.
+        
+        Returns:
+            Featured media ID -> image URL
+        """
+        media_urls = self._index_embedded_media(items)
+        missing_ids = sorted({
+            item["featured_media"] for item in items
+            if isinstance(item.get("featured_media"), int) and item["featured_media"] > 0
+            and item["featured_media"] not in media_urls
+        })
+        if not missing_ids or not self.base_url:
+            return media_urls
+        
+        async def fetch_chunk(ids: List[int]) -> List[Dict[str, Any]]:
+            try:
+                params = {"include": ",".join(map(str, ids)), "per_page": len(ids)}
+                if semaphore is None:
+                    response = await self.client.get(f"{self.base_url}/media", params=params)
+                else:
+                    async with semaphore:
+                        response = await self.client.get(f"{self.base_url}/media", params=params)
+                response.raise_for_status()
+                return json_loads(response.content)
+            except Exception as e:
+                logger.debug(f"Could not fetch media from REST API: {e}, frontend will fetch async")
+                return []
+        
+        chunks = await asyncio.gather(*(
+            fetch_chunk(missing_ids[i:i + 100]) for i in range(0, len(missing_ids), 100)
+        ))
+        fetched = self._index_media(media for chunk in chunks for media in chunk)
+        logger.info(f"Resolved {len(fetched)}/{len(missing_ids)} featured images from REST API")
+        media_urls.update(fetched)
+        return media_urls
+    
     def _extract_image_from_content(self, content: str) -> str:
         """Extract first image URL from content HTML."""
         try:
-            if not content:
+            # No DOM parse for the many posts without inline images
+            if not content or not _IMG_TAG_RE.search(content):
                 return ""
             
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(content, 'html.parser')
+            # Lazy-loaded images may only carry data-src/srcset, so keep every <img>
+            soup = _parse_html(content, parse_only=_IMG_STRAINER)
             img_tags = soup.find_all('img')
             
             if img_tags:
@@ -387,27 +537,27 @@ class WordPressContentFetcher:
                     if src:
                         # Handle relative URLs
                         if src.startswith('http'):
-                            logger.info(f"Found image in content: {src}")
+                            logger.debug(f"Found image in content: {src}")
                             return src
                         elif src.startswith('//'):
                             full_url = 'https:' + src
-                            logger.info(f"Found image in content (protocol-relative): {full_url}")
+                            logger.debug(f"Found image in content (protocol-relative): {full_url}")
                             return full_url
                         elif src.startswith('/'):
                             # If we have base_url, construct full URL
                             if hasattr(self, 'base_url') and self.base_url:
                                 base = self.base_url.rstrip('/')
                                 full_url = base + src
-                                logger.info(f"Found image in content (relative): {full_url}")
+                                logger.debug(f"Found image in content (relative): {full_url}")
                                 return full_url
-                            logger.info(f"Found image in content (relative): {src}")
+                            logger.debug(f"Found image in content (relative): {src}")
                             return src
                         elif not src.startswith('data:'):  # Skip data URIs
                             # Try to construct full URL if we have base_url
                             if hasattr(self, 'base_url') and self.base_url:
                                 base = self.base_url.rstrip('/')
                                 full_url = base + '/' + src.lstrip('/')
-                                logger.info(f"Found image in content (constructed): {full_url}")
+                                logger.debug(f"Found image in content (constructed): {full_url}")
                                 return full_url
             
             return ""
@@ -421,8 +571,9 @@ class WordPressContentFetcher:
         try:
             value = obj.get(key, default)
             if isinstance(value, str):
-                # Remove any problematic characters
-                return value.replace('\x00', '').replace('\r', '').replace('\n', ' ')[:5000]
+                # Remove any problematic characters; newline -> space keeps the length,
+                # so it only has to touch the 5000 chars that are kept
+                return value.replace('\x00', '').replace('\r', '')[:5000].replace('\n', ' ')
             return str(value)[:5000] if value else default
         except:
             return default
@@ -438,11 +589,49 @@ class WordPressContentFetcher:
         except:
             return "Unknown"
     
-    def _clean_post_data(self, post: Dict[str, Any]) -> Dict[str, Any]:
-        """Clean and validate post data."""
+    def _clean_post_data(
+        self,
+        post: Dict[str, Any],
+        media_urls: Optional[Dict[int, str]] = None,
+        cleaned_text: Optional[Tuple[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Clean and validate post data.
+        
+        Args:
+            post: Raw WordPress REST item
+            media_urls: Featured media ID -> image URL (see _resolve_featured_media)
+            cleaned_text: (content, excerpt) already cleaned by _clean_post_texts
+                in a worker process; cleaned here if omitted
+        """
         try:
-            # Extract and clean basic fields
-            cleaned = {
+            # Clean content first: posts too short to index are rejected before
+            # their excerpt and images are processed
+            raw_content = self._safe_get_text(post.get("content", {}), "rendered", "")
+            if len(raw_content) < MIN_CONTENT_LENGTH:
+                # Stub/redirect posts: cleaning never lengthens text, so skip it
+                return None
+            if cleaned_text is None:
+                excerpt_raw = self._safe_get_text(post.get("excerpt", {}), "rendered", "")
+                cleaned_text = _clean_post_text(raw_content, excerpt_raw)
+            content, excerpt = cleaned_text
+            
+            # Skip if content is too short or empty
+            if len(content) < MIN_CONTENT_LENGTH:
+                return None
+            
+            # Handle featured image with improved extraction
+            featured_image_url = self._extract_featured_image(post, media_urls)
+            
+            # If no featured image found, try to extract first image from post content
+            if not featured_image_url:
+                if raw_content:
+                    featured_image_url = self._extract_image_from_content(raw_content)
+                    if featured_image_url:
+                        logger.debug(f"Using first image from post content as featured image: {featured_image_url}")
+            
+            # Built in one go (featured_image fields are always present, "" if none found)
+            return {
                 "id": str(post.get("id", "")),
                 "title": self._safe_get_text(post.get("title", {}), "rendered", ""),
                 "slug": str(post.get("slug", "")),
@@ -453,51 +642,15 @@ class WordPressContentFetcher:
                 "author": "SCS Engineers",  # Default author
                 "categories": [],
                 "tags": [],
-                "excerpt": "",
-                "content": "",
-                "word_count": 0
+                "excerpt": excerpt,
+                "content": content,
+                "word_count": _count_words(content),
+                "featured_image": featured_image_url,
+                "featured_image_url": featured_image_url,
+                "thumbnail": featured_image_url,
+                "featured_media": post.get("featured_media", 0),
             }
             
-            # Clean content
-            raw_content = self._safe_get_text(post.get("content", {}), "rendered", "")
-            cleaned["content"] = self.clean_html_content(raw_content)
-            cleaned["word_count"] = len(cleaned["content"].split())
-            
-            # Clean excerpt
-            excerpt_raw = self._safe_get_text(post.get("excerpt", {}), "rendered", "")
-            if excerpt_raw:
-                cleaned["excerpt"] = self.clean_html_content(excerpt_raw)
-            
-            # Handle featured image with improved extraction
-            featured_image_url = self._extract_featured_image(post)
-            featured_media_id = post.get("featured_media", 0)
-            
-            # If no featured image found, try to extract first image from post content
-            if not featured_image_url:
-                content = self._safe_get_text(post.get("content", {}), "rendered", "")
-                if content:
-                    featured_image_url = self._extract_image_from_content(content)
-                    if featured_image_url:
-                        logger.info(f"Using first image from post content as featured image: {featured_image_url}")
-            
-            if featured_image_url:
-                cleaned["featured_image"] = featured_image_url
-                cleaned["featured_image_url"] = featured_image_url
-                cleaned["thumbnail"] = featured_image_url
-                cleaned["featured_media"] = featured_media_id
-            else:
-                # Ensure featured_image field is always present
-                cleaned["featured_image"] = ""
-                cleaned["featured_image_url"] = ""
-                cleaned["thumbnail"] = ""
-                cleaned["featured_media"] = featured_media_id
-            
-            # Skip if content is too short or empty
-            if len(cleaned["content"]) < 50:
-                return None
-            
-            return cleaned
-            
         except Exception as e:
             logger.error(f"Error cleaning post data: {e}")
             return None
@@ -509,12 +662,11 @@ class WordPressContentFetcher:
             selected_types: Optional list of specific post types to fetch. If None, fetches all public types.
         """
         all_content = []
+        type_counts: Dict[str, int] = {}
         
         try:
             # First, get all available post types
-            types_response = await self.client.get(f"{self.base_url}/types")
-            types_response.raise_for_status()
-            types_data = types_response.json()
+            types_data = await self._get_post_types()
             
             # Filter to only post types that are available in REST API
             public_types = []
@@ -560,151 +712,277 @@ class WordPressContentFetcher:
             logger.info(f"✨ FINAL POST TYPES TO INDEX: {public_types}")
             logger.info(f"📊 Total post types to fetch: {len(public_types)}")
             
-            # Fetch content from each post type
-            for post_type in public_types:
-                try:
-                    page = 1
-                    per_page = 50
-                    post_type_count = 0  # Track count per post type
-                    
-                    logger.info(f"Starting to fetch '{post_type}' items...")
-                    
-                    while True:
-                        # Get the correct REST base for this post type
-                        rest_base = type_info_map.get(post_type, {}).get('rest_base', post_type)
-                        endpoint = f"{self.base_url}/{rest_base}"
-                        
-                        logger.info(f"Fetching '{post_type}' (page {page}) from endpoint: {endpoint}")
-                        
-                        try:
-                            response = await self.client.get(
-                                endpoint,
-                                params={
-                                    "per_page": per_page,
-                                    "page": page,
-                                    "status": "publish",  # Only publish for now
-                                    "_embed": False
-                                }
-                            )
-                            
-                            # Check response status
-                            if response.status_code == 404:
-                                logger.info(f"No more pages for '{post_type}' (404 on page {page})")
-                                break
-                            elif response.status_code == 400:
-                                # Check if it's the "invalid page number" error
-                                try:
-                                    error_data = response.json()
-                                    if error_data.get('code') == 'rest_post_invalid_page_number':
-                                        logger.info(f"Reached last page for '{post_type}' (page {page} doesn't exist)")
-                                        break
-                                except:
-                                    pass
-                                # If it's a different 400 error, try to continue
-                                logger.warning(f"400 error for '{post_type}' page {page}, but not 'invalid page number' - continuing")
-                            
-                            response.raise_for_status()
-                            
-                            # Get pagination info from headers
-                            total_pages = response.headers.get('X-WP-TotalPages', '0')
-                            total_items = response.headers.get('X-WP-Total', '0')
-                            
-                            logger.info(f"'{post_type}' - Page {page}/{total_pages}, Total items: {total_items}")
-                            
-                            # Check if we've reached the last page according to headers
-                            if total_pages and page >= int(total_pages):
-                                logger.info(f"Reached last page for '{post_type}' according to headers (page {page} of {total_pages})")
-                                # Process this last page, then break after
-                                
-                        except httpx.HTTPStatusError as e:
-                            if e.response.status_code == 400:
-                                # Check if it's the invalid page number error
-                                try:
-                                    error_data = e.response.json()
-                                    if error_data.get('code') == 'rest_post_invalid_page_number':
-                                        logger.info(f"All '{post_type}' pages fetched (invalid page number on page {page})")
-                                        break
-                                except:
-                                    pass
-                                logger.warning(f"400 error for '{post_type}': {e}")
-                                break
-                            elif e.response.status_code == 404:
-                                logger.warning(f"Endpoint not found for '{post_type}': {endpoint}")
-                                break
-                            elif e.response.status_code == 401:
-                                logger.error(f"Authentication required for '{post_type}'")
-                                break
-                            else:
-                                logger.error(f"HTTP {e.response.status_code} for '{post_type}': {e}")
-                                break
-                        except Exception as e:
-                            logger.error(f"Error fetching page {page} of '{post_type}': {e}")
-                            break
-                        
-                        batch_items = response.json()
-                        if not batch_items or len(batch_items) == 0:
-                            logger.info(f"Empty response for '{post_type}' page {page}, stopping")
-                            break
-                        
-                        # Process items one by one
-                        for item in batch_items:
-                            try:
-                                cleaned_item = self._clean_post_data(item)
-                                if cleaned_item:
-                                    # Ensure type is set correctly
-                                    cleaned_item['type'] = post_type
-                                    all_content.append(cleaned_item)
-                                    post_type_count += 1
-                            except Exception as e:
-                                logger.error(f"Error processing {post_type} item {item.get('id', 'unknown')}: {e}")
-                                continue
-                        
-                        logger.info(f"Fetched {len(batch_items)} {post_type} items (page {page}), type total: {post_type_count}")
-                        
-                        # Check if this was the last page based on headers
-                        if total_pages and page >= int(total_pages):
-                            logger.info(f"This was the last page for '{post_type}' ({page} of {total_pages})")
-                            break
-                        
-                        # Move to next page
-                        page += 1
-                        
-                        # Safety limit to prevent infinite loops
-                        if page > 100:  # Max 100 pages per type = 5000 items per type
-                            logger.warning(f"Reached safety limit for '{post_type}', stopping at page {page}")
-                            break
-                    
-                    # Log summary for this post type
-                    logger.info(f"Completed fetching '{post_type}': {post_type_count} items indexed")
-                    
-                except Exception as e:
-                    error_msg = str(e) if str(e) else f"{type(e).__name__} (no message)"
-                    error_type = type(e).__name__
-                    import traceback
-                    error_trace = traceback.format_exc()
-                    logger.error(f"Error fetching post type {post_type}: {error_type}: {error_msg}")
-                    logger.debug(f"Full traceback: {error_trace}")
-                    continue
+            # Fetch all post types concurrently; the semaphore bounds in-flight
+            # requests across every type so the WordPress host is not flooded
+            semaphore = asyncio.Semaphore(WP_FETCH_CONCURRENCY)
+            type_results = await asyncio.gather(*(
+                self._fetch_post_type(
+                    post_type, type_info_map.get(post_type, {}).get('rest_base', post_type), semaphore
+                )
+                for post_type in public_types
+            ))
+            # Every item of a type's batch carries that type, so its size is the type's count
+            for post_type, type_items in zip(public_types, type_results):
+                all_content.extend(type_items)
+                if type_items:
+                    type_counts[post_type] = len(type_items)
+            
+            if self.response_cache:
+                self.response_cache.mark_crawled(public_types)
+                await asyncio.to_thread(self.response_cache.save)
         
         except Exception as e:
             error_msg = str(e) if str(e) else f"{type(e).__name__} (no message)"
             error_type = type(e).__name__
-            import traceback
-            error_trace = traceback.format_exc()
             logger.error(f"Error fetching post types: {error_type}: {error_msg}")
-            logger.debug(f"Full traceback: {error_trace}")
-        
-        # Log breakdown by type
-        type_counts = {}
-        for item in all_content:
-            item_type = item.get('type', 'unknown')
-            type_counts[item_type] = type_counts.get(item_type, 0) + 1
+            # The traceback is only formatted if a handler actually emits DEBUG
+            logger.debug("Full traceback:", exc_info=True)
         
         logger.info(f"Total items from all post types fetched: {len(all_content)}")
         logger.info(f"Breakdown by type: {type_counts}")
         
         return all_content
 
+    async def _get_post_types(self) -> Dict[str, Any]:
+        """Return the /types listing, cached for WP_TYPES_CACHE_TTL seconds."""
+        types_data = self._types_cache.get(self.base_url)
+        if types_data is None:
+            types_response = await self.client.get(f"{self.base_url}/types")
+            types_response.raise_for_status()
+            types_data = json_loads(types_response.content)
+            self._types_cache.set(self.base_url, types_data)
+        return types_data
+    
+    async def _fetch_post_type(
+        self, post_type: str, rest_base: str, semaphore: asyncio.Semaphore
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch and clean every published item of one post type.
+        
+        Page 1 reports the page count (X-WP-TotalPages), so the remaining pages
+        are requested concurrently and cleaned in order as they arrive; a page
+        that fails is skipped. Without that header pages are fetched in order,
+        each next page requested before the current one is cleaned.
+        """
+        items: List[Dict[str, Any]] = []
+        endpoint = f"{self.base_url}/{rest_base}"
+        logger.info(f"Starting to fetch '{post_type}' items from endpoint: {endpoint}")
+        page_tasks: List[asyncio.Task] = []
+        
+        try:
+            first = await self._fetch_post_type_page(post_type, endpoint, 1, semaphore)
+            if first is not None and first[1]:
+                last_page = min(first[1], WP_MAX_PAGES)
+                if first[1] > WP_MAX_PAGES:
+                    logger.warning(f"Reached safety limit for '{post_type}', stopping at page {last_page}")
+                page_tasks = [
+                    asyncio.create_task(self._fetch_post_type_page(post_type, endpoint, page, semaphore))
+                    for page in range(2, last_page + 1)
+                ]
+                await self._collect_post_type_items(post_type, 1, first[0], items, semaphore)
+                for page, task in enumerate(page_tasks, start=2):
+                    result = await task
+                    if result is None:
+                        logger.warning(f"Skipping '{post_type}' page {page} of {last_page}: no items returned")
+                        continue
+                    await self._collect_post_type_items(post_type, page, result[0], items, semaphore)
+            else:
+                page, result = 1, first
+                while result is not None:
+                    next_fetch = None
+                    if page < WP_MAX_PAGES:
+                        next_fetch = asyncio.create_task(
+                            self._fetch_post_type_page(post_type, endpoint, page + 1, semaphore)
+                        )
+                        # Let the prefetch send its request before the CPU-bound cleaning below
+                        await asyncio.sleep(0)
+                    await self._collect_post_type_items(post_type, page, result[0], items, semaphore)
+                    if next_fetch is None:
+                        logger.warning(f"Reached safety limit for '{post_type}', stopping at page {page}")
+                        break
+                    page, result = page + 1, await next_fetch
+            
+            logger.info(f"Completed fetching '{post_type}': {len(items)} items indexed")
+            
+        except Exception as e:
+            error_msg = str(e) if str(e) else f"{type(e).__name__} (no message)"
+            error_type = type(e).__name__
+            logger.error(f"Error fetching post type {post_type}: {error_type}: {error_msg}")
+            logger.debug("Full traceback:", exc_info=True)
+        finally:
+            for task in page_tasks:
+                task.cancel()
+        
+        return items
+    
+    async def _fetch_post_type_page(
+        self, post_type: str, endpoint: str, page: int, semaphore: asyncio.Semaphore
+    ) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """
+        Fetch one page of a post type.
+        
+        Returns:
+            (raw items, X-WP-TotalPages or 0 if not reported), or None when the
+            page is past the end, empty, or could not be fetched
+        """
+        logger.debug(f"Fetching '{post_type}' (page {page}) from endpoint: {endpoint}")
+        
+        page_key = f"{endpoint}?per_page={WP_POSTS_PER_PAGE}&page={page}"
+        conditional_headers = self.response_cache.conditional_headers(page_key) if self.response_cache else {}
+        
+        params = {
+            "per_page": WP_POSTS_PER_PAGE,
+            "page": page,
+            "status": "publish",  # Only publish for now
+            # Featured media travels with each item instead of needing a
+            # /media lookup; limiting the embed to that one link (WP 5.4+,
+            # see REST API handbook "Linking and Embedding") keeps author
+            # and term objects out of the page payload
+            "_embed": "wp:featuredmedia"
+        }
+        
+        try:
+            async with semaphore:
+                response = await self.client.get(endpoint, headers=conditional_headers, params=params)
+                if response.status_code == 304 and conditional_headers:
+                    cached = self.response_cache.cached_page(page_key)
+                    if cached is not None:
+                        logger.info(f"'{post_type}' page {page} not modified since last crawl")
+                        return cached
+                    # Some of its items are no longer cached, so the 304 cannot be served
+                    logger.info(f"'{post_type}' page {page} not modified but not fully cached, refetching")
+                    response = await self.client.get(endpoint, params=params)
+            
+            # Check response status
+            if response.status_code == 404:
+                logger.info(f"No more pages for '{post_type}' (404 on page {page})")
+                return None
+            elif response.status_code == 400:
+                # Check if it's the "invalid page number" error
+                try:
+                    error_data = json_loads(response.content)
+                    if error_data.get('code') == 'rest_post_invalid_page_number':
+                        logger.info(f"Reached last page for '{post_type}' (page {page} doesn't exist)")
+                        return None
+                except:
+                    pass
+            
+            response.raise_for_status()
+            
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 400:
+                logger.warning(f"400 error for '{post_type}': {e}")
+            elif e.response.status_code == 401:
+                logger.error(f"Authentication required for '{post_type}'")
+            else:
+                logger.error(f"HTTP {e.response.status_code} for '{post_type}': {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching page {page} of '{post_type}': {e}")
+            return None
+        
+        # Get pagination info from headers
+        total_pages = response.headers.get('X-WP-TotalPages', '0')
+        total_items = response.headers.get('X-WP-Total', '0')
+        logger.debug(f"'{post_type}' - Page {page}/{total_pages}, Total items: {total_items}")
+        
+        batch_items = json_loads(response.content)
+        if not batch_items:
+            logger.info(f"Empty response for '{post_type}' page {page}, stopping")
+            return None
+        
+        try:
+            total_pages = int(total_pages)
+        except ValueError:
+            total_pages = 0
+        if self.response_cache:
+            self.response_cache.store_page(page_key, post_type, response.headers, batch_items, total_pages)
+        return batch_items, total_pages
+    
+    async def _collect_post_type_items(
+        self,
+        post_type: str,
+        page: int,
+        batch_items: List[Dict[str, Any]],
+        items: List[Dict[str, Any]],
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        """
+        Clean one page of raw post type items and append the usable ones to items.
+        
+        Items unchanged since the previous crawl (same ``modified``) reuse their
+        cached cleaned document; on a 304 page every item is such a stub.
+        """
+        cached: Dict[int, Optional[Dict[str, Any]]] = {}
+        if self.response_cache:
+            for index, item in enumerate(batch_items):
+                hit, document = self.response_cache.lookup_item(post_type, item)
+                if hit:
+                    cached[index] = document
+        
+        to_clean = [item for index, item in enumerate(batch_items) if index not in cached]
+        media_urls = await self._resolve_featured_media(to_clean, semaphore) if to_clean else {}
+        cleaned_texts = iter(await self._clean_texts(to_clean) or [None] * len(to_clean))
+        for index, item in enumerate(batch_items):
+            try:
+                if index in cached:
+                    cleaned_item = cached[index]
+                else:
+                    cleaned_item = self._clean_post_data(item, media_urls, next(cleaned_texts))
+                    if cleaned_item:
+                        # Ensure type is set correctly
+                        cleaned_item['type'] = post_type
+                    if self.response_cache:
+                        self.response_cache.store_item(post_type, item, cleaned_item)
+                if cleaned_item:
+                    items.append(cleaned_item)
+            except Exception as e:
+                logger.error(f"Error processing {post_type} item {item.get('id', 'unknown')}: {e}")
+                continue
+        
+        logger.info(
+            f"Fetched {len(batch_items)} {post_type} items (page {page}, {len(cached)} unchanged), "
+            f"type total: {len(items)}"
+        )
+    
+    async def _clean_texts(self, items: List[Dict[str, Any]]) -> Optional[List[Tuple[str, str]]]:
+        """
+        Clean the content and excerpt of a page of items in the worker pool.
+        
+        Returns:
+            (content, excerpt) per item, or None if the pool is disabled or
+            failed, in which case _clean_post_data cleans inline
+        """
+        if not items or self.clean_processes <= 0:
+            return None
+        
+        texts = [
+            (
+                self._safe_get_text(item.get("content", {}), "rendered", ""),
+                self._safe_get_text(item.get("excerpt", {}), "rendered", ""),
+            )
+            for item in items
+        ]
+        try:
+            if self._clean_pool is None:
+                # spawn, not fork: the server process already runs threads
+                self._clean_pool = ProcessPoolExecutor(
+                    max_workers=self.clean_processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._clean_pool, _clean_post_texts, texts)
+        except Exception as e:
+            logger.warning(f"Cleaning in worker processes failed, cleaning inline instead: {e}")
+            self._shutdown_clean_pool()
+            self.clean_processes = 0
+            return None
+    
+    def _shutdown_clean_pool(self) -> None:
+        if self._clean_pool is not None:
+            self._clean_pool.shutdown(wait=False, cancel_futures=True)
+            self._clean_pool = None
+    
     async def get_all_content(self, selected_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Fetch and process all WordPress content from all post types.
         
@@ -731,5 +1009,16 @@ class WordPressContentFetcher:
             return []
     
     async def close(self):
-        """Close the HTTP client."""
+        """
+        Close the HTTP client and the cleaning worker processes.
+        
+        The fetcher is long-lived (one per process, rebuilt only when the
+        WordPress source changes), so close() may be reached from both the
+        source switch and shutdown; only the first call does anything.
+        """
+        if self._closed:
+            return
+        # Flagged before awaiting, so a concurrent caller returns immediately
+        self._closed = True
+        self._shutdown_clean_pool()
         await self.client.aclose()
@@ -2,19 +2,58 @@
 Zero-Result Query Handler
 Provides suggestions and alternatives when search returns no results.
 """
+import asyncio
+import copy
+import functools
+import hashlib
+import json
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, Tuple
 import re
+import numpy as np
+from config import settings
+from semantic_cache import SemanticCache
+from ttl_cache import TTLCache
+from constants import (
+    EMBEDDING_DIMENSION,
+    SUGGESTION_ANALYTICS_TABLE,
+    ZERO_RESULT_CACHE_SIMILARITY,
+    ZERO_RESULT_CACHE_SIZE,
+    ZERO_RESULT_CACHE_TTL,
+    ZERO_RESULT_LLM_MAX_RETRIES,
+    ZERO_RESULT_POPULAR_QUERY_LIMIT,
+    ZERO_RESULT_POPULAR_REFRESH_SEC,
+    ZERO_RESULT_REDIS_KEY_PREFIX,
+    ZERO_RESULT_RELATED_LIMIT,
+    ZERO_RESULT_RELATED_MIN_SIMILARITY,
+)
 
 logger = logging.getLogger(__name__)
 
+# Common words dropped when simplifying a query (_simplify_query)
+_SIMPLIFY_STOP_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'})
+# ... and, with question words, never picked as the most important word (_extract_important_word)
+_IMPORTANT_STOP_WORDS = _SIMPLIFY_STOP_WORDS | {'how', 'what', 'why', 'when', 'where'}
+
+
+@functools.lru_cache(maxsize=256)
+def _query_words(query: str) -> Tuple[str, ...]:
+    """Lowercased words of a query, shared by the broader-search variants."""
+    return tuple(query.lower().split())
+
 
 class ZeroResultHandler:
     """Handle queries that return no results."""
     
-    def __init__(self, llm_client=None, search_system=None):
+    def __init__(self, llm_client=None, search_system=None, redis_client=None, analytics_db=None):
         self.llm_client = llm_client
         self.search_system = search_system
+        self.analytics_db = analytics_db
+        # Optional redis.asyncio client: zero-result responses computed by any worker
+        # are shared with all of them; the in-process cache stays in front of it
+        self.redis_client = redis_client
+        self._result_cache = TTLCache(max_items=ZERO_RESULT_CACHE_SIZE, ttl_sec=ZERO_RESULT_CACHE_TTL)
         
         # Common typo corrections
         self.typo_corrections = {
@@ -26,6 +65,28 @@ class ZeroResultHandler:
             'consutling': 'consulting',
             'enginering': 'engineering',
         }
+        # One alternation over all typos scans a query once; whole words only, so
+        # a typo embedded in a longer word is left alone
+        self._typo_map_ci = {typo.lower(): correction for typo, correction in self.typo_corrections.items()}
+        self._typo_re = re.compile(
+            r'\b(?:' + '|'.join(map(re.escape, sorted(self._typo_map_ci, key=len, reverse=True))) + r')\b',
+            re.IGNORECASE
+        )
+        
+        # LLM alternatives cache: exact (normalized) query tier, plus a semantic tier
+        # (ring buffer of query embeddings) so paraphrases reuse earlier suggestions
+        self._alternatives_cache = TTLCache(max_items=ZERO_RESULT_CACHE_SIZE, ttl_sec=ZERO_RESULT_CACHE_TTL)
+        self._semantic_alternatives = SemanticCache(
+            ZERO_RESULT_CACHE_SIZE, EMBEDDING_DIMENSION, ZERO_RESULT_CACHE_SIMILARITY, ZERO_RESULT_CACHE_TTL
+        )
+        self._alternatives_client = None
+        
+        # Popular successful queries and their normalized embeddings, loaded from
+        # analytics (load_popular_queries) so related searches are an in-memory lookup
+        self._popular_queries: List[str] = []
+        self._popular_vectors = np.zeros((0, EMBEDDING_DIMENSION), dtype=np.float32)
+        self._popular_loaded_at: Optional[float] = None
+        self._popular_refresh: Optional[asyncio.Task] = None
     
     async def handle_zero_results(
         self, 
@@ -47,48 +108,18 @@ class ZeroResultHandler:
         try:
             logger.info(f"Handling zero results for query: {query}")
             
-            result = {
-                'suggestions': [],
-                'corrected_query': None,
-                'related_searches': [],
-                'broadened_results': [],
-                'message': 'No results found'
-            }
-            
-            # 1. Check for typos and suggest corrections
-            corrected = self._check_typos(query)
-            if corrected != query:
-                result['corrected_query'] = corrected
-                result['message'] = f'Did you mean "{corrected}"?'
-                
-                # Try search with corrected query
-                if self.search_system:
-                    corrected_results, _ = await self.search_system.search(
-                        corrected, 
-                        limit=5,
-                        enable_ai_reranking=False  # Save cost for corrections
-                    )
-                    if corrected_results:
-                        result['broadened_results'] = corrected_results
-                        return result
-            
-            # 2. Generate alternative query suggestions using LLM
-            if self.llm_client:
-                suggestions = await self._generate_alternatives(query)
-                result['suggestions'] = suggestions
-            
-            # 3. Try broadening the search (remove filters, simplify query)
-            if self.search_system:
-                broadened_results = await self._try_broader_search(query, original_filters)
-                if broadened_results:
-                    result['broadened_results'] = broadened_results
-                    result['message'] = 'No exact matches found, but here are related results:'
-            
-            # 4. Get related searches from analytics
-            related = self._get_related_searches(query)
-            if related:
-                result['related_searches'] = related
+            # Repeated zero-result queries (misspellings, trending terms) skip the LLM and searches
+            cache_key = self._result_cache_key(query)
+            result = await self._get_cached_result(cache_key)
+            if result is not None:
+                logger.debug(f"Zero-result response cache hit for query: {query}")
+                return result
             
+            result, complete = await self._find_alternatives(query, original_filters)
+            # A response missing the LLM suggestions or broadened results because
+            # a call failed is not cached, so the next request retries them
+            if complete:
+                await self._cache_result(cache_key, result)
             return result
             
         except Exception as e:
@@ -98,28 +129,216 @@ class ZeroResultHandler:
                 'message': 'No results found. Try different keywords.'
             }
     
+    async def _find_alternatives(
+        self, 
+        query: str, 
+        original_filters: Optional[Dict]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Build the handle_zero_results response (uncached).
+        
+        Returns:
+            (response, whether every step succeeded and the response may be cached)
+        """
+        result = {
+            'suggestions': [],
+            'corrected_query': None,
+            'related_searches': [],
+            'broadened_results': [],
+            'message': 'No results found'
+        }
+        
+        # 1. Check for typos and suggest corrections
+        corrected = self._check_typos(query)
+        if corrected != query:
+            result['corrected_query'] = corrected
+            result['message'] = f'Did you mean "{corrected}"?'
+            
+            # Try search with corrected query
+            if self.search_system:
+                corrected_results, _ = await self.search_system.search(
+                    corrected, 
+                    limit=5,
+                    enable_ai_reranking=False  # Save cost for corrections
+                )
+                if corrected_results:
+                    result['broadened_results'] = corrected_results
+                    return result, True
+        
+        # 2. Generate alternative query suggestions using LLM and
+        # 3. try broadening the search (remove filters, simplify query) concurrently,
+        # so the zero-result path waits for the slower of the two, not both
+        suggestions, broadened_results = await asyncio.gather(
+            self._generate_alternatives(query),
+            self._try_broader_search(query, original_filters),
+            return_exceptions=True
+        )
+        
+        complete = True
+        if isinstance(suggestions, Exception):
+            logger.error(f"Error generating alternatives: {suggestions}")
+            complete = False
+        elif suggestions:
+            result['suggestions'] = suggestions
+        
+        if isinstance(broadened_results, Exception):
+            logger.error(f"Error in broader search: {broadened_results}")
+            complete = False
+        elif broadened_results:
+            result['broadened_results'] = broadened_results
+            result['message'] = 'No exact matches found, but here are related results:'
+        
+        # 4. Get related searches from analytics
+        related = await self._get_related_searches(query)
+        if related:
+            result['related_searches'] = related
+        
+        return result, complete
+    
+    def _result_cache_key(self, query: str) -> str:
+        """
+        Cache key for a query, ignoring case and spacing.
+        
+        The key carries the search system's corpus version, so re-indexing
+        retires every cached response without an explicit invalidation.
+        """
+        normalized = ' '.join(query.lower().split())
+        digest = hashlib.blake2s(normalized.encode('utf-8'), digest_size=8).hexdigest()
+        corpus_version = getattr(self.search_system, '_corpus_version', 0)
+        return f"{ZERO_RESULT_REDIS_KEY_PREFIX}{corpus_version}:{digest}"
+    
+    async def _get_cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Cached response from this process or, with redis, from any worker."""
+        result = self._result_cache.get(cache_key)
+        if result is None and self.redis_client is not None:
+            try:
+                raw = await self.redis_client.get(cache_key)
+                if raw:
+                    result = json.loads(raw)
+                    self._result_cache.set(cache_key, result)
+            except Exception as e:
+                logger.warning(f"Shared zero-result cache read failed: {e}")
+        # Callers get their own copy of the nested result lists
+        return copy.deepcopy(result) if result is not None else None
+    
+    async def _cache_result(self, cache_key: str, result: Dict[str, Any]) -> None:
+        """Remember a response locally and, with redis, for every worker."""
+        self._result_cache.set(cache_key, copy.deepcopy(result))
+        if self.redis_client is None:
+            return
+        try:
+            await self.redis_client.set(cache_key, json.dumps(result, default=str), ex=ZERO_RESULT_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"Shared zero-result cache write failed: {e}")
+    
+    async def invalidate_cached_results(self) -> int:
+        """
+        Drop all cached zero-result responses. Re-indexing already retires them
+        through the corpus version in the key; this also frees their memory.
+        
+        Returns:
+            Number of shared (redis) entries deleted
+        """
+        self._result_cache.clear()
+        if self.redis_client is None:
+            return 0
+        
+        deleted = 0
+        batch = []
+        try:
+            async for key in self.redis_client.scan_iter(match=f"{ZERO_RESULT_REDIS_KEY_PREFIX}*", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    deleted += await self.redis_client.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += await self.redis_client.delete(*batch)
+        except Exception as e:
+            logger.warning(f"Shared zero-result cache invalidation failed: {e}")
+        return deleted
+    
     def _check_typos(self, query: str) -> str:
         """Check for common typos and correct them."""
-        query_lower = query.lower()
+        corrected = self._typo_re.sub(self._correct_typo, query)
+        if corrected != query:
+            logger.info(f"Typo correction: {query} → {corrected}")
+        return corrected
+    
+    def _correct_typo(self, match: "re.Match") -> str:
+        """Correction for one matched typo, in the case style of the original word."""
+        word = match.group(0)
+        correction = self._typo_map_ci[word.lower()]
+        if word.isupper() and len(word) > 1:
+            return correction.upper()
+        if word[0].isupper():
+            return correction.capitalize()
+        return correction
+    
+    async def _generate_alternatives(self, query: str) -> List[str]:
+        """
+        Generate alternative query suggestions, calling the LLM only on a cache miss.
+        A failed LLM call raises, so the caller can tell it from "no suggestions".
+        
+        The same query (ignoring case and spacing) is answered from the exact tier;
+        a paraphrase whose embedding is at least ZERO_RESULT_CACHE_SIMILARITY
+        cosine-similar to an earlier query reuses that query's suggestions.
+        """
+        if not self.llm_client:
+            return []
         
-        for typo, correction in self.typo_corrections.items():
-            if typo in query_lower:
-                corrected = query_lower.replace(typo, correction)
-                # Preserve original case style
-                if query[0].isupper():
-                    corrected = corrected.capitalize()
-                logger.info(f"Typo correction: {query} → {corrected}")
-                return corrected
+        cache_key = ' '.join(query.lower().split())
+        suggestions = self._alternatives_cache.get(cache_key)
+        if suggestions is not None:
+            return list(suggestions)
         
-        return query
+        query_embedding = await self._get_query_embedding(query)
+        if query_embedding is not None:
+            suggestions = self._lookup_semantic_alternatives(query, query_embedding)
+            if suggestions is not None:
+                self._alternatives_cache.set(cache_key, suggestions)
+                return list(suggestions)
+        
+        suggestions = await self._request_alternatives(query)
+        if suggestions:
+            self._remember_alternatives(cache_key, query_embedding, suggestions)
+        return suggestions
     
-    async def _generate_alternatives(self, query: str) -> List[str]:
-        """Generate alternative query suggestions using LLM."""
+    async def _get_query_embedding(self, query: str) -> Optional[np.ndarray]:
+        """
+        Normalized query embedding from the search system's (cached) embedder, or
+        None when only hash fallback vectors are available - those are not semantic.
+        """
+        if not self.search_system:
+            return None
         try:
-            if not self.llm_client:
-                return []
-            
-            prompt = f"""The search query "{query}" returned no results. 
+            return await self.search_system.get_semantic_query_embedding(query)
+        except Exception as e:
+            logger.debug(f"No embedding for zero-result query '{query}': {e}")
+            return None
+    
+    def _lookup_semantic_alternatives(self, query: str, query_embedding: np.ndarray) -> Optional[List[str]]:
+        """Suggestions cached for the most similar earlier query, if it is close enough."""
+        hit = self._semantic_alternatives.get(query_embedding)
+        if hit is None:
+            return None
+        suggestions, similarity = hit
+        logger.debug(f"Semantic alternatives cache hit for '{query}' (similarity={similarity:.3f})")
+        return suggestions
+    
+    def _remember_alternatives(
+        self,
+        cache_key: str,
+        query_embedding: Optional[np.ndarray],
+        suggestions: List[str]
+    ) -> None:
+        """Cache fresh LLM suggestions in the exact tier and, with an embedding, the semantic tier."""
+        self._alternatives_cache.set(cache_key, suggestions)
+        if query_embedding is not None:
+            self._semantic_alternatives.set(query_embedding, suggestions)
+    
+    async def _request_alternatives(self, query: str) -> List[str]:
+        """Generate alternative query suggestions using LLM (errors propagate)."""
+        prompt = f"""The search query "{query}" returned no results. 
 Suggest 5 alternative search queries that might help the user find what they're looking for.
 
 Consider:
@@ -130,106 +349,201 @@ Consider:
 
 Return ONLY the alternative queries, one per line, without explanations.
 """
-            
-            # Use async client to avoid blocking the event loop
-            response = await self.llm_client.async_client.chat.completions.create(
-                model=self.llm_client.model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful search assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.4,
-                max_tokens=300
+        
+        # Use async client to avoid blocking the event loop
+        response = await self._get_alternatives_client().chat.completions.create(
+            model=self.llm_client.model,
+            messages=[
+                {"role": "system", "content": "You are a helpful search assistant."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.4,
+            max_tokens=300
+        )
+        
+        result = response.choices[0].message.content.strip()
+        suggestions = [line.strip() for line in result.split('\n') if line.strip()]
+        
+        return suggestions[:5]
+    
+    def _get_alternatives_client(self):
+        """
+        Async LLM client for alternatives, pinned to ZERO_RESULT_LLM_MAX_RETRIES.
+        
+        The OpenAI client retries rate limits and server errors itself with
+        jittered exponential backoff, honouring Retry-After, so the count is set
+        here rather than wrapping the call in a second retry loop.
+        """
+        if self._alternatives_client is None:
+            async_client = self.llm_client.async_client
+            with_options = getattr(async_client, 'with_options', None)
+            self._alternatives_client = (
+                with_options(max_retries=ZERO_RESULT_LLM_MAX_RETRIES) if with_options else async_client
             )
-            
-            result = response.choices[0].message.content.strip()
-            suggestions = [line.strip() for line in result.split('\n') if line.strip()]
-            
-            return suggestions[:5]
-            
-        except Exception as e:
-            logger.error(f"Error generating alternatives: {e}")
-            return []
+        return self._alternatives_client
     
     async def _try_broader_search(
         self, 
         query: str, 
         original_filters: Optional[Dict]
     ) -> List[Dict[str, Any]]:
-        """Try a broader search by removing filters and simplifying query."""
-        try:
-            if not self.search_system:
-                return []
-            
-            # Remove filters (broaden search)
-            results, _ = await self.search_system.search(
-                query,
+        """
+        Try a broader search by removing filters and simplifying query.
+        
+        The variants (unfiltered query, query without common words, most important
+        word) are searched concurrently; the first one in that priority order with
+        results wins and the searches still running for later variants are cancelled.
+        """
+        if not self.search_system:
+            return []
+        
+        # Remove filters (broaden search), then simplified query, then the most important word
+        variants = [query]
+        for variant in self._broader_query_variants(query):
+            if variant and variant not in variants:
+                variants.append(variant)
+        
+        tasks = [
+            asyncio.ensure_future(self.search_system.search(
+                variant,
                 limit=5,
                 enable_ai_reranking=False  # Save cost
-            )
-            
-            if results:
-                return results
-            
-            # Try with simplified query (remove common words)
-            simplified = self._simplify_query(query)
-            if simplified != query:
-                results, _ = await self.search_system.search(
-                    simplified,
-                    limit=5,
-                    enable_ai_reranking=False
-                )
+            ))
+            for variant in variants
+        ]
+        try:
+            for variant, task in zip(variants, tasks):
+                try:
+                    results, _ = await task
+                except Exception as e:
+                    logger.error(f"Error in broader search for '{variant}': {e}")
+                    continue
                 if results:
                     return results
-            
-            # Try with just the most important word
-            important_word = self._extract_important_word(query)
-            if important_word:
-                results, _ = await self.search_system.search(
-                    important_word,
-                    limit=5,
-                    enable_ai_reranking=False
-                )
-                return results
-            
-            return []
-            
-        except Exception as e:
-            logger.error(f"Error in broader search: {e}")
             return []
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Reap cancelled/failed searches so their exceptions are not reported as unretrieved
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def _broader_query_variants(self, query: str) -> Tuple[str, Optional[str]]:
+        """
+        Simplified query and most important word, from one pass over the words.
+        
+        Returns:
+            (query without common words - or the query itself if nothing is
+            left, longest remaining non-question word over 3 chars or None)
+        """
+        filtered = []
+        important_word = None
+        for word in _query_words(query):
+            if word in _SIMPLIFY_STOP_WORDS:
+                continue
+            filtered.append(word)
+            # Longest word (often most specific); the first one wins a tie
+            if len(word) > 3 and word not in _IMPORTANT_STOP_WORDS and (
+                important_word is None or len(word) > len(important_word)
+            ):
+                important_word = word
+        return (' '.join(filtered) if filtered else query), important_word
     
     def _simplify_query(self, query: str) -> str:
         """Simplify query by removing common words."""
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
-        words = query.lower().split()
-        filtered = [w for w in words if w not in stop_words]
-        return ' '.join(filtered) if filtered else query
+        return self._broader_query_variants(query)[0]
     
     def _extract_important_word(self, query: str) -> Optional[str]:
         """Extract the most important word from query."""
-        words = query.lower().split()
-        
-        # Remove stop words
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'how', 'what', 'why', 'when', 'where'}
-        important_words = [w for w in words if w not in stop_words and len(w) > 3]
+        return self._broader_query_variants(query)[1]
+    
+    async def load_popular_queries(self) -> int:
+        """
+        Load the most searched queries that returned results, with embeddings.
         
-        # Return longest word (often most specific)
-        if important_words:
-            return max(important_words, key=len)
+        Meant to run at startup; afterwards _get_related_searches refreshes them
+        in the background every ZERO_RESULT_POPULAR_REFRESH_SEC seconds. Needs the
+        analytics database (a ``databases``-style client) and real embeddings;
+        without an analytics_db related searches stay empty.
         
-        return None
+        Returns:
+            Number of popular queries loaded
+        """
+        self._popular_loaded_at = time.monotonic()
+        try:
+            if not self.analytics_db or not self.search_system:
+                return 0
+            
+            rows = await self.analytics_db.fetch_all(
+                query=f"""
+                    SELECT query, COUNT(*) AS hits
+                    FROM {settings.wordpress_table_prefix}{SUGGESTION_ANALYTICS_TABLE}
+                    WHERE has_results = 1
+                    GROUP BY query
+                    ORDER BY hits DESC
+                    LIMIT :limit
+                """,
+                values={"limit": ZERO_RESULT_POPULAR_QUERY_LIMIT},
+            )
+            queries = [row["query"] for row in rows if row["query"]]
+            if not queries:
+                # Nothing to embed (fresh analytics table): clear any earlier set
+                self._popular_queries = []
+                self._popular_vectors = np.zeros((0, EMBEDDING_DIMENSION), dtype=np.float32)
+                return 0
+            vectors = await self.search_system.get_semantic_embeddings(queries)
+            if vectors is None:
+                # Hash fallback vectors are not semantic: no related searches
+                return 0
+            
+            # Swapped in together, so a concurrent lookup never mixes old and new rows
+            self._popular_queries, self._popular_vectors = queries, vectors
+            logger.info(f"Loaded {len(queries)} popular queries for related searches")
+            return len(queries)
+            
+        except Exception as e:
+            logger.error(f"Error loading popular queries: {e}")
+            return 0
     
-    def _get_related_searches(self, query: str) -> List[str]:
+    async def _get_related_searches(self, query: str) -> List[str]:
         """Get related searches from analytics (popular searches with similar terms)."""
         try:
-            # This would query WordPress analytics for related searches
-            # For now, return empty list (implement when WordPress integration is complete)
-            return []
+            self._schedule_popular_refresh()
+            if not self._popular_queries:
+                return []
+            
+            query_embedding = await self._get_query_embedding(query)
+            if query_embedding is None:
+                return []
+            
+            queries, vectors = self._popular_queries, self._popular_vectors
+            similarities = vectors @ query_embedding
+            # One extra candidate in case the query itself is among the popular ones
+            k = min(ZERO_RESULT_RELATED_LIMIT + 1, len(queries))
+            top = np.argpartition(-similarities, k - 1)[:k]
+            top = top[np.argsort(-similarities[top])]
+            
+            query_key = ' '.join(query.lower().split())
+            related = []
+            for index in top:
+                if similarities[index] < ZERO_RESULT_RELATED_MIN_SIMILARITY:
+                    break
+                candidate = queries[index]
+                if ' '.join(candidate.lower().split()) != query_key:
+                    related.append(candidate)
+            return related[:ZERO_RESULT_RELATED_LIMIT]
             
         except Exception as e:
             logger.error(f"Error getting related searches: {e}")
             return []
     
+    def _schedule_popular_refresh(self) -> None:
+        """Reload the popular queries in the background once they are older than the refresh interval."""
+        if not self.analytics_db or (self._popular_refresh is not None and not self._popular_refresh.done()):
+            return
+        if self._popular_loaded_at is not None and time.monotonic() - self._popular_loaded_at < ZERO_RESULT_POPULAR_REFRESH_SEC:
+            return
+        self._popular_refresh = asyncio.create_task(self.load_popular_queries())
+    
     def track_zero_result(self, query: str, metadata: Dict[str, Any] = None):
         """Track zero-result queries for analysis."""
         try: